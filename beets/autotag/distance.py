@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import datetime
 import re
-from functools import cache, total_ordering
+from functools import cache, lru_cache, total_ordering
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from jellyfish import levenshtein_distance
 from unidecode import unidecode
 
@@ -12,7 +13,7 @@ from beets import config, metadata_plugins
 from beets.util import as_string, cached_classproperty, get_most_common_tags
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from beets.library import Item
 
@@ -44,6 +45,41 @@ SD_REPLACE = [
 ]
 
 
+@lru_cache(maxsize=4096)
+def _string_dist_key(string: str) -> str:
+    """Return the ASCII letters and digits of `string` in lower case,
+    which `_string_dist_basic` compares.
+    """
+    string = as_string(unidecode(string))
+    return re.sub(r"[^a-z0-9]", "", string.lower())
+
+
+@lru_cache(maxsize=4096)
+def _string_dist_prepare(string: str) -> str:
+    """Lower `string`, move the words in `SD_END_WORDS` back to the
+    start and apply `SD_REPLACE`, as `string_dist` does first.
+    """
+    string = string.lower()
+
+    # Don't penalize strings that move certain words to the end. For
+    # example, "the something" should be considered equal to
+    # "something, the".
+    for word in SD_END_WORDS:
+        if string.endswith(f", {word}"):
+            string = f"{word} {string[: -len(word) - 2]}"
+
+    # Perform a couple of basic normalizing substitutions.
+    for pat, repl in SD_REPLACE:
+        string = re.sub(pat, repl, string)
+    return string
+
+
+@lru_cache(maxsize=4096)
+def _string_dist_drop(string: str, pat: str) -> str:
+    """Return `string` without the parts matching `pat`."""
+    return re.sub(pat, "", string)
+
+
 def _string_dist_basic(str1: str, str2: str) -> float:
     """Basic edit distance between two strings, ignoring
     non-alphanumeric characters and case. Comparisons are based on a
@@ -52,10 +88,8 @@ def _string_dist_basic(str1: str, str2: str) -> float:
     """
     assert isinstance(str1, str)
     assert isinstance(str2, str)
-    str1 = as_string(unidecode(str1))
-    str2 = as_string(unidecode(str2))
-    str1 = re.sub(r"[^a-z0-9]", "", str1.lower())
-    str2 = re.sub(r"[^a-z0-9]", "", str2.lower())
+    str1 = _string_dist_key(str1)
+    str2 = _string_dist_key(str2)
     if not str1 and not str2:
         return 0.0
     return levenshtein_distance(str1, str2) / float(max(len(str1), len(str2)))
@@ -70,24 +104,15 @@ def string_dist(str1: str | None, str2: str | None) -> float:
         return 0.0
     if str1 is None or str2 is None:
         return 1.0
+    return _prepared_string_dist(
+        _string_dist_prepare(str1), _string_dist_prepare(str2)
+    )
 
-    str1 = str1.lower()
-    str2 = str2.lower()
-
-    # Don't penalize strings that move certain words to the end. For
-    # example, "the something" should be considered equal to
-    # "something, the".
-    for word in SD_END_WORDS:
-        if str1.endswith(f", {word}"):
-            str1 = f"{word} {str1[: -len(word) - 2]}"
-        if str2.endswith(f", {word}"):
-            str2 = f"{word} {str2[: -len(word) - 2]}"
-
-    # Perform a couple of basic normalizing substitutions.
-    for pat, repl in SD_REPLACE:
-        str1 = re.sub(pat, repl, str1)
-        str2 = re.sub(pat, repl, str2)
 
+def _prepared_string_dist(str1: str, str2: str) -> float:
+    """Return the `string_dist` of two strings that went through
+    `_string_dist_prepare`.
+    """
     # Change the weight for certain string portions matched by a set
     # of regular expressions. We gradually change the strings and build
     # up penalties associated with parts of the string that were
@@ -96,8 +121,8 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     penalty = 0.0
     for pat, weight in SD_PATTERNS:
         # Get strings that drop the pattern.
-        case_str1 = re.sub(pat, "", str1)
-        case_str2 = re.sub(pat, "", str2)
+        case_str1 = _string_dist_drop(str1, pat)
+        case_str2 = _string_dist_drop(str2, pat)
 
         if case_str1 != str1 or case_str2 != str2:
             # If the pattern was present (i.e., it is deleted in the
@@ -119,6 +144,29 @@ def string_dist(str1: str | None, str2: str | None) -> float:
     return base_dist + penalty
 
 
+def string_dist_matrix(
+    strings1: Sequence[str | None], strings2: Sequence[str | None]
+) -> np.ndarray:
+    """Return the `string_dist` between each of `strings1` and each of
+    `strings2` as a matrix. Each string is normalized once, and equal
+    pairs of strings are compared once.
+    """
+    prepared1 = [s if s is None else _string_dist_prepare(s) for s in strings1]
+    prepared2 = [s if s is None else _string_dist_prepare(s) for s in strings2]
+    dists: dict[tuple[str | None, str | None], float] = {}
+    matrix = np.empty((len(prepared1), len(prepared2)))
+    for i, str1 in enumerate(prepared1):
+        for j, str2 in enumerate(prepared2):
+            if (dist := dists.get((str1, str2))) is None:
+                if str1 is None or str2 is None:
+                    dist = float(str1 is not str2)
+                else:
+                    dist = _prepared_string_dist(str1, str2)
+                dists[str1, str2] = dist
+            matrix[i, j] = dist
+    return matrix
+
+
 @total_ordering
 class Distance:
     """Keeps track of multiple distance penalties. Provides a single
@@ -419,6 +467,109 @@ def track_distance(
     return dist
 
 
+def track_distance_matrix(
+    items: Sequence[Item],
+    tracks: Sequence[TrackInfo],
+    incl_artist: bool = False,
+) -> np.ndarray:
+    """Return the distances between each of `items` and each of `tracks`
+    as a matrix, equal to ``float(track_distance(item, track))`` for
+    every pair.
+
+    Each penalty of `track_distance` is computed for all pairs at once,
+    and the weighted penalties are added up in the same order, so that
+    the distances are exactly the same.
+    """
+    weights = Distance._weights
+    shape = (len(items), len(tracks))
+    raw = np.zeros(shape)
+    dist_max = np.zeros(shape)
+
+    def add(key: str, dist: np.ndarray | float, mask: np.ndarray | bool):
+        weight = weights[key]
+        mask = np.broadcast_to(np.asarray(mask, dtype=bool), shape)
+        dist = np.broadcast_to(np.asarray(dist, dtype=float), shape)
+        raw[mask] += dist[mask] * weight
+        dist_max[mask] += weight
+
+    def column(values: Iterable[Any]) -> np.ndarray:
+        return np.array(list(values), dtype=object)[:, None]
+
+    def row(values: Iterable[Any]) -> np.ndarray:
+        return np.array(list(values), dtype=object)[None, :]
+
+    # Length.
+    info_lengths = np.array([t.length or 0.0 for t in tracks], dtype=float)
+    item_lengths = np.array([i.length for i in items], dtype=float)
+    diff = (
+        np.abs(item_lengths[:, None] - info_lengths[None, :])
+        - get_track_length_grace()
+    )
+    length_max = get_track_length_max()
+    if length_max:
+        length_dist = np.maximum(np.minimum(diff, length_max), 0) / length_max
+    else:
+        length_dist = np.zeros(shape)
+    add("track_length", length_dist, info_lengths[None, :] != 0)
+
+    # Title.
+    add(
+        "track_title",
+        string_dist_matrix([i.title for i in items], [t.title for t in tracks]),
+        True,
+    )
+
+    # Artist. Only check if there is actually an artist in the track data.
+    if incl_artist:
+        add(
+            "track_artist",
+            string_dist_matrix(
+                [i.artist for i in items], [t.artist for t in tracks]
+            ),
+            column(i.artist.lower() not in VA_ARTISTS for i in items)
+            & row(bool(t.artist) for t in tracks),
+        )
+
+    # Track index.
+    item_tracks = column(i.track for i in items)
+    add(
+        "track_index",
+        (item_tracks != row(t.medium_index for t in tracks))
+        & (item_tracks != row(t.index for t in tracks)),
+        column(bool(i.track) for i in items)
+        & row(bool(t.index) for t in tracks),
+    )
+
+    # Track ID.
+    add(
+        "track_id",
+        column(i.mb_trackid for i in items) != row(t.track_id for t in tracks),
+        column(bool(i.mb_trackid) for i in items),
+    )
+
+    # Penalize mismatching disc numbers.
+    add(
+        "medium",
+        column(i.disc for i in items) != row(t.medium for t in tracks),
+        column(bool(i.disc) for i in items)
+        & row(bool(t.medium) for t in tracks),
+    )
+
+    # Data source.
+    before = column(i.get("data_source") for i in items)
+    after = row(t.data_source for t in tracks)
+    several_sources = len(metadata_plugins.find_metadata_source_plugins()) > 1
+    add(
+        "data_source",
+        row(metadata_plugins.get_penalty(t.data_source) for t in tracks),
+        (before != after)
+        & (column(bool(b) or several_sources for b in before[:, 0])),
+    )
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(dist_max != 0, raw / dist_max, 0.0)
+
+
 def distance(
     items: Sequence[Item],
     album_info: AlbumInfo,
@@ -22,13 +22,17 @@ from enum import IntEnum
 from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
 
 import lap
-import numpy as np
 
 from beets import config, logging, metadata_plugins, plugins
 from beets.autotag import AlbumMatch, TrackMatch, hooks
 from beets.util import get_most_common_tags
 
-from .distance import VA_ARTISTS, distance, track_distance
+from .distance import (
+    VA_ARTISTS,
+    distance,
+    track_distance,
+    track_distance_matrix,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Sequence
@@ -79,9 +83,9 @@ def assign_items(
     """
     log.debug("Computing track assignment...")
     # Construct the cost matrix.
-    costs = [[float(track_distance(i, t)) for t in tracks] for i in items]
+    costs = track_distance_matrix(items, tracks)
     # Assign items to tracks
-    _, _, assigned_item_idxs = lap.lapjv(np.array(costs), extend_cost=True)
+    _, _, assigned_item_idxs = lap.lapjv(costs, extend_cost=True)
     log.debug("...done.")
 
     # Each item in `assigned_item_idxs` list corresponds to a track in the
@@ -24,7 +24,7 @@ import sys
 import threading
 import time
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Mapping
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -56,6 +56,7 @@ from .query import MatchQuery, NullSort, TrueQuery
 if TYPE_CHECKING:
     from collections.abc import (
         Callable,
+        Collection,
         Generator,
         Iterable,
         Iterator,
@@ -64,7 +65,16 @@ if TYPE_CHECKING:
     from sqlite3 import Connection
     from types import TracebackType
 
-    from .query import FieldQueryType, FieldSort, Query, Sort, SQLiteType
+    from .query import (
+        FieldQuery,
+        FieldQueryType,
+        FieldSort,
+        Query,
+        Sort,
+        SQLiteType,
+    )
+
+    RowLayout = tuple[dict[str, int], list[Callable[[Any], Any]]]
 
 D = TypeVar("D", bound="Database", default=Any)
 
@@ -104,6 +114,9 @@ class FormattedMapping(Mapping[str, str]):
     returned. By default all fields are returned. Limiting to specific keys can
     avoid expensive per-item database queries.
 
+    `used_keys` narrows the default of all fields down to those of the
+    given keys that the model has, such as the fields a template uses.
+
     If `for_path` is true, all path separators in the formatted values
     are replaced.
     """
@@ -117,10 +130,13 @@ class FormattedMapping(Mapping[str, str]):
         model: Model,
         included_keys: str = ALL_KEYS,
         for_path: bool = False,
+        used_keys: Collection[str] | None = None,
     ):
         self.for_path = for_path
         self.model = model
-        if included_keys == self.ALL_KEYS:
+        if included_keys == self.ALL_KEYS and used_keys is not None:
+            self.model_keys = self.model._keys_among(used_keys, True)
+        elif included_keys == self.ALL_KEYS:
             # Performance note: this triggers a database query.
             self.model_keys = self.model.keys(True)
         else:
@@ -181,6 +197,8 @@ class FormattedMapping(Mapping[str, str]):
 class LazyConvertDict:
     """Lazily convert types for attributes fetched from the database"""
 
+    __slots__ = ("_converted", "_data", "model_cls")
+
     def __init__(self, model_cls: Model):
         """Initialize the object empty"""
         # FIXME: Dict[str, SQLiteType]
@@ -272,6 +290,97 @@ class LazyConvertDict:
         return len(self._converted) + len(self._data)
 
 
+_DELETED = object()
+"""Marks the value of a deleted column in a `LazyConvertRow`."""
+
+
+class LazyConvertRow(LazyConvertDict):
+    """Lazily convert the values of a database row, like
+    `LazyConvertDict`, but without copying the row into dictionaries.
+
+    The values are kept in a list in the order of the table's columns,
+    which the rows of a query share, and each value is replaced by its
+    converted one when it is first accessed. Values for keys that are
+    not columns are kept in a dictionary.
+    """
+
+    __slots__ = ("_columns", "_decoders", "_done", "_values")
+
+    def __init__(
+        self,
+        model_cls: Model | type[Model],
+        layout: RowLayout,
+        values: list[Any],
+    ):
+        """Wrap the `values` of a row laid out according to `layout`."""
+        self.model_cls = model_cls
+        self._columns, self._decoders = layout
+        self._values = values
+        self._converted: dict[str, Any] = {}
+        # A bit for each column whose value has been converted.
+        self._done = 0
+
+    def __setitem__(self, key: str, value: Any):
+        """Set an attribute value, assume it's already converted"""
+        index = self._columns.get(key)
+        if index is None:
+            self._converted[key] = value
+        else:
+            self._values[index] = value
+            self._done |= 1 << index
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an attribute value, converting the type on demand
+        if needed
+        """
+        index = self._columns.get(key)
+        if index is None:
+            return self._converted.get(key)
+
+        value = self._values[index]
+        if not self._done >> index & 1:
+            value = self._decoders[index](value)
+            self._values[index] = value
+            self._done |= 1 << index
+        elif value is _DELETED:
+            return None
+        return value
+
+    def __delitem__(self, key: str):
+        """Delete the attribute value"""
+        if key in self._columns:
+            self[key] = _DELETED
+        elif key in self._converted:
+            del self._converted[key]
+
+    def keys(self) -> list[str]:
+        """Get a list of available field names for this object."""
+        return [
+            key
+            for key, index in self._columns.items()
+            if self._values[index] is not _DELETED
+        ] + list(self._converted)
+
+    def copy(self) -> LazyConvertRow:
+        """Create a copy of the object."""
+        new = self.__class__(
+            self.model_cls, (self._columns, self._decoders), self._values[:]
+        )
+        new._done = self._done
+        new._converted = self._converted.copy()
+        return new
+
+    def __contains__(self, key: Any) -> bool:
+        """Determine whether `key` is an attribute on this object."""
+        index = self._columns.get(key)
+        if index is None:
+            return key in self._converted
+        return self._values[index] is not _DELETED
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+
 # Abstract base for model classes.
 
 
@@ -324,6 +433,13 @@ class Model(ABC, Generic[D]):
     created for this table.
     """
 
+    @cached_classproperty
+    def _indexed_fields(cls) -> set[str]:
+        """Fixed or flexible fields to index, so that looking up objects
+        by their value does not scan the whole table.
+        """
+        return set()
+
     @cached_classproperty
     def _types(cls) -> dict[str, types.Type]:
         """Optional types for non-fixed (flexible and computed) fields."""
@@ -427,17 +543,23 @@ class Model(ABC, Generic[D]):
     def _awaken(
         cls: type[AnyModel],
         db: D | None = None,
-        fixed_values: dict[str, Any] = {},
+        fixed_values: dict[str, Any] | LazyConvertRow = {},
         flex_values: dict[str, Any] = {},
     ) -> AnyModel:
         """Create an object with values drawn from the database.
 
+        The fixed values are either a dictionary or a `LazyConvertRow`,
+        which is then used by the object as it is.
+
         This is a performance optimization: the checks involved with
         ordinary construction are bypassed.
         """
         obj = cls(db)
 
-        obj._values_fixed.init(fixed_values)
+        if isinstance(fixed_values, LazyConvertRow):
+            obj._values_fixed = fixed_values
+        else:
+            obj._values_fixed.init(fixed_values)
         obj._values_flex.init(flex_values)
 
         return obj
@@ -448,6 +570,21 @@ class Model(ABC, Generic[D]):
             f"({', '.join(f'{k}={v!r}' for k, v in dict(self).items())})"
         )
 
+    @classmethod
+    def _fetch_related(
+        cls, db: D, rows: Sequence[sqlite3.Row]
+    ) -> Mapping[int, Model]:
+        """Fetch the related objects of the objects built from `rows` at
+        once, keyed by their id. Models have no related objects by
+        default.
+        """
+        return {}
+
+    def _set_related(self, related: Mapping[int, Model]):
+        """Attach this object's related object from the ones fetched by
+        :meth:`_fetch_related`, so that using it needs no query.
+        """
+
     def clear_dirty(self):
         """Mark all fields as *clean* (i.e., not needing to be stored to
         the database). Also update the revision.
@@ -494,6 +631,137 @@ class Model(ABC, Generic[D]):
         """
         return cls._fields.get(key) or cls._types.get(key) or types.DEFAULT
 
+    @classmethod
+    @functools.cache
+    def _row_layout(cls, columns: tuple[str, ...]) -> RowLayout:
+        """Get the position of each field among the `columns` of a row
+        from the database, and the functions converting the values of
+        all columns. Columns for the flexible attributes of a query are
+        left out.
+        """
+        positions = {
+            key: index
+            for index, key in enumerate(columns)
+            if not key.startswith("flex")
+        }
+        decoders = [
+            cls._fields[key].from_sql
+            if key in cls._fields
+            # Other columns get their type when they are accessed.
+            else functools.partial(cls._convert_column, key)
+            for key in columns
+        ]
+        return positions, decoders
+
+    @classmethod
+    def _convert_column(cls, key: str, value: Any) -> Any:
+        """Convert the value of a column that is not a fixed field."""
+        return cls._type(key).from_sql(value)
+
+    @classmethod
+    def _flex_subquery(
+        cls, key: str, query: FieldQuery | None = None
+    ) -> tuple[str, list[SQLiteType]]:
+        """Return an SQL subquery selecting the ids of the objects that
+        have the flexible attribute `key`. If `query` is given, only the
+        objects whose value matches it are selected.
+        """
+        subvals: list[SQLiteType] = []
+        if key in cls._indexed_fields:
+            # SQLite only uses the partial index on the key when the key
+            # is a literal.
+            key_sql = sql_literal(key)
+        else:
+            key_sql = "?"
+            subvals.append(key)
+        sql = f"SELECT entity_id FROM {cls._flex_table} WHERE key = {key_sql}"
+        if query:
+            column = cls._flex_value_column(key, query.flex_cast)
+            clause, clause_subvals = query.value_clause(column)
+            sql += f" AND {clause}"
+            subvals.extend(clause_subvals)
+        return sql, subvals
+
+    @classmethod
+    def _flex_value_column(cls, key: str, cast: str | None = None) -> str:
+        """Return the SQL expression for the value of the flexible
+        attribute `key` in its table. Values are stored as text, so they
+        are cast back according to the type of the field, or to `cast`
+        for untyped fields.
+        """
+        sql_type = cls._type(key).sql
+        if sql_type in ("INTEGER", "REAL"):
+            return f"CAST(value AS {sql_type})"
+        elif cast:
+            return f"CAST(value AS {cast})"
+        else:
+            return "value"
+
+    @classmethod
+    def _field_index(cls, field: str) -> tuple[str, Index]:
+        """Return the table and the index for looking up objects by the
+        value of `field`.
+
+        Flexible attributes get a partial index on their values in the
+        attribute table, which also covers the entity id.
+        """
+        if field in cls._fields:
+            return cls._table, Index(f"{cls._table}_by_{field}", (field,))
+
+        return cls._flex_table, Index(
+            f"{cls._flex_table}_by_{field}_value",
+            (cls._flex_value_column(field), "entity_id"),
+            f"key = {sql_literal(field)}",
+        )
+
+    @classmethod
+    def flex_field_clause(
+        cls, query: FieldQuery
+    ) -> tuple[str, list[SQLiteType]]:
+        """Generate an SQLite expression that evaluates `query` on the
+        flexible attribute it targets, for use in a query on this
+        model's table.
+        """
+        key = query.field_name
+        clause, subvals = cls._flex_subquery(key, query)
+        clause = f"{cls._table}.id IN ({clause})"
+        if query.matches_missing():
+            present, present_subvals = cls._flex_subquery(key)
+            clause = f"{clause} OR {cls._table}.id NOT IN ({present})"
+            subvals.extend(present_subvals)
+        return f"({clause})", subvals
+
+    @classmethod
+    def _flex_value_sql(cls, key: str, entity_id: str | None = None) -> str:
+        """Return a correlated subquery selecting the value of the flexible
+        attribute `key` of the object `entity_id` refers to (the row of
+        this model's table by default), or NULL if it does not have it.
+        """
+        entity_id = entity_id or f"{cls._table}.id"
+        return (
+            f"(SELECT {cls._flex_value_column(key)} FROM {cls._flex_table}"
+            f" WHERE entity_id = {entity_id} AND key = {sql_literal(key)})"
+        )
+
+    @classmethod
+    def flex_order_expression(cls, sort: FieldSort) -> str:
+        """Generate an SQL expression to sort the rows of this model's
+        table by the flexible attribute `sort` targets, like `sort.sort`
+        does with the objects.
+        """
+        key = sort.field
+        value = cls._flex_value_sql(key)
+
+        # Missing values sort like the null value of the type.
+        null = cls._types[key].null if key in cls._types else ""
+        if isinstance(null, str):
+            null = sql_literal(null)
+        value = f"COALESCE({value}, {null})"
+
+        if sort.case_insensitive and cls._type(key).sql == "TEXT":
+            value = f"LOWER({value})"
+        return value
+
     def _get(self, key, default: Any = None, raise_: bool = False):
         """Get the value for a field, or `default`. Alternatively,
         raise a KeyError if the field is not available.
@@ -570,6 +838,19 @@ class Model(ABC, Generic[D]):
         else:
             return base_keys
 
+    def _keys_among(
+        self, keys: Iterable[str], computed: bool = False
+    ) -> list[str]:
+        """Get those of `keys` that are available field names for this
+        object, like :meth:`keys` does, without listing all of them.
+        """
+        getters = self._getters() if computed else {}
+        return [
+            key
+            for key in keys
+            if key in self._fields or key in self._values_flex or key in getters
+        ]
+
     @classmethod
     def all_keys(cls):
         """Get a list of available keys for objects of this type.
@@ -631,46 +912,34 @@ class Model(ABC, Generic[D]):
         :param fields: the fields to be stored. If not specified, all fields
         will be.
         """
+        self.db._store_changes([self], fields)
+
+    def _pop_changes(
+        self, fields: Iterable[str] | None = None
+    ) -> tuple[dict[str, SQLiteType], dict[str, SQLiteType], set[str]]:
+        """Collect the changes to write to the database and clear their
+        dirty flags.
+
+        Return the SQL values of the modified fixed fields (restricted to
+        `fields`, if given), those of the modified flexible attributes,
+        and the deleted flexible attributes.
+        """
         if fields is None:
             fields = self._fields
 
-        # Build assignments for query.
-        assignments = []
-        subvars: list[SQLiteType] = []
+        fixed = {}
         for key in fields:
             if key != "id" and key in self._dirty:
                 self._dirty.remove(key)
-                assignments.append(f"{key}=?")
-                value = self._type(key).to_sql(self[key])
-                subvars.append(value)
+                fixed[key] = self._type(key).to_sql(self[key])
 
-        with self.db.transaction() as tx:
-            # Main table update.
-            if assignments:
-                query = f"UPDATE {self._table} SET {','.join(assignments)} WHERE id=?"
-                subvars.append(self.id)
-                tx.mutate(query, subvars)
-
-            # Modified/added flexible attributes.
-            for key, value in self._values_flex.items():
-                if key in self._dirty:
-                    self._dirty.remove(key)
-                    value = self._type(key).to_sql(value)
-                    tx.mutate(
-                        f"INSERT INTO {self._flex_table} "
-                        "(entity_id, key, value) "
-                        "VALUES (?, ?, ?);",
-                        (self.id, key, value),
-                    )
-
-            # Deleted flexible attributes.
-            for key in self._dirty:
-                tx.mutate(
-                    f"DELETE FROM {self._flex_table} WHERE entity_id=? AND key=?",
-                    (self.id, key),
-                )
+        flex = {}
+        for key, value in self._values_flex.items():
+            if key in self._dirty:
+                self._dirty.remove(key)
+                flex[key] = self._type(key).to_sql(value)
 
-        self.clear_dirty()
+        return fixed, flex, self._dirty - self._fields.keys()
 
     def load(self):
         """Refresh the object's metadata from the library database.
@@ -706,16 +975,20 @@ class Model(ABC, Generic[D]):
         db = self._check_db(need_id=False)
 
         with db.transaction() as tx:
-            new_id = tx.mutate(f"INSERT INTO {self._table} DEFAULT VALUES")
-            self.id = new_id
-            self.added = time.time()
-
-            # Mark every non-null field as dirty and store.
-            for key in self:
-                if self[key] is not None:
-                    self._dirty.add(key)
+            self._insert(tx)
             self.store()
 
+    def _insert(self, tx: Transaction):
+        """Insert an empty row for the object, setting its `id` and
+        `added` fields, and mark every non-null field as dirty so that
+        storing the object writes all its values.
+        """
+        self.id = tx.mutate(f"INSERT INTO {self._table} DEFAULT VALUES")
+        self.added = time.time()
+        for key in self:
+            if self[key] is not None:
+                self._dirty.add(key)
+
     # Formatting and templating.
 
     _formatter = FormattedMapping
@@ -724,11 +997,15 @@ class Model(ABC, Generic[D]):
         self,
         included_keys: str = _formatter.ALL_KEYS,
         for_path: bool = False,
+        used_keys: Collection[str] | None = None,
     ) -> FormattedMapping:
         """Get a mapping containing all values on this object formatted
         as human-readable unicode strings.
+
+        `used_keys` restricts the mapping to these keys, when only they
+        are going to be looked up.
         """
-        return self._formatter(self, included_keys, for_path)
+        return self._formatter(self, included_keys, for_path, used_keys)
 
     def evaluate_template(
         self,
@@ -745,8 +1022,10 @@ class Model(ABC, Generic[D]):
         else:
             # Help out mypy
             t = template
+        # Only the fields and functions the template uses are prepared.
         return t.substitute(
-            self.formatted(for_path=for_path), self._template_funcs()
+            self.formatted(for_path=for_path, used_keys=t.fields),
+            self._template_funcs() if t.functions else {},
         )
 
     # Parsing.
@@ -792,6 +1071,7 @@ class Results(Generic[AnyModel]):
         flex_rows,
         query: Query | None = None,
         sort=None,
+        with_related: bool = False,
     ):
         """Create a result set that will construct objects of type
         `model_class`.
@@ -806,6 +1086,10 @@ class Results(Generic[AnyModel]):
         full list of results before returning. This means it is a "slow
         sort" and all objects must be built before returning the first
         one.
+
+        With `with_related`, the related objects of all the rows (the
+        albums of items) are fetched together before the first object is
+        built, and shared among the objects.
         """
         self.model_class = model_class
         self.rows = rows
@@ -813,17 +1097,29 @@ class Results(Generic[AnyModel]):
         self.query = query
         self.sort = sort
         self.flex_rows = flex_rows
+        self.with_related = with_related
+        self._related: Mapping[int, Model] | None = None
+        self._layout: RowLayout | None = None
 
         # We keep a queue of rows we haven't yet consumed for
         # materialization. We preserve the original total number of
         # rows.
-        self._rows = rows
+        self._rows = deque(rows)
         self._row_count = len(rows)
 
         # The materialized objects corresponding to rows that have been
         # consumed.
         self._objects: list[AnyModel] = []
 
+    @classmethod
+    def of_objects(
+        cls, model_class: type[AnyModel], objects: list[AnyModel], db: D
+    ) -> Results[AnyModel]:
+        """Create a result set of objects that have been built already."""
+        results = cls(model_class, [], db, [])
+        results._objects = objects
+        return results
+
     def _get_objects(self) -> Iterator[AnyModel]:
         """Construct and generate Model objects for they query. The
         objects are returned in the order emitted from the database; no
@@ -837,6 +1133,8 @@ class Results(Generic[AnyModel]):
 
         # Index flexible attributes by the item ID, so we have easier access
         flex_attrs = self._get_indexed_flex_attrs()
+        if self.with_related and self._related is None:
+            self._related = self.model_class._fetch_related(self.db, self.rows)
 
         index = 0  # Position in the materialized objects.
         while index < len(self._objects) or self._rows:
@@ -849,7 +1147,7 @@ class Results(Generic[AnyModel]):
             # and produce it.
             else:
                 while self._rows:
-                    row = self._rows.pop(0)
+                    row = self._rows.popleft()
                     obj = self._make_model(row, flex_attrs.get(row["id"], {}))
                     # If there is a slow-query predicate, ensurer that the
                     # object passes it.
@@ -874,12 +1172,9 @@ class Results(Generic[AnyModel]):
 
     def _get_indexed_flex_attrs(self) -> dict[int, FlexAttrs]:
         """Index flexible attributes by the entity id they belong to"""
-        flex_values: dict[int, FlexAttrs] = {}
-        for row in self.flex_rows:
-            if row["entity_id"] not in flex_values:
-                flex_values[row["entity_id"]] = {}
-
-            flex_values[row["entity_id"]][row["key"]] = row["value"]
+        flex_values: defaultdict[int, FlexAttrs] = defaultdict(dict)
+        for entity_id, key, value in self.flex_rows:
+            flex_values[entity_id][key] = value
 
         return flex_values
 
@@ -887,11 +1182,15 @@ class Results(Generic[AnyModel]):
         self, row: sqlite3.Row, flex_values: FlexAttrs = {}
     ) -> AnyModel:
         """Create a Model object for the given row"""
-        cols = dict(row)
-        values = {k: v for (k, v) in cols.items() if not k[:4] == "flex"}
+        if self._layout is None:
+            # The rows of a query share their columns.
+            self._layout = self.model_class._row_layout(tuple(row.keys()))
+        values = LazyConvertRow(self.model_class, self._layout, list(row))
 
         # Construct the Python object
         obj = self.model_class._awaken(self.db, values, flex_values)
+        if self._related:
+            obj._set_related(self._related)
         return obj
 
     def __len__(self) -> int:
@@ -947,6 +1246,111 @@ class Results(Generic[AnyModel]):
             return None
 
 
+class StreamingResults(Results[AnyModel]):
+    """A result set which loads its objects from the database in batches
+    as it is iterated, so that walking through it holds a bounded number
+    of rows and objects in memory.
+
+    Only the ids of the matching rows are fetched up front. Rows and
+    their flexible attributes are then loaded one batch of ids at a
+    time. Objects are not kept after they have been produced: iterating
+    a second time loads them again, reflecting any changes made to the
+    database in the meantime.
+
+    Slow sorts are not supported, since they need every object at once.
+    """
+
+    def __init__(
+        self,
+        model_class: type[AnyModel],
+        ids: list[int],
+        db: D,
+        query: Query | None = None,
+        flex_keys: Collection[str] | None = None,
+        with_related: bool = False,
+    ):
+        """Create a result set that will construct objects of type
+        `model_class` for the rows with the given `ids`, in that order.
+
+        If `query` is provided, it is used as a predicate to filter the
+        results for a "slow query" that cannot be evaluated by the
+        database directly. `flex_keys` restricts the flexible attributes
+        loaded onto the objects. With `with_related`, the related objects
+        are fetched for each batch.
+        """
+        super().__init__(
+            model_class, [], db, [], query, with_related=with_related
+        )
+        self.ids = ids
+        self.flex_keys = flex_keys
+        self._row_count = len(ids)
+
+    def _load_batch(self, ids: Sequence[int]) -> list[AnyModel]:
+        """Load the objects with the given ids, in the same order."""
+        placeholders = ", ".join("?" * len(ids))
+        with self.db.transaction(read_only=True) as tx:
+            rows = tx.query(
+                f"SELECT * FROM {self.model_class._table} "
+                f"WHERE id IN ({placeholders})",
+                ids,
+            )
+            self.flex_rows = self.db._fetch_flex_rows(
+                tx, self.model_class, ids, self.flex_keys
+            )
+        if self.with_related:
+            self._related = self.model_class._fetch_related(self.db, rows)
+
+        flex_attrs = self._get_indexed_flex_attrs()
+        rows_by_id = {row["id"]: row for row in rows}
+        # Rows removed since the ids were fetched are skipped.
+        return [
+            self._make_model(rows_by_id[id_], flex_attrs.get(id_, {}))
+            for id_ in ids
+            if id_ in rows_by_id
+        ]
+
+    def _get_objects(self) -> Iterator[AnyModel]:
+        """Load and generate Model objects for the query, one batch of
+        rows at a time.
+        """
+        batch_size = self.db.max_variables
+        for start in range(0, len(self.ids), batch_size):
+            for obj in self._load_batch(self.ids[start : start + batch_size]):
+                if not self.query or self.query.match(obj):
+                    yield obj
+
+    def __len__(self) -> int:
+        """Get the number of matching objects."""
+        if self.query:
+            # A slow query. Fall back to testing every object.
+            return sum(1 for _ in self)
+        else:
+            return self._row_count
+
+    def __getitem__(self, n):
+        """Get the nth item in this result set. Unless there is a slow
+        query, only the object at that position is loaded.
+        """
+        if self.query:
+            # A slow query. Objects must be tested in order up to n.
+            for i, obj in enumerate(self):
+                if i == n:
+                    return obj
+            raise IndexError(f"result index {n} out of range")
+
+        try:
+            id_ = self.ids[n]
+        except IndexError:
+            raise IndexError(f"result index {n} out of range")
+        for obj in self._load_batch([id_]):
+            return obj
+        raise IndexError(f"result index {n} no longer exists")
+
+    def __bool__(self) -> bool:
+        """Does this result contain any objects?"""
+        return self.get() is not None
+
+
 class Transaction:
     """A context manager for safe, concurrent access to the database.
     All SQL commands should be executed through a transaction.
@@ -957,22 +1361,39 @@ class Transaction:
     current transaction.
     """
 
-    def __init__(self, db: Database):
+    _locked = False
+    """A flag storing whether this (root) transaction holds the
+    database lock.
+    """
+
+    def __init__(self, db: Database, read_only: bool = False):
         self.db = db
+        self.read_only = read_only
 
     def __enter__(self) -> Transaction:
         """Begin a transaction. This transaction may be created while
         another is active in a different thread.
         """
         with self.db._tx_stack() as stack:
-            first = not stack
             stack.append(self)
-        if first:
-            # Beginning a "root" transaction, which corresponds to an
-            # SQLite transaction.
-            self.db._db_lock.acquire()
+            self._root = stack[0]
+        if not (self.read_only and self.db.wal):
+            # Take the lock for the whole root transaction, which
+            # corresponds to an SQLite transaction, so that what it reads
+            # does not change before it writes. In WAL mode readers do not
+            # block the writer, so read-only transactions go without it
+            # unless they write after all.
+            self._lock()
         return self
 
+    def _lock(self):
+        """Make sure the root transaction holds the database lock,
+        serializing it with the writes of other threads.
+        """
+        if not self._root._locked:
+            self.db._db_lock.acquire()
+            self._root._locked = True
+
     def __exit__(
         self,
         exc_type: type[BaseException] | None,
@@ -992,7 +1413,9 @@ class Transaction:
             # Ending a "root" transaction. End the SQLite transaction.
             self.db._connection().commit()
             self._mutated = False
-            self.db._db_lock.release()
+            if self._locked:
+                self._locked = False
+                self.db._db_lock.release()
 
         if (
             isinstance(exc_value, sqlite3.OperationalError)
@@ -1018,6 +1441,7 @@ class Transaction:
         Yield control to mutation execution code. If execution succeeds,
         mark this transaction as mutated.
         """
+        self._lock()
         try:
             yield
         except sqlite3.OperationalError as e:
@@ -1050,6 +1474,7 @@ class Transaction:
     def script(self, statements: str):
         """Execute a string containing multiple SQL statements."""
         # We don't know whether this mutates, but quite likely it does.
+        self._lock()
         self._mutated = True
         self.db._connection().executescript(statements)
 
@@ -1100,7 +1525,27 @@ class Database:
     data is written in a transaction.
     """
 
-    def __init__(self, path, timeout: float = 5.0):
+    max_variables = 999
+    """The maximum number of variables used in a single statement. This
+    is the lowest limit SQLite may be compiled with.
+    """
+
+    statement_cache_size = 128
+    """The number of prepared statements each connection keeps for reuse
+    (the `sqlite3` default).
+    """
+
+    wal = False
+    """Whether the database uses write-ahead logging. Reading transactions
+    then run concurrently and only writes are serialized.
+    """
+
+    def __init__(
+        self,
+        path,
+        timeout: float = 5.0,
+        pragmas: Mapping[str, str | int] | None = None,
+    ):
         if sqlite3.threadsafety == 0:
             raise RuntimeError(
                 "sqlite3 must be compiled with multi-threading support"
@@ -1115,6 +1560,7 @@ class Database:
 
         self.path = path
         self.timeout = timeout
+        self.pragmas = dict(pragmas or {})
 
         self._connections: dict[int, sqlite3.Connection] = {}
         self._tx_stacks: defaultdict[int, list[Transaction]] = defaultdict(list)
@@ -1134,12 +1580,17 @@ class Database:
         # is active at a time.
         self._db_lock = threading.Lock()
 
+        with self.transaction() as tx:
+            journal_mode = tx.query("PRAGMA journal_mode")[0][0]
+        self.wal = journal_mode == "wal"
+
         # Set up database schema.
         self._ensure_migration_state_table()
         for model_cls in self._models:
             self._make_table(model_cls._table, model_cls._fields)
             self._make_attribute_table(model_cls._flex_table)
             self._create_indices(model_cls._table, model_cls._indices)
+            self._sync_field_indices(model_cls)
 
         self._migrate()
 
@@ -1152,7 +1603,7 @@ class Database:
             """
             for m in self._models
         ]
-        with self.transaction() as tx:
+        with self.transaction(read_only=True) as tx:
             rows = tx.query(f"""
                 {" UNION ALL ".join(column_queries)}
                 UNION ALL
@@ -1202,6 +1653,7 @@ class Database:
         conn = sqlite3.connect(
             os.fsdecode(self.path),
             timeout=self.timeout,
+            cached_statements=self.statement_cache_size,
             # We have our own same-thread checks in _connection(), but need to
             # call conn.close() in _close()
             check_same_thread=False,
@@ -1227,6 +1679,10 @@ class Database:
 
         # Access SELECT results like dictionaries.
         conn.row_factory = sqlite3.Row
+
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+
         return conn
 
     def add_functions(self, conn):
@@ -1284,11 +1740,14 @@ class Database:
         with self._shared_map_lock:
             yield self._tx_stacks[thread_id]
 
-    def transaction(self) -> Transaction:
+    def transaction(self, read_only: bool = False) -> Transaction:
         """Get a :class:`Transaction` object for interacting directly
         with the underlying SQLite database.
+
+        A `read_only` transaction does not wait for other threads to
+        finish writing when the database uses write-ahead logging.
         """
-        return Transaction(self)
+        return Transaction(self, read_only)
 
     def load_extension(self, path: str):
         """Load an SQLite extension into all open connections."""
@@ -1354,11 +1813,79 @@ class Database:
         """Create indices for the given table if they don't exist."""
         with self.transaction() as tx:
             for index in indices:
+                where = f" WHERE {index.where}" if index.where else ""
                 tx.script(
                     f"CREATE INDEX IF NOT EXISTS {index.name} "
-                    f"ON {table} ({', '.join(index.columns)});"
+                    f"ON {table} ({', '.join(index.columns)}){where};"
                 )
 
+    def _sync_field_indices(self, model_cls: type[Model]):
+        """Create the indices for the indexed fields of `model_cls` and
+        drop the ones of fields that are no longer indexed.
+        """
+        declared: defaultdict[str, list[Index]] = defaultdict(list)
+        for field in sorted(model_cls._indexed_fields):
+            table, index = model_cls._field_index(field)
+            declared[table].append(index)
+
+        with self.transaction() as tx:
+            existing = tx.query(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name IN (?, ?)",
+                (model_cls._table, model_cls._flex_table),
+            )
+            names = {i.name for indices in declared.values() for i in indices}
+            for (name,) in existing:
+                if name not in names and (
+                    name.startswith(f"{model_cls._table}_by_")
+                    or (
+                        name.startswith(f"{model_cls._flex_table}_by_")
+                        and name.endswith("_value")
+                    )
+                ):
+                    tx.script(f"DROP INDEX {name};")
+
+        for table, indices in declared.items():
+            self._create_indices(table, indices)
+
+    def field_indices(self) -> list[FieldIndexStatus]:
+        """Report on the indices of the indexed fields of every model:
+        how many rows they cover and whether SQLite uses them to look
+        up objects by the value of the field.
+        """
+        with self.transaction(read_only=True) as tx:
+            return [
+                self._field_index_status(tx, model_cls, field)
+                for model_cls in self._models
+                for field in sorted(model_cls._indexed_fields)
+            ]
+
+    def _field_index_status(
+        self, tx: Transaction, model_cls: type[Model], field: str
+    ) -> FieldIndexStatus:
+        """Check the index on `field` of `model_cls`."""
+        table, index = model_cls._field_index(field)
+        lookup_sql: str
+        lookup_subvals: Sequence[SQLiteType]
+        if table == model_cls._table:
+            count_sql = f"SELECT COUNT(*) FROM {table}"
+            lookup_sql = f"SELECT id FROM {table} WHERE {field} = ?"
+            lookup_subvals = ("",)
+        else:
+            count_sql = f"SELECT COUNT(*) FROM {table} WHERE {index.where}"
+            lookup_sql, lookup_subvals = model_cls._flex_subquery(
+                field, MatchQuery(field, "")
+            )
+
+        plan = tx.query(f"EXPLAIN QUERY PLAN {lookup_sql}", lookup_subvals)
+        return FieldIndexStatus(
+            model_cls._table,
+            field,
+            index.name,
+            tx.query(count_sql)[0][0],
+            any(f"INDEX {index.name}" in step["detail"] for step in plan),
+        )
+
     # Generic migration state handling.
 
     def _ensure_migration_state_table(self) -> None:
@@ -1391,56 +1918,209 @@ class Database:
                 (name, table),
             )
 
+    # Writing.
+
+    def bulk_store(
+        self, models: Iterable[Model], fields: Iterable[str] | None = None
+    ):
+        """Store the changes of many objects at once. This has the same
+        effect as calling `store` on each of them, but statements that
+        only differ in their values are run as one batch.
+        """
+        self._store_changes(list(models), fields)
+
+    def bulk_add(self, models: Iterable[Model]):
+        """Add many new objects to the database, like calling `add` on
+        each of them but storing their values in batches.
+        """
+        models = list(models)
+        with self.transaction() as tx:
+            for model in models:
+                model._db = self
+                model._insert(tx)
+            self.bulk_store(models)
+
+    def _store_changes(
+        self, models: Sequence[Model], fields: Iterable[str] | None = None
+    ):
+        """Write the pending changes of `models` to the database.
+
+        Updates of the same fixed fields are grouped into a single batched
+        statement, as are all writes and deletions of flexible attributes
+        in the same table.
+        """
+        if fields is not None:
+            fields = list(fields)
+
+        updates: defaultdict[tuple[str, tuple[str, ...]], list[tuple]] = (
+            defaultdict(list)
+        )
+        flex_updates: defaultdict[str, list[tuple]] = defaultdict(list)
+        flex_deletes: defaultdict[str, list[tuple]] = defaultdict(list)
+        for model in models:
+            fixed, flex, deleted = model._pop_changes(fields)
+            if fixed:
+                updates[model._table, tuple(fixed)].append(
+                    (*fixed.values(), model.id)
+                )
+            flex_updates[model._flex_table].extend(
+                (model.id, key, value) for key, value in flex.items()
+            )
+            flex_deletes[model._flex_table].extend(
+                (model.id, key) for key in deleted
+            )
+
+        with self.transaction() as tx:
+            # Main table updates.
+            for (table, keys), rows in updates.items():
+                assignments = ",".join(f"{key}=?" for key in keys)
+                tx.mutate_many(
+                    f"UPDATE {table} SET {assignments} WHERE id=?", rows
+                )
+
+            # Modified/added flexible attributes.
+            for flex_table, rows in flex_updates.items():
+                if rows:
+                    tx.mutate_many(
+                        f"INSERT INTO {flex_table} (entity_id, key, value) "
+                        "VALUES (?, ?, ?);",
+                        rows,
+                    )
+
+            # Deleted flexible attributes.
+            for flex_table, rows in flex_deletes.items():
+                if rows:
+                    tx.mutate_many(
+                        f"DELETE FROM {flex_table} WHERE entity_id=? AND key=?",
+                        rows,
+                    )
+
+        for model in models:
+            model.clear_dirty()
+
     # Querying.
 
+    def _select_sql(
+        self,
+        model_cls: type[Model],
+        query: Query,
+        where: str | None,
+    ) -> str:
+        """Build the statement selecting the rows of the table of
+        `model_cls` which satisfy the `where` clause of `query`.
+        """
+        table = model_cls._table
+        _from = table
+        if query.field_names & model_cls.other_db_fields:
+            _from += f" {model_cls.relation_join}"
+
+        # group by id to avoid duplicates when joining with the relation
+        return (
+            f"SELECT {table}.* "
+            f"FROM ({_from}) "
+            f"WHERE {where or 1} "
+            f"GROUP BY {table}.id"
+        )
+
     def _fetch(
         self,
         model_cls: type[AnyModel],
         query: Query | None = None,
         sort: Sort | None = None,
+        flex_keys: Collection[str] | None = None,
+        stream: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        after: int | None = None,
+        with_related: bool = False,
     ) -> Results[AnyModel]:
         """Fetch the objects of type `model_cls` matching the given
         query. The query may be given as a string, string sequence, a
         Query object, or None (to fetch everything). `sort` is an
         `Sort` object.
+
+        `flex_keys` restricts the flexible attributes loaded onto the
+        objects to the given keys. It is ignored when the query or the
+        sort is slow, since these may need any attribute.
+
+        If `stream` is set, return :class:`StreamingResults` which load
+        the objects in batches while they are iterated. This is ignored
+        if the sort is slow.
+
+        `limit`, `offset` and `after` select a page of the results: at
+        most `limit` objects, skipping the first `offset` ones, which come
+        after the object with id `after` in the sort order. Paging
+        through the results with `after` set to the last id of the
+        previous page does not need to skip the earlier pages. Pages are
+        selected by the database unless the query or the sort is slow.
+
+        With `with_related`, the related objects of the results are
+        fetched in bulk rather than one by one when they are used.
         """
         query = query or TrueQuery()  # A null query.
         sort = sort or NullSort()  # Unsorted.
         where, subvals = query.clause()
         order_by = sort.order_clause()
 
-        table = model_cls._table
-        _from = table
-        if query.field_names & model_cls.other_db_fields:
-            _from += f" {model_cls.relation_join}"
-
-        # group by id to avoid duplicates when joining with the relation
-        sql = (
-            f"SELECT {table}.* "
-            f"FROM ({_from}) "
-            f"WHERE {where or 1} "
-            f"GROUP BY {table}.id"
-        )
-        # Fetch flexible attributes for items matching the main query.
-        # Doing the per-item filtering in python is faster than issuing
-        # one query per item to sqlite.
-        flex_sql = (
-            "SELECT * "
-            f"FROM {model_cls._flex_table} "
-            f"WHERE entity_id IN (SELECT id FROM ({sql}))"
-        )
+        paged = limit is not None or offset or after is not None
+        order_terms = sort.order_terms() if paged else None
+        if paged and (not where or order_terms is None):
+            return self._fetch_page_slowly(
+                model_cls, query, sort, limit, offset, after, with_related
+            )
 
-        if order_by:
+        table = model_cls._table
+        sql = self._select_sql(model_cls, query, where)
+        order_sql = ""
+        if order_terms is not None:
+            sql, subvals, order_sql = self._page_sql(
+                table, sql, subvals, order_terms, limit, offset, after
+            )
+        elif order_by:
             # the sort field may exist in both 'items' and 'albums' tables
             # (when they are joined), causing ambiguous column OperationalError
             # if we try to order directly.
             # Since the join is required only for filtering, we can filter in
             # a subquery and order the result, which returns unique fields.
-            sql = f"SELECT * FROM ({sql}) ORDER BY {order_by}"
+            # The subquery is named after the table, so that sorts by
+            # flexible attributes can refer to its rows.
+            order_sql = f" ORDER BY {order_by}"
+            sql = f"({sql}) AS {table}"
+
+        if not where or sort.is_slow():
+            flex_keys = None
+
+        if stream and not sort.is_slow():
+            if not order_sql:
+                sql = f"({sql}) AS {table}"
+            with self.transaction(read_only=True) as tx:
+                rows = tx.query(
+                    f"SELECT {table}.id FROM {sql}{order_sql}", subvals
+                )
+            return StreamingResults(
+                model_cls,
+                [row["id"] for row in rows],
+                self,
+                None if where else query,  # Slow query component.
+                flex_keys,
+                with_related,
+            )
 
-        with self.transaction() as tx:
+        if order_sql:
+            sql = f"SELECT {table}.* FROM {sql}{order_sql}"
+
+        with self.transaction(read_only=True) as tx:
             rows = tx.query(sql, subvals)
-            flex_rows = tx.query(flex_sql, subvals)
+            # Unless every object has been selected, only look up the
+            # flexible attributes of the objects we got, so the query is
+            # evaluated once.
+            selected_all = (not where or where == "1") and not paged
+            ids = None if selected_all else [row["id"] for row in rows]
+            flex_rows = (
+                self._fetch_flex_rows(tx, model_cls, ids, flex_keys)
+                if rows
+                else []
+            )
 
         return Results(
             model_cls,
@@ -1449,12 +2129,209 @@ class Database:
             flex_rows,
             None if where else query,  # Slow query component.
             sort if sort.is_slow() else None,  # Slow sort component.
+            with_related,
         )
 
+    @staticmethod
+    def _page_sql(
+        table: str,
+        sql: str,
+        subvals: Sequence[SQLiteType],
+        order_terms: list[tuple[str, bool]],
+        limit: int | None,
+        offset: int,
+        after: int | None,
+    ) -> tuple[str, list[SQLiteType], str]:
+        """Build the FROM clause and the ORDER BY and LIMIT clauses that
+        select a page of the rows `sql` selects.
+
+        The rows are ordered by `order_terms` and then by id, so that
+        they have a well defined order. For `after`, the sort keys of
+        that row are looked up first, and only the rows that sort after
+        these keys (the "keyset") are selected.
+        """
+        order_terms = [*order_terms, (f"{table}.id", True)]
+        from_sql = f"({sql}) AS {table}"
+        if after is not None:
+            keys = ", ".join(
+                f"{expr} AS key{i}" for i, (expr, _) in enumerate(order_terms)
+            )
+            # A row comes after the keyset if it comes after it by the
+            # first key it differs in. NULLs come first in ascending
+            # order.
+            conditions = []
+            for i, (expr, ascending) in enumerate(order_terms):
+                key = f"keyset.key{i}"
+                low, high = (key, expr) if ascending else (expr, key)
+                later = f"({high} > {low} OR ({low} IS NULL AND {high} IS NOT NULL))"
+                equal = [
+                    f"{e} IS keyset.key{j}"
+                    for j, (e, _) in enumerate(order_terms[:i])
+                ]
+                conditions.append(" AND ".join([*equal, later]))
+            from_sql = (
+                f"{from_sql}, (SELECT {keys} FROM {table} WHERE {table}.id = ?)"
+                f" AS keyset WHERE ({') OR ('.join(conditions)})"
+            )
+            subvals = [*subvals, after]
+
+        order_by = ", ".join(
+            f"{expr} {'ASC' if ascending else 'DESC'}"
+            for expr, ascending in order_terms
+        )
+        page_sql = f" ORDER BY {order_by} LIMIT ? OFFSET ?"
+        subvals = [*subvals, -1 if limit is None else limit, offset]
+        return from_sql, subvals, page_sql
+
+    def _fetch_page_slowly(
+        self,
+        model_cls: type[AnyModel],
+        query: Query,
+        sort: Sort,
+        limit: int | None,
+        offset: int,
+        after: int | None,
+        with_related: bool = False,
+    ) -> Results[AnyModel]:
+        """Select a page of the objects matching a slow query or sorted
+        by a slow sort, by building all of them first.
+        """
+        objs = list(
+            self._fetch(model_cls, query, sort, with_related=with_related)
+        )
+        if after is not None:
+            ids = [obj.id for obj in objs]
+            objs = objs[ids.index(after) + 1 :] if after in ids else []
+        stop = None if limit is None else offset + limit
+        return Results.of_objects(model_cls, objs[offset:stop], self)
+
+    def _fetch_flex_rows(
+        self,
+        tx: Transaction,
+        model_cls: type[Model],
+        ids: Sequence[int] | None = None,
+        keys: Collection[str] | None = None,
+    ) -> list[sqlite3.Row]:
+        """Fetch `(entity_id, key, value)` rows of the flexible attributes
+        of the objects of type `model_cls` with the given `ids`, or of all
+        objects if `ids` is None. `keys` optionally restricts the
+        attributes to fetch.
+        """
+        sql = f"SELECT entity_id, key, value FROM {model_cls._flex_table}"
+        key_subvals = list(keys or ())
+        if len(key_subvals) > self.max_variables // 2:
+            # Too many keys to list them in the statement along with the
+            # ids: fetch all the attributes and pick the keys here.
+            wanted = set(key_subvals)
+            rows = self._fetch_flex_rows(tx, model_cls, ids)
+            return [row for row in rows if row[1] in wanted]
+
+        conditions = []
+        if keys is not None:
+            placeholders = ", ".join("?" * len(key_subvals))
+            conditions.append(f"key IN ({placeholders})")
+
+        if ids is None:
+            if conditions:
+                sql += f" WHERE {conditions[0]}"
+            return tx.query(sql, key_subvals)
+
+        # Look the ids up in batches, to stay below SQLite's limit on the
+        # number of variables in a statement.
+        batch_size = self.max_variables - len(key_subvals)
+        conditions.append("entity_id IN ({})")
+        sql = f"{sql} WHERE {' AND '.join(conditions)}"
+        rows = []
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            rows.extend(
+                tx.query(
+                    sql.format(", ".join("?" * len(batch))),
+                    [*key_subvals, *batch],
+                )
+            )
+        return rows
+
+    def _fetch_values(
+        self,
+        model_cls: type[AnyModel],
+        fields: Sequence[str],
+        query: Query | None = None,
+        sort: Sort | None = None,
+    ) -> list[tuple[Any, ...]]:
+        """Fetch the values of `fields` for the objects of type `model_cls`
+        matching the given query, without constructing Model objects.
+
+        Return one tuple per matching object holding the values in the
+        order of `fields`, converted to the types they have on the model.
+
+        Only fixed fields are read straight from the database. If any of
+        the requested fields is flexible or computed, or if the query or
+        the sort is slow, the objects are materialized and the values are
+        read from them instead.
+        """
+        query = query or TrueQuery()  # A null query.
+        sort = sort or NullSort()  # Unsorted.
+        where, subvals = query.clause()
+
+        if (
+            where is None
+            or sort.is_slow()
+            or not model_cls._fields.keys() >= set(fields)
+        ):
+            # Computed fields may depend on any flexible attribute.
+            getters = model_cls._getters()
+            flex_keys = None if any(f in getters for f in fields) else fields
+            return [
+                tuple(obj.get(f) for f in fields)
+                for obj in self._fetch(model_cls, query, sort, flex_keys)
+            ]
+
+        # Select only the requested columns from the filtered rows, so
+        # SQLite hands over nothing else.
+        sql = (
+            f"SELECT {', '.join(fields)} "
+            f"FROM ({self._select_sql(model_cls, query, where)})"
+            f" AS {model_cls._table}"
+        )
+        if order_by := sort.order_clause():
+            sql += f" ORDER BY {order_by}"
+
+        with self.transaction(read_only=True) as tx:
+            rows = tx.query(sql, subvals)
+
+        decoders = [model_cls._type(f).from_sql for f in fields]
+        return [tuple(d(v) for d, v in zip(decoders, row)) for row in rows]
+
     def _get(self, model_cls: type[AnyModel], id_: int) -> AnyModel | None:
         """Get a Model object by its id or None if the id does not exist."""
         return self._fetch(model_cls, MatchQuery("id", id_)).get()
 
+    def _get_many(
+        self, model_cls: type[AnyModel], ids: Sequence[int]
+    ) -> dict[int, AnyModel]:
+        """Get the Model objects with the given ids, keyed by id. Ids that
+        do not exist are left out.
+        """
+        objs: dict[int, AnyModel] = {}
+        # Look the objects up in batches, to stay below SQLite's limit on
+        # the number of variables.
+        for start in range(0, len(ids), self.max_variables):
+            batch = ids[start : start + self.max_variables]
+            placeholders = ", ".join("?" * len(batch))
+            with self.transaction(read_only=True) as tx:
+                rows = tx.query(
+                    f"SELECT * FROM {model_cls._table} "
+                    f"WHERE id IN ({placeholders})",
+                    batch,
+                )
+                flex_rows = self._fetch_flex_rows(tx, model_cls, batch)
+            objs.update(
+                (obj.id, obj)
+                for obj in Results(model_cls, rows, self, flex_rows)
+            )
+        return objs
+
 
 class Index(NamedTuple):
     """A helper class to represent the index
@@ -1463,3 +2340,22 @@ class Index(NamedTuple):
 
     name: str
     columns: tuple[str, ...]
+    where: str | None = None
+    """A condition restricting the rows covered by a partial index."""
+
+
+class FieldIndexStatus(NamedTuple):
+    """The state of the index on an indexed field of a model."""
+
+    table: str
+    field: str
+    index: str
+    rows: int
+    """The number of rows covered by the index."""
+    used: bool
+    """Whether SQLite uses the index to look up objects by the field."""
+
+
+def sql_literal(value: str) -> str:
+    """Quote a string as an SQL string literal."""
+    return "'{}'".format(value.replace("'", "''"))
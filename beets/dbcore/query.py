@@ -21,6 +21,7 @@ import re
 import unicodedata
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
+from copy import copy
 from datetime import datetime, timedelta
 from functools import cached_property, reduce
 from operator import mul, or_
@@ -137,6 +138,23 @@ class FieldQuery(Query, Generic[P]):
     same matching functionality in SQLite.
     """
 
+    flex_pushdown: ClassVar[bool] = False
+    """Whether `col_clause` can also be applied to the value of a
+    flexible attribute, so that the query need not be evaluated in
+    Python when it targets one.
+    """
+
+    flex_cast: ClassVar[str | None] = None
+    """The type that untyped flexible attribute values are cast to
+    before being matched in SQLite.
+    """
+
+    model_cls: type[Model] | None = None
+    """The model whose flexible attribute this query targets, if it
+    should be evaluated in SQLite. Set when the query is constructed
+    for a model (see `LibModel.field_query`).
+    """
+
     @property
     def field(self) -> str:
         return (
@@ -159,10 +177,25 @@ class FieldQuery(Query, Generic[P]):
     def clause(self) -> tuple[str | None, Sequence[SQLiteType]]:
         if self.fast:
             return self.col_clause()
+        elif self.model_cls and self.flex_pushdown:
+            # Matching a flexattr in its attribute table.
+            return self.model_cls.flex_field_clause(self)
         else:
             # Matching a flexattr. This is a slow query.
             return None, ()
 
+    def value_clause(self, column: str) -> tuple[str, Sequence[SQLiteType]]:
+        """Generate an SQLite expression matching the pattern against
+        the given column expression instead of the query's field.
+        """
+        query = copy(self)
+        query.table, query.field_name = "", column
+        return query.col_clause()
+
+    def matches_missing(self) -> bool:
+        """Check whether an object lacking the field matches this query."""
+        return self.value_match(self.pattern, None)
+
     @classmethod
     def value_match(cls, pattern: P, value: Any):
         """Determine whether the value matches the pattern."""
@@ -191,6 +224,8 @@ class FieldQuery(Query, Generic[P]):
 class MatchQuery(FieldQuery[AnySQLiteType]):
     """A query that looks for exact matches in an Model field."""
 
+    flex_pushdown = True
+
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
         return f"{self.field} = ?", [self.pattern]
 
@@ -242,6 +277,8 @@ class StringFieldQuery(FieldQuery[P]):
 class StringQuery(StringFieldQuery[str]):
     """A query that matches a whole string in a specific Model field."""
 
+    flex_pushdown = True
+
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
         search = (
             self.pattern.replace("\\", "\\\\")
@@ -260,6 +297,8 @@ class StringQuery(StringFieldQuery[str]):
 class SubstringQuery(StringFieldQuery[str]):
     """A query that matches a substring in a specific Model field."""
 
+    flex_pushdown = True
+
     def col_clause(self) -> tuple[str, Sequence[SQLiteType]]:
         pattern = (
             self.pattern.replace("\\", "\\\\")
@@ -368,6 +407,8 @@ class RegexpQuery(StringFieldQuery[Pattern[str]]):
     expression.
     """
 
+    flex_pushdown = True
+
     def __init__(self, field_name: str, pattern: str, fast: bool = True):
         pattern = self._normalize(pattern)
         try:
@@ -423,6 +464,9 @@ class NumericQuery(FieldQuery[str]):
     a float.
     """
 
+    flex_pushdown = True
+    flex_cast = "NUMERIC"
+
     def _convert(self, s: str) -> float | int | None:
         """Convert a string to a numeric type (float or int).
 
@@ -455,6 +499,9 @@ class NumericQuery(FieldQuery[str]):
             self.rangemin = self._convert(parts[0])
             self.rangemax = self._convert(parts[1])
 
+    def matches_missing(self) -> bool:
+        return False
+
     def match(self, obj: Model) -> bool:
         if self.field_name not in obj:
             return False
@@ -658,6 +705,35 @@ class FalseQuery(Query):
         return False
 
 
+class CompiledQuery(Query):
+    """A wrapper around a query whose SQL clause does not change, which
+    builds the clause only once.
+    """
+
+    def __init__(self, query: Query):
+        self.query = query
+        self._clause = query.clause()
+
+    @property
+    def field_names(self) -> set[str]:
+        return self.query.field_names
+
+    def clause(self) -> tuple[str | None, Sequence[Any]]:
+        return self._clause
+
+    def match(self, obj: Model) -> bool:
+        return self.query.match(obj)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.query!r})"
+
+    def __eq__(self, other) -> bool:
+        return super().__eq__(other) and self.query == other.query
+
+    def __hash__(self) -> int:
+        return hash(self.query)
+
+
 # Time/date queries.
 
 
@@ -841,11 +917,17 @@ class DateQuery(FieldQuery[str]):
     using an ellipsis interval syntax similar to that of NumericQuery.
     """
 
+    flex_pushdown = True
+    flex_cast = "NUMERIC"
+
     def __init__(self, field_name: str, pattern: str, fast: bool = True):
         super().__init__(field_name, pattern, fast)
         start, end = _parse_periods(pattern)
         self.interval = DateInterval.from_periods(start, end)
 
+    def matches_missing(self) -> bool:
+        return False
+
     def match(self, obj: Model) -> bool:
         if self.field_name not in obj:
             return False
@@ -936,6 +1018,13 @@ class Sort:
         """
         return None
 
+    def order_terms(self) -> list[tuple[str, bool]] | None:
+        """Return the SQL expressions to order by, each with a flag
+        indicating whether it is ascending, or None if the sort cannot be
+        expressed as such. This allows paging through sorted results.
+        """
+        return None
+
     def sort(self, items: list[AnyModel]) -> list[AnyModel]:
         """Sort the list of objects and return a list."""
         return sorted(items)
@@ -983,6 +1072,15 @@ class MultipleSort(Sort):
 
         return ", ".join(order_strings)
 
+    def order_terms(self) -> list[tuple[str, bool]] | None:
+        terms = []
+        for sort in self.sorts:
+            sort_terms = sort.order_terms()
+            if sort_terms is None:
+                return None
+            terms.extend(sort_terms)
+        return terms
+
     def is_slow(self) -> bool:
         for sort in self.sorts:
             if sort.is_slow():
@@ -1030,6 +1128,14 @@ class FieldSort(Sort):
         self.ascending = ascending
         self.case_insensitive = case_insensitive
 
+    def order_clause(self) -> str | None:
+        if (terms := self.order_terms()) is None:
+            return None
+        return ", ".join(
+            f"{expr} {'ASC' if ascending else 'DESC'}"
+            for expr, ascending in terms
+        )
+
     def sort(self, objs: list[AnyModel]) -> list[AnyModel]:
         # TODO: Conversion and null-detection here. In Python 3,
         # comparisons with None fail. We should also support flexible
@@ -1070,8 +1176,7 @@ class FieldSort(Sort):
 class FixedFieldSort(FieldSort):
     """Sort object to sort on a fixed field."""
 
-    def order_clause(self) -> str:
-        order = "ASC" if self.ascending else "DESC"
+    def order_terms(self) -> list[tuple[str, bool]]:
         if self.case_insensitive:
             field = (
                 "(CASE "
@@ -1081,16 +1186,26 @@ class FixedFieldSort(FieldSort):
             )
         else:
             field = self.field
-        return f"{field} {order}"
+        return [(field, self.ascending)]
 
 
 class SlowFieldSort(FieldSort):
     """A sort criterion by some model field other than a fixed field:
     i.e., a computed or flexible field.
+
+    Sorts by a flexible attribute are done in SQLite when `model_cls` is
+    set to the model whose attribute it is.
     """
 
+    model_cls: type[Model] | None = None
+
+    def order_terms(self) -> list[tuple[str, bool]] | None:
+        if self.model_cls is None:
+            return None
+        return [(self.model_cls.flex_order_expression(self), self.ascending)]
+
     def is_slow(self) -> bool:
-        return True
+        return self.model_cls is None
 
 
 class NullSort(Sort):
@@ -1099,6 +1214,9 @@ class NullSort(Sort):
     def sort(self, items: list[AnyModel]) -> list[AnyModel]:
         return items
 
+    def order_terms(self) -> list[tuple[str, bool]]:
+        return []
+
     def __nonzero__(self) -> bool:
         return self.__bool__()
 
@@ -1117,12 +1235,16 @@ class SmartArtistSort(FieldSort):
     prioritizing the sort field over the raw field.
     """
 
-    def order_clause(self):
-        order = "ASC" if self.ascending else "DESC"
-        collate = "COLLATE NOCASE" if self.case_insensitive else ""
+    def order_terms(self) -> list[tuple[str, bool]]:
+        collate = " COLLATE NOCASE" if self.case_insensitive else ""
         field = self.field
 
-        return f"COALESCE(NULLIF({field}_sort, ''), {field}) {collate} {order}"
+        return [
+            (
+                f"COALESCE(NULLIF({field}_sort, ''), {field}){collate}",
+                self.ascending,
+            )
+        ]
 
     def sort(self, objs: list[AnyModel]) -> list[AnyModel]:
         def key(o):
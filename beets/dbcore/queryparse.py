@@ -210,7 +210,11 @@ def construct_sort_part(
         sort_cls = query.FixedFieldSort
     else:
         # Flexible or computed.
-        sort_cls = query.SlowFieldSort
+        sort = query.SlowFieldSort(field, is_ascending, case_insensitive)
+        if model_cls.is_flex_field(field):
+            # A flexible attribute, which can be sorted by in SQLite.
+            sort.model_cls = model_cls
+        return sort
 
     return sort_cls(field, is_ascending, case_insensitive)
 
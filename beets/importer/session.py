@@ -230,13 +230,15 @@ class ImportSession:
 
         pl = pipeline.Pipeline(stages)
 
-        # Run the pipeline.
+        # Run the pipeline. The directories that files are moved to and
+        # from are looked up once.
         plugins.send("import_begin", session=self)
         try:
-            if config["threaded"]:
-                pl.run_parallel(QUEUE_SIZE)
-            else:
-                pl.run_sequential()
+            with util.stat_cache():
+                if config["threaded"]:
+                    pl.run_parallel(QUEUE_SIZE)
+                else:
+                    pl.run_sequential()
         except ImportAbortError:
             # User aborted operation. Silently stop.
             pass
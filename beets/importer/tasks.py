@@ -19,12 +19,14 @@ import os
 import re
 import shutil
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable
 from enum import Enum
+from multiprocessing.pool import ThreadPool
 from tempfile import mkdtemp
 from typing import TYPE_CHECKING, Any
 
+import confuse
 import mediafile
 
 from beets import autotag, config, library, plugins, util
@@ -33,7 +35,7 @@ from beets.dbcore.query import PathQuery
 from .state import ImportState
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from beets.autotag.match import Recommendation
 
@@ -45,6 +47,9 @@ log = logging.getLogger("beets")
 
 SINGLE_ARTIST_THRESH = 0.25
 
+# How many albums (or singletons) to read ahead while scanning.
+READ_AHEAD = 32
+
 # Usually flexible attributes are preserved (i.e., not updated) during
 # reimports. The following two lists (globally) change this behaviour for
 # certain fields. To alter these lists only when a specific plugin is in use,
@@ -462,7 +467,12 @@ class ImportTask(BaseImportTask):
         # Save the original paths of all items for deletion and pruning
         # in the next step (finalization).
         self.old_paths: list[util.PathBytes] = [item.path for item in items]
-        for item in items:
+        # Compute the destinations of all the items at once.
+        if operation is not None:
+            dests = session.lib.destinations(items)
+        else:
+            dests = [None] * len(items)
+        for item, dest in zip(items, dests):
             if operation is not None:
                 # In copy and link modes, treat re-imports specially:
                 # move in-library files. (Out-of-library files are
@@ -473,17 +483,17 @@ class ImportTask(BaseImportTask):
                     and self.replaced_items[item]
                     and session.lib.directory in util.ancestry(old_path)
                 ):
-                    item.move()
+                    item.move(dest=dest)
                     # We moved the item, so remove the
                     # now-nonexistent file from old_paths.
                     self.old_paths.remove(old_path)
                 else:
                     # A normal import. Just copy files and keep track of
                     # old paths.
-                    item.move(operation)
+                    item.move(operation, dest=dest)
 
-            if write and (self.apply or self.choice_flag == Action.RETAG):
-                item.try_write()
+        if write and (self.apply or self.choice_flag == Action.RETAG):
+            list(library.Item.write_many(items))
 
         with session.lib.transaction():
             for item in self.imported_items():
@@ -921,6 +931,11 @@ class ImportTaskFactory:
         self.skipped = 0  # Skipped due to incremental/resume.
         self.imported = 0  # "Real" tasks created.
         self.is_archive = ArchiveImportTask.is_archive(util.syspath(toppath))
+        self.jobs = 1
+        if config["threaded"]:
+            self.jobs = session.config["scan_jobs"].get(
+                confuse.Optional(int)
+            ) or (os.cpu_count() or 1)
 
     def tasks(self) -> Iterable[ImportTask]:
         """Yield all import tasks for music found in the user-specified
@@ -942,17 +957,18 @@ class ImportTaskFactory:
             if not archive_task:
                 return
 
-        # Search for music in the directory.
-        for dirs, paths in self.paths():
-            if self.session.config["singletons"]:
-                for path in paths:
-                    tasks = self._create(self.singleton(path))
-                    yield from tasks
-                yield self.sentinel(dirs)
-
-            else:
-                tasks = self._create(self.album(paths, dirs))
-                yield from tasks
+        # Search for music in the directory. With more than one job, the
+        # files of the next albums are read in a pool of threads while
+        # the complete ones are handed out in order.
+        if self.jobs > 1:
+            with ThreadPool(self.jobs) as pool:
+                yield from self._read_ahead(pool)
+        else:
+            for dirs, paths in self._scan():
+                if paths is None:
+                    yield from self._build(dirs, None)
+                else:
+                    yield from self._build(dirs, map(self.read_item, paths))
 
         # Produce the final sentinel for this toppath to indicate that
         # it is finished. This is usually just a SentinelImportTask, but
@@ -960,6 +976,80 @@ class ImportTaskFactory:
         # the extracted directory).
         yield archive_task or self.sentinel()
 
+    def _scan(
+        self,
+    ) -> Iterator[
+        tuple[list[util.PathBytes] | None, list[util.PathBytes] | None]
+    ]:
+        """Yield `(dirs, paths)` pairs for the tasks to create, in order.
+
+        `dirs` is None for a singleton, and `paths` is None for the
+        sentinel that follows the singletons of each directory. Paths
+        that were already imported are skipped.
+        """
+        singletons = self.session.config["singletons"]
+        for dirs, paths in self.paths():
+            if singletons:
+                for path in paths:
+                    if not self._skip([path]):
+                        yield None, [path]
+                yield dirs, None
+            elif not self._skip(dirs):
+                yield dirs, paths
+
+    def _read_ahead(self, pool: ThreadPool) -> Iterator[ImportTask]:
+        """Read the files found by `_scan` in `pool` and yield the tasks
+        in order as soon as each one is complete.
+        """
+        pending: deque[tuple[Any, Any]] = deque()
+        for dirs, paths in self._scan():
+            reads = None
+            if paths is not None:
+                reads = pool.map_async(self.read_item, paths)
+            pending.append((dirs, reads))
+
+            while pending and (
+                len(pending) > READ_AHEAD
+                or pending[0][1] is None
+                or pending[0][1].ready()
+            ):
+                dirs, reads = pending.popleft()
+                yield from self._build(dirs, reads and reads.get())
+
+        for dirs, reads in pending:
+            yield from self._build(dirs, reads and reads.get())
+
+    def _build(
+        self,
+        dirs: list[util.PathBytes] | None,
+        items: Iterable[library.Item | None] | None,
+    ) -> list[ImportTask]:
+        """Return the tasks for a pair from `_scan` given the items read
+        from its paths.
+        """
+        if items is None:
+            return [self.sentinel(dirs)]
+        items = [item for item in items if item]
+        if not items:
+            return []
+        elif dirs is None:
+            return self._create(SingletonImportTask(self.toppath, items[0]))
+        else:
+            return self._create(ImportTask(self.toppath, dirs, items))
+
+    def _skip(self, paths: Sequence[util.PathBytes]) -> bool:
+        """Check whether `paths` were already imported and count them
+        as skipped if so.
+        """
+        if self.session.already_imported(self.toppath, paths):
+            log.debug(
+                "Skipping previously-imported path: {}",
+                util.displayable_path(paths),
+            )
+            self.skipped += 1
+            return True
+        return False
+
     def _create(self, task: ImportTask | None):
         """Handle a new task to be emitted by the factory.
 
@@ -986,56 +1076,13 @@ class ImportTaskFactory:
             yield [self.toppath], [self.toppath]
         elif self.session.config["flat"]:
             paths = []
-            for dirs, paths_in_dir in albums_in_dir(self.toppath):
+            for dirs, paths_in_dir in albums_in_dir(self.toppath, self.jobs):
                 paths += paths_in_dir
             yield [self.toppath], paths
         else:
-            for dirs, paths in albums_in_dir(self.toppath):
+            for dirs, paths in albums_in_dir(self.toppath, self.jobs):
                 yield dirs, paths
 
-    def singleton(self, path: util.PathBytes):
-        """Return a `SingletonImportTask` for the music file."""
-        if self.session.already_imported(self.toppath, [path]):
-            log.debug(
-                "Skipping previously-imported path: {}",
-                util.displayable_path(path),
-            )
-            self.skipped += 1
-            return None
-
-        item = self.read_item(path)
-        if item:
-            return SingletonImportTask(self.toppath, item)
-        else:
-            return None
-
-    def album(self, paths: Iterable[util.PathBytes], dirs=None):
-        """Return a `ImportTask` with all media files from paths.
-
-        `dirs` is a list of parent directories used to record already
-        imported albums.
-        """
-
-        if dirs is None:
-            dirs = list({os.path.dirname(p) for p in paths})
-
-        if self.session.already_imported(self.toppath, dirs):
-            log.debug(
-                "Skipping previously-imported path: {}",
-                util.displayable_path(dirs),
-            )
-            self.skipped += 1
-            return None
-
-        items: list[library.Item] = [
-            item for item in map(self.read_item, paths) if item
-        ]
-
-        if len(items) > 0:
-            return ImportTask(self.toppath, dirs, items)
-        else:
-            return None
-
     def sentinel(self, paths: Iterable[util.PathBytes] | None = None):
         """Return a `SentinelImportTask` indicating the end of a
         top-level directory import.
@@ -1103,11 +1150,12 @@ def is_subdir_of_any_in_list(path, dirs):
     return any(d in ancestors for d in dirs)
 
 
-def albums_in_dir(path: util.PathBytes):
+def albums_in_dir(path: util.PathBytes, jobs: int = 1):
     """Recursively searches the given directory and returns an iterable
     of (paths, items) where paths is a list of directories and items is
     a list of Items that is probably an album. Specifically, any folder
-    containing any media files is an album.
+    containing any media files is an album. `jobs` is the number of
+    threads listing the directories.
     """
     collapse_paths: list[util.PathBytes] = []
     collapse_items: list[util.PathBytes] = []
@@ -1117,7 +1165,7 @@ def albums_in_dir(path: util.PathBytes):
     ignore_hidden: bool = config["ignore_hidden"].get(bool)
 
     for root, dirs, files in util.sorted_walk(
-        path, ignore=ignore, ignore_hidden=ignore_hidden, logger=log
+        path, ignore=ignore, ignore_hidden=ignore_hidden, logger=log, jobs=jobs
     ):
         items = [os.path.join(root, f) for f in files]
         # If we're currently collapsing the constituent directories in a
@@ -1,27 +1,44 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
+import confuse
 import platformdirs
 
 import beets
-from beets import dbcore
+from beets import dbcore, plugins
 from beets.util import normpath
 
 from .migrations import MultiGenreFieldMigration
 from .models import Album, Item
-from .queries import PF_KEY_DEFAULT, parse_query_parts, parse_query_string
+from .queries import PF_KEY_DEFAULT, QUERY_CACHE_SIZE, parse_query_cached
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from beets.dbcore import Results
 
 
+JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+SYNCHRONOUS_MODES = ("off", "normal", "full", "extra")
+
+
 class Library(dbcore.Database):
     """A database of music containing songs and albums."""
 
     _models = (Item, Album)
     _migrations = ((MultiGenreFieldMigration, (Item, Album)),)
 
+    # The main statement of a cached query is the same every time it runs,
+    # so keep one for each of them on top of the statements that do not
+    # depend on a query, like loading objects by id or storing them. The
+    # statements that load flexible attributes differ with the number of
+    # ids in their last batch, so they are rarely reused and not counted.
+    statement_cache_size = (
+        QUERY_CACHE_SIZE + dbcore.Database.statement_cache_size
+    )
+
     def __init__(
         self,
         path="library.blb",
@@ -30,7 +47,7 @@ class Library(dbcore.Database):
         replacements=None,
     ):
         timeout = beets.config["timeout"].as_number()
-        super().__init__(path, timeout=timeout)
+        super().__init__(path, timeout=timeout, pragmas=self._pragmas())
 
         self.directory = normpath(directory or platformdirs.user_music_path())
 
@@ -39,6 +56,30 @@ class Library(dbcore.Database):
 
         # Used for template substitution performance.
         self._memotable: dict[tuple[str, ...], str] = {}
+        # The albums grouped by the values of the fields %aunique{}
+        # compares, for each set of keys and disambiguators in use.
+        self._aunique_index: dict[
+            tuple[tuple[str, ...], tuple[str, ...]],
+            tuple[dict[int, tuple], dict[tuple, list[tuple]]],
+        ] = {}
+
+    @staticmethod
+    def _pragmas():
+        """Get the SQLite pragmas to set on every connection from the
+        `database` config option, leaving out the unset ones.
+        """
+        db_config = beets.config["database"]
+        pragmas = {
+            "journal_mode": db_config["journal_mode"].get(
+                confuse.Optional(confuse.Choice(JOURNAL_MODES))
+            ),
+            "synchronous": db_config["synchronous"].get(
+                confuse.Optional(confuse.Choice(SYNCHRONOUS_MODES))
+            ),
+            "mmap_size": db_config["mmap_size"].get(confuse.Optional(int)),
+            "cache_size": db_config["cache_size"].get(confuse.Optional(int)),
+        }
+        return {k: v for k, v in pragmas.items() if v is not None}
 
     # Adding objects to the database.
 
@@ -49,7 +90,7 @@ class Library(dbcore.Database):
         Return the object's new id.
         """
         obj.add(self)
-        self._memotable = {}
+        self._clear_memo()
         return obj.id
 
     def add_album(self, items):
@@ -72,17 +113,100 @@ class Library(dbcore.Database):
             album.add(self)
             for item in items:
                 item.album_id = album.id
-                if item.id is None:
-                    item.add(self)
-                else:
-                    item.store()
+            new_items = [i for i in items if i.id is None]
+            stored_items = [i for i in items if i.id is not None]
+            self.bulk_add(new_items)
+            self.bulk_store(stored_items)
 
         return album
 
+    def bulk_add(self, models):
+        """Add many :class:`Item` or :class:`Album` objects to the library
+        database at once.
+        """
+        super().bulk_add(models)
+        self._clear_memo()
+
+    def bulk_store(self, models, fields=None, inherit=True):
+        """Store the changes of many :class:`Item` or :class:`Album`
+        objects at once.
+
+        Like :meth:`Album.store`, albums pass their modified fields on to
+        their tracks when `inherit` is enabled.
+        """
+        models = list(models)
+        album_changes = {
+            field
+            for model in models
+            if isinstance(model, Album)
+            for field in model._dirty
+        }
+        with self.transaction():
+            items = []
+            if inherit:
+                for model in models:
+                    if isinstance(model, Album):
+                        items.extend(model._inherit())
+            super().bulk_store(models, fields)
+            if items:
+                self.bulk_store(items)
+
+        # Albums may no longer share the fields %aunique{} compares.
+        if any(
+            not album_changes.isdisjoint(keys + disam)
+            for keys, disam in self._aunique_index
+        ):
+            self._clear_memo()
+
+        for model in models:
+            plugins.send("database_change", lib=self, model=model)
+
+    # Template memoization.
+
+    def _clear_memo(self):
+        """Forget the memoized template function values, after albums or
+        items were added or removed, or the albums changed.
+        """
+        self._memotable = {}
+        self._aunique_index = {}
+
+    def _aunique_group(self, album_id, keys, disam):
+        """Get the values of the `disam` fields of all the albums sharing
+        the values of the `keys` fields with the album `album_id`.
+
+        Return a list with a tuple of values per album, or None if the
+        album is unknown or lacks any of the keys. The albums are grouped
+        once for each combination of fields, so that looking up an album
+        needs no query.
+        """
+        index_key = (tuple(keys), tuple(disam))
+        if index_key not in self._aunique_index:
+            album_keys: dict[int, tuple] = {}
+            groups: dict[tuple, list[tuple]] = defaultdict(list)
+            for id_, *values in self._fetch_values(
+                Album, ("id", *keys, *disam), None
+            ):
+                key_values = tuple(
+                    tuple(v) if isinstance(v, list) else v
+                    for v in values[: len(keys)]
+                )
+                album_keys[id_] = key_values
+                groups[key_values].append(
+                    tuple("" if v is None else v for v in values[len(keys) :])
+                )
+            self._aunique_index[index_key] = album_keys, groups
+
+        album_keys, groups = self._aunique_index[index_key]
+        key_values = album_keys.get(album_id)
+        if key_values is None or None in key_values:
+            return None
+        return groups[key_values]
+
     # Querying.
 
-    def _fetch(self, model_cls, query, sort=None):
-        """Parse a query and fetch.
+    def _parse_query(self, model_cls, query, sort=None):
+        """Parse a query given as a string or a list of strings, returning
+        the query and sort to be used.
 
         If an order specification is present in the query string
         the `sort` argument is ignored.
@@ -90,10 +214,8 @@ class Library(dbcore.Database):
         # Parse the query, if necessary.
         try:
             parsed_sort = None
-            if isinstance(query, str):
-                query, parsed_sort = parse_query_string(query, model_cls)
-            elif isinstance(query, (list, tuple)):
-                query, parsed_sort = parse_query_parts(query, model_cls)
+            if isinstance(query, (str, list, tuple)):
+                query, parsed_sort = parse_query_cached(query, model_cls)
         except dbcore.query.InvalidQueryArgumentValueError as exc:
             raise dbcore.InvalidQueryError(query, exc)
 
@@ -102,7 +224,37 @@ class Library(dbcore.Database):
         if parsed_sort and not isinstance(parsed_sort, dbcore.query.NullSort):
             sort = parsed_sort
 
-        return super()._fetch(model_cls, query, sort)
+        return query, sort
+
+    def _fetch(
+        self,
+        model_cls,
+        query,
+        sort=None,
+        flex_keys=None,
+        stream=False,
+        limit=None,
+        offset=0,
+        after=None,
+        with_related=False,
+    ):
+        """Parse a query and fetch."""
+        return super()._fetch(
+            model_cls,
+            *self._parse_query(model_cls, query, sort),
+            flex_keys,
+            stream,
+            limit,
+            offset,
+            after,
+            with_related,
+        )
+
+    def _fetch_values(self, model_cls, fields, query, sort=None):
+        """Parse a query and fetch the values of `fields`."""
+        return super()._fetch_values(
+            model_cls, fields, *self._parse_query(model_cls, query, sort)
+        )
 
     @staticmethod
     def get_default_album_sort():
@@ -118,13 +270,100 @@ class Library(dbcore.Database):
             Item, beets.config["sort_item"].as_str_seq()
         )
 
-    def albums(self, query=None, sort=None) -> Results[Album]:
-        """Get :class:`Album` objects matching the query."""
-        return self._fetch(Album, query, sort or self.get_default_album_sort())
+    def albums(
+        self,
+        query=None,
+        sort=None,
+        flex_keys=None,
+        stream=False,
+        limit=None,
+        offset=0,
+        after=None,
+    ) -> Results[Album]:
+        """Get :class:`Album` objects matching the query.
+
+        `flex_keys` restricts the flexible attributes loaded onto the
+        albums to the given keys. With `stream`, the albums are loaded in
+        batches while iterating instead of all at once. `limit`, `offset`
+        and `after` select a page of the albums, see :meth:`items`.
+        """
+        return self._fetch(
+            Album,
+            query,
+            sort or self.get_default_album_sort(),
+            flex_keys,
+            stream,
+            limit,
+            offset,
+            after,
+        )
+
+    def items(
+        self,
+        query=None,
+        sort=None,
+        flex_keys=None,
+        stream=False,
+        limit=None,
+        offset=0,
+        after=None,
+        with_albums=False,
+    ) -> Results[Item]:
+        """Get :class:`Item` objects matching the query.
+
+        `flex_keys` restricts the flexible attributes loaded onto the
+        items to the given keys. With `stream`, the items are loaded in
+        batches while iterating instead of all at once, which keeps
+        memory use bounded when walking through a large library.
+
+        `limit` and `offset` select a page of at most `limit` items,
+        skipping the first `offset` ones. Pass the id of the last item of
+        a page as `after` to get the items after it, which stays fast
+        however far the pages go.
+
+        With `with_albums`, the albums of the items are loaded together
+        and shared by their items, instead of being looked up for each
+        item when it is formatted or its album fields are used.
+        """
+        return self._fetch(
+            Item,
+            query,
+            sort or self.get_default_item_sort(),
+            flex_keys,
+            stream,
+            limit,
+            offset,
+            after,
+            with_albums,
+        )
 
-    def items(self, query=None, sort=None) -> Results[Item]:
-        """Get :class:`Item` objects matching the query."""
-        return self._fetch(Item, query, sort or self.get_default_item_sort())
+    def album_values(
+        self, fields, query=None, sort=None, as_columns=False
+    ) -> list[tuple] | dict[str, list]:
+        """Get the values of `fields` for albums matching the query.
+
+        See :meth:`item_values`.
+        """
+        rows = self._fetch_values(
+            Album, fields, query, sort or self.get_default_album_sort()
+        )
+        return _columns(fields, rows) if as_columns else rows
+
+    def item_values(
+        self, fields, query=None, sort=None, as_columns=False
+    ) -> list[tuple] | dict[str, list]:
+        """Get the values of `fields` for items matching the query.
+
+        This is a lightweight alternative to :meth:`items` for callers
+        that only need a few fields: no :class:`Item` objects are built
+        when all of the fields are fixed ones. Return a list with a tuple
+        of values per item or, if `as_columns` is set, a dict mapping each
+        field to the list of its values.
+        """
+        rows = self._fetch_values(
+            Item, fields, query, sort or self.get_default_item_sort()
+        )
+        return _columns(fields, rows) if as_columns else rows
 
     # Convenience accessors.
     def get_item(self, id_: int) -> Item | None:
@@ -144,3 +383,51 @@ class Library(dbcore.Database):
             item_or_id if isinstance(item_or_id, int) else item_or_id.album_id
         )
         return self._get(Album, album_id) if album_id else None
+
+    # Paths.
+
+    def destinations(
+        self,
+        items: Iterable[Item],
+        basedir: bytes | None = None,
+        relative_to_libdir: bool = False,
+        path_formats=None,
+    ) -> list[bytes]:
+        """Get the destination of each item, like :meth:`Item.destination`
+        does, in the same order.
+
+        The work shared by the items is done once: the path formats are
+        parsed once, the albums of the items are fetched together, and
+        the formatted album fields are reused for all the items of an
+        album. Values of ``%aunique`` are memoized for the whole batch.
+        """
+        items = list(items)
+        basedir = basedir or self.directory
+        path_formats = Item._parse_path_formats(
+            path_formats or self.path_formats
+        )
+        album_ids = sorted({item.album_id for item in items} - {None})
+        albums = self._get_many(Album, album_ids)
+        album_values: dict[int, dict[str, str]] = {}
+
+        dests = []
+        for item in items:
+            values = None
+            if item.album_id in albums:
+                item._cached_album = albums[item.album_id]
+                values = album_values.setdefault(item.album_id, {})
+            dests.append(
+                item._destination(
+                    item._path_template(path_formats),
+                    basedir,
+                    relative_to_libdir,
+                    values,
+                )
+            )
+        return dests
+
+
+def _columns(fields, rows) -> dict[str, list]:
+    """Transpose value tuples into a mapping from field to values."""
+    columns = zip(*rows) if rows else ([] for _ in fields)
+    return {field: list(values) for field, values in zip(fields, columns)}
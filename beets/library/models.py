@@ -5,7 +5,10 @@ import string
 import sys
 import time
 import unicodedata
+from collections import OrderedDict
 from functools import cached_property
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
@@ -29,7 +32,9 @@ from .exceptions import FileOperationError, ReadError, WriteError
 from .queries import PF_KEY_DEFAULT, parse_query_string
 
 if TYPE_CHECKING:
-    from ..dbcore.query import FieldQuery, FieldQueryType
+    from collections.abc import Iterable, Iterator
+
+    from ..dbcore.query import FieldQuery, FieldQueryType, Query, Sort
     from .library import Library  # noqa: F401
 
 log = logging.getLogger("beets")
@@ -55,6 +60,26 @@ class LibModel(dbcore.Model["Library"]):
     def _queries(cls) -> dict[str, FieldQueryType]:
         return plugins.named_queries(cls)  # type: ignore[arg-type]
 
+    @cached_classproperty
+    def _indexed_fields(cls) -> set[str]:
+        """Return the fields indexed through the configuration and by
+        plugins.
+        """
+        fields = plugins.indexed_fields(cls)  # type: ignore[arg-type]
+        configured = beets.config["indexes"][cls.__name__.lower()]
+        if configured.exists():
+            fields.update(configured.as_str_seq())
+        for field in sorted(fields):
+            if not field.isidentifier():
+                log.warning("cannot index invalid field name {!r}", field)
+                fields.discard(field)
+        return fields
+
+    @cached_classproperty
+    def _query_cache(cls) -> OrderedDict[tuple, tuple[Query, Sort]]:
+        """Recently parsed query strings, see `parse_query_cached`."""
+        return OrderedDict()
+
     @cached_classproperty
     def writable_media_fields(cls) -> set[str]:
         return set(MediaFile.fields()) & cls._fields.keys()
@@ -108,7 +133,23 @@ class LibModel(dbcore.Model["Library"]):
             # Using an explicit table name resolves this.
             field = f"{cls._table}.{field}"
 
-        return query_cls(field, pattern, fast)
+        query = query_cls(field, pattern, fast)
+        if isinstance(query, dbcore.FieldQuery) and cls.is_flex_field(field):
+            # A flexible attribute, which can be looked up in SQLite
+            # rather than matched against every object.
+            query.model_cls = cls
+        return query
+
+    @classmethod
+    def is_flex_field(cls, field: str) -> bool:
+        """Check whether `field` can only be a flexible attribute, i.e.
+        it is neither stored in a table nor computed.
+        """
+        return (
+            field not in cls.all_db_fields
+            and field not in cls._getters()
+            and field not in cls._relation._getters()
+        )
 
     @classmethod
     def any_field_query(cls, *args, **kwargs) -> dbcore.OrQuery:
@@ -140,13 +181,30 @@ class FormattedItemMapping(dbcore.db.FormattedMapping):
     """
 
     ALL_KEYS = "*"
+    FALLBACK_KEYS = frozenset(("artist", "albumartist"))
 
-    def __init__(self, item, included_keys=ALL_KEYS, for_path=False):
+    def __init__(
+        self,
+        item,
+        included_keys=ALL_KEYS,
+        for_path=False,
+        used_keys=None,
+        album_values=None,
+    ):
         # We treat album and item keys specially here,
         # so exclude transitive album keys from the model's keys.
         super().__init__(item, included_keys=[], for_path=for_path)
         self.included_keys = included_keys
-        if included_keys == self.ALL_KEYS:
+        if used_keys is not None and self.FALLBACK_KEYS & set(used_keys):
+            # Keep the fields that `artist` and `albumartist` fall back to.
+            used_keys = self.FALLBACK_KEYS.union(used_keys)
+        self.used_keys = used_keys
+        # Formatted album values, which may be shared by the items of
+        # the album.
+        self.album_values = {} if album_values is None else album_values
+        if included_keys == self.ALL_KEYS and used_keys is not None:
+            self.model_keys = item._keys_among(used_keys, computed=True)
+        elif included_keys == self.ALL_KEYS:
             # Performance note: this triggers a database query.
             self.model_keys = item.keys(computed=True, with_album=False)
         else:
@@ -160,10 +218,15 @@ class FormattedItemMapping(dbcore.db.FormattedMapping):
     @cached_property
     def album_keys(self):
         album_keys = []
+        # Performance note: this triggers a database query, unless the
+        # album was fetched with its items (`with_albums`).
         if self.album:
             if self.included_keys == self.ALL_KEYS:
-                # Performance note: this triggers a database query.
-                for key in self.album.keys(computed=True):
+                if self.used_keys is None:
+                    keys = self.album.keys(computed=True)
+                else:
+                    keys = self.album._keys_among(self.used_keys, True)
+                for key in keys:
                     if (
                         key in Album.item_keys
                         or key not in self.item._fields.keys()
@@ -183,14 +246,19 @@ class FormattedItemMapping(dbcore.db.FormattedMapping):
         Raise a KeyError for invalid keys.
         """
         if self.for_path and key in self.album_keys:
-            return self._get_formatted(self.album, key)
+            return self._get_album_formatted(key)
         elif key in self.model_keys:
             return self._get_formatted(self.model, key)
         elif key in self.album_keys:
-            return self._get_formatted(self.album, key)
+            return self._get_album_formatted(key)
         else:
             raise KeyError(key)
 
+    def _get_album_formatted(self, key):
+        if key not in self.album_values:
+            self.album_values[key] = self._get_formatted(self.album, key)
+        return self.album_values[key]
+
     def __getitem__(self, key):
         """Get the value for a key.
 
@@ -387,6 +455,7 @@ class Album(LibModel):
         Set with_items to False to avoid removing the album's items.
         """
         super().remove()
+        self._db._clear_memo()
 
         # Send a 'album_removed' signal to plugins
         plugins.send("album_removed", album=self)
@@ -470,8 +539,15 @@ class Album(LibModel):
 
         # Move items.
         items = list(self.items())
-        for item in items:
-            item.move(operation, basedir=basedir, with_album=False, store=store)
+        dests = self._db.destinations(items, basedir=basedir)
+        for item, dest in zip(items, dests):
+            item.move(
+                operation,
+                basedir=basedir,
+                with_album=False,
+                store=store,
+                dest=dest,
+            )
 
         # Move art.
         self.move_art(operation)
@@ -579,31 +655,34 @@ class Album(LibModel):
         This applies to fixed attributes as well as flexible ones. The `id`
         attribute of the album will never be inherited.
         """
+        self.db.bulk_store([self], fields, inherit=inherit)
+
+    def _inherit(self):
+        """Copy the album's modified fields to its tracks and return the
+        tracks that need storing.
+        """
         # Get modified track fields.
         track_updates = {}
         track_deletes = set()
         for key in self._dirty:
-            if inherit:
-                if key in self.item_keys:  # is a fixed attribute
-                    track_updates[key] = self[key]
-                elif key not in self:  # is a fixed or a flexible attribute
-                    track_deletes.add(key)
-                elif key != "id":  # is a flexible attribute
-                    track_updates[key] = self[key]
-
-        with self._db.transaction():
-            super().store(fields)
-            if track_updates:
-                for item in self.items():
-                    for key, value in track_updates.items():
-                        item[key] = value
-                    item.store()
-            if track_deletes:
-                for item in self.items():
-                    for key in track_deletes:
-                        if key in item:
-                            del item[key]
-                    item.store()
+            if key in self.item_keys:  # is a fixed attribute
+                track_updates[key] = self[key]
+            elif key not in self:  # is a fixed or a flexible attribute
+                track_deletes.add(key)
+            elif key != "id":  # is a flexible attribute
+                track_updates[key] = self[key]
+
+        if not (track_updates or track_deletes):
+            return []
+
+        items = list(self.items())
+        for item in items:
+            for key, value in track_updates.items():
+                item[key] = value
+            for key in track_deletes:
+                if key in item:
+                    del item[key]
+        return items
 
     def try_sync(self, write, move, inherit=True):
         """Synchronize the album and its items with the database.
@@ -735,7 +814,7 @@ class Item(LibModel):
         "last_edited_ISO": types.STRING,
         "tags": types.STRING,
         "rekordbox_colour": types.STRING,
-        "last_download_attempt": types.STRING
+        "last_download_attempt": types.STRING,
     }
     _indices = (dbcore.Index("idx_item_album_id", ("album_id",)),)
 
@@ -813,6 +892,16 @@ class Item(LibModel):
     def _cached_album(self, album):
         self.__album = album
 
+    @classmethod
+    def _fetch_related(cls, db, rows):
+        """Fetch the albums of the items built from `rows` at once."""
+        album_ids = sorted({row["album_id"] for row in rows} - {None})
+        return db._get_many(Album, album_ids)
+
+    def _set_related(self, related):
+        if self.album_id in related:
+            self._cached_album = related[self.album_id]
+
     @classmethod
     def _getters(cls):
         getters = plugins.item_field_getters()
@@ -885,6 +974,48 @@ class Item(LibModel):
             keys = list(keys)
         return keys
 
+    @classmethod
+    def flex_field_clause(cls, query):
+        """Generate an SQLite expression that evaluates `query` on a
+        flexible attribute, falling back to the attribute of the item's
+        album when the item does not have it, like `get` does.
+        """
+        key = query.field_name
+        table = cls._table
+        matching, subvals = cls._flex_subquery(key, query)
+        present, present_subvals = cls._flex_subquery(key)
+        album_matching, album_subvals = Album._flex_subquery(key, query)
+        subvals += present_subvals + album_subvals
+
+        album_clause = (
+            f"{table}.album_id IS NOT NULL"
+            f" AND {table}.album_id IN ({album_matching})"
+        )
+        if query.matches_missing():
+            # Neither the item nor its album may have the attribute.
+            album_present, album_present_subvals = Album._flex_subquery(key)
+            album_clause = (
+                f"{album_clause} OR {table}.album_id IS NULL"
+                f" OR {table}.album_id NOT IN ({album_present})"
+            )
+            subvals += album_present_subvals
+
+        clause = (
+            f"{table}.id IN ({matching})"
+            f" OR ({table}.id NOT IN ({present}) AND ({album_clause}))"
+        )
+        return f"({clause})", subvals
+
+    @classmethod
+    def _flex_value_sql(cls, key, entity_id=None):
+        """Return a subquery selecting the value of the flexible attribute
+        `key` of an item, or of its album when the item does not have it.
+        """
+        if entity_id:
+            return super()._flex_value_sql(key, entity_id)
+        album_value = Album._flex_value_sql(key, f"{cls._table}.album_id")
+        return f"COALESCE({super()._flex_value_sql(key)}, {album_value})"
+
     def get(self, key, default=None, with_album=True):
         """Get the value for a given key or `default` if it does not
         exist.
@@ -971,22 +1102,40 @@ class Item(LibModel):
 
         Can raise either a `ReadError` or a `WriteError`.
         """
+        path, item_tags = self._before_write(path, tags)
+        self._write_file(path, item_tags, id3v23)
+        self._after_write(path)
+
+    def _before_write(self, path=None, tags=None) -> tuple[bytes, dict]:
+        """Get the path and the tags that `write` writes, and send the
+        "write" event, which may change the tags.
+        """
         if path is None:
             path = self.path
         else:
             path = normpath(path)
 
-        if id3v23 is None:
-            id3v23 = beets.config["id3v23"].get(bool)
-
-        # Get the data to write to the file.
-        item_tags = dict(self)
-        item_tags = {
-            k: v for k, v in item_tags.items() if k in self._media_fields
-        }  # Only write media fields.
+        # Get the data to write to the file. Only media fields are
+        # written. They are looked up one by one instead of listing all
+        # the item's fields, which would load its album even if all of
+        # them are the item's own.
+        item_tags = {}
+        for key in self._media_fields:
+            try:
+                item_tags[key] = self[key]
+            except KeyError:
+                pass
         if tags is not None:
             item_tags.update(tags)
         plugins.send("write", item=self, path=path, tags=item_tags)
+        return path, item_tags
+
+    def _write_file(self, path: bytes, tags: dict, id3v23=None):
+        """Write `tags` to the media file at `path`. No events are sent
+        and the item is not changed, so this can run in any thread.
+        """
+        if id3v23 is None:
+            id3v23 = beets.config["id3v23"].get(bool)
 
         # Open the file.
         try:
@@ -995,12 +1144,16 @@ class Item(LibModel):
             raise ReadError(path, exc)
 
         # Write the tags to the file.
-        mediafile.update(item_tags)
+        mediafile.update(tags)
         try:
             mediafile.save()
         except UnreadableFileError as exc:
             raise WriteError(self.path, exc)
 
+    def _after_write(self, path: bytes):
+        """Update the item after its file at `path` was written and send
+        the "after_write" event.
+        """
         # The file has a new mtime.
         if path == self.path:
             self.mtime = self.current_mtime()
@@ -1019,6 +1172,73 @@ class Item(LibModel):
             log.error("{}", exc)
             return False
 
+    # The number of items that `write_many` hands to its threads at once.
+    write_batch_size = 500
+
+    @classmethod
+    def write_many(
+        cls,
+        items: Iterable[Item],
+        jobs: int | None = None,
+        pool: ThreadPool | None = None,
+        **kwargs,
+    ) -> Iterator[tuple[Item, FileOperationError | None]]:
+        """Write the metadata of many items to their files, using `jobs`
+        threads (by default, one per CPU) or the threads of `pool`. The
+        keyword arguments are passed on to :meth:`write`.
+
+        Generate each item together with the error writing it raised, or
+        None, in the order of `items` and as soon as it is written. Only
+        the files are written in the threads: the "write" and
+        "after_write" events are sent, and the items are updated, from the
+        calling thread, so the caller can store the items while they are
+        generated. Errors are logged like in :meth:`try_write`.
+        """
+        id3v23 = kwargs.pop("id3v23", None)
+
+        def write(args: tuple[Item, bytes, dict]) -> FileOperationError | None:
+            item, path, tags = args
+            try:
+                item._write_file(path, tags, id3v23)
+            except FileOperationError as exc:
+                return exc
+            return None
+
+        items = iter(items)
+        own_pool = None
+        try:
+            while batch := list(islice(items, cls.write_batch_size)):
+                # The "write" event may abort writing an item.
+                prepared: list[tuple[Item, bytes, dict] | FileOperationError]
+                prepared = []
+                for item in batch:
+                    try:
+                        prepared.append((item, *item._before_write(**kwargs)))
+                    except FileOperationError as exc:
+                        prepared.append(exc)
+                writes = [p for p in prepared if isinstance(p, tuple)]
+
+                if pool is None and (
+                    jobs == 1 or (own_pool is None and len(writes) <= 1)
+                ):
+                    written = map(write, writes)
+                else:
+                    if pool is None:
+                        pool = own_pool = ThreadPool(jobs)
+                    written = pool.imap(write, writes)
+
+                for item, args in zip(batch, prepared):
+                    if isinstance(args, FileOperationError):
+                        error = args
+                    elif (error := next(written)) is None:
+                        item._after_write(args[1])
+                    if error:
+                        log.error("{}", error)
+                    yield item, error
+        finally:
+            if own_pool:
+                own_pool.terminate()
+
     def try_sync(self, write, move, with_album=True):
         """Synchronize the item with the database and, possibly, update its
         tags on disk and its path (by moving the file).
@@ -1050,6 +1270,14 @@ class Item(LibModel):
 
         `operation` should be an instance of `util.MoveOperation`.
         """
+        dest = self._before_move(dest, operation)
+        self._move_file(dest, operation)
+        self._after_move(dest, operation)
+
+    def _before_move(self, dest, operation) -> bytes:
+        """Get the unique destination that `move_file` uses, and send the
+        "before_item_moved" event if the file is moved.
+        """
         if not util.samefile(self.path, dest):
             dest = util.unique_path(dest)
         if operation == MoveOperation.MOVE:
@@ -1059,38 +1287,41 @@ class Item(LibModel):
                 source=self.path,
                 destination=dest,
             )
+        return dest
+
+    def _move_file(self, dest: bytes, operation):
+        """Move, copy or link the file to `dest`. No events are sent and
+        the item is not changed, so this can run in any thread.
+        """
+        if operation == MoveOperation.MOVE:
             util.move(self.path, dest)
-            plugins.send(
-                "item_moved", item=self, source=self.path, destination=dest
-            )
         elif operation == MoveOperation.COPY:
             util.copy(self.path, dest)
-            plugins.send(
-                "item_copied", item=self, source=self.path, destination=dest
-            )
         elif operation == MoveOperation.LINK:
             util.link(self.path, dest)
-            plugins.send(
-                "item_linked", item=self, source=self.path, destination=dest
-            )
         elif operation == MoveOperation.HARDLINK:
             util.hardlink(self.path, dest)
-            plugins.send(
-                "item_hardlinked", item=self, source=self.path, destination=dest
-            )
         elif operation == MoveOperation.REFLINK:
             util.reflink(self.path, dest, fallback=False)
-            plugins.send(
-                "item_reflinked", item=self, source=self.path, destination=dest
-            )
         elif operation == MoveOperation.REFLINK_AUTO:
             util.reflink(self.path, dest, fallback=True)
-            plugins.send(
-                "item_reflinked", item=self, source=self.path, destination=dest
-            )
         else:
             assert False, "unknown MoveOperation"
 
+    def _after_move(self, dest: bytes, operation):
+        """Send the event for the file that was moved (or copied or linked)
+        to `dest`, and update the item's path.
+        """
+        event = {
+            MoveOperation.MOVE: "item_moved",
+            MoveOperation.COPY: "item_copied",
+            MoveOperation.LINK: "item_linked",
+            MoveOperation.HARDLINK: "item_hardlinked",
+            MoveOperation.REFLINK: "item_reflinked",
+            MoveOperation.REFLINK_AUTO: "item_reflinked",
+        }[operation]
+        plugins.send(event, item=self, source=self.path, destination=dest)
+
         # Either copying or moving succeeded, so update the stored path.
         self.path = dest
 
@@ -1137,7 +1368,7 @@ class Item(LibModel):
             util.remove(self.path)
             util.prune_dirs(os.path.dirname(self.path), self._db.directory)
 
-        self._db._memotable = {}
+        self._db._clear_memo()
 
     def move(
         self,
@@ -1145,6 +1376,7 @@ class Item(LibModel):
         basedir=None,
         with_album=True,
         store=True,
+        dest=None,
     ):
         """Move the item to its designated location within the library
         directory (provided by destination()).
@@ -1166,8 +1398,11 @@ class Item(LibModel):
         as a side effect.
         If `store` is `False` however, the item won't be stored and it will
         have to be manually stored after invoking this method.
+
+        `dest` is the destination if it has been computed already.
         """
-        dest = self.destination(basedir=basedir)
+        if dest is None:
+            dest = self.destination(basedir=basedir)
 
         # Create necessary ancestry for the move.
         util.mkdirall(dest)
@@ -1207,32 +1442,63 @@ class Item(LibModel):
         base directory.
         """
         basedir = basedir or self.db.directory
-        path_formats = path_formats or self.db.path_formats
+        path_formats = self._parse_path_formats(
+            path_formats or self.db.path_formats
+        )
+        return self._destination(
+            self._path_template(path_formats), basedir, relative_to_libdir
+        )
+
+    @classmethod
+    def _parse_path_formats(cls, path_formats):
+        """Parse the queries and templates of the given path formats.
 
-        # Use a path format based on a query, falling back on the
-        # default.
+        Return a list of `(query, template)` pairs in the order the
+        path formats are tried, ending with the default path format,
+        whose query is None.
+        """
+        parsed = []
+        default = None
         for query, path_format in path_formats:
-            if query == PF_KEY_DEFAULT:
-                continue
-            query, _ = parse_query_string(query, type(self))
-            if query.match(self):
-                # The query matches the item! Use the corresponding path
-                # format.
-                break
-        else:
-            # No query matched; fall back to default.
-            for query, path_format in path_formats:
-                if query == PF_KEY_DEFAULT:
-                    break
+            if isinstance(path_format, Template):
+                tmpl = path_format
             else:
-                assert False, "no default path format"
-        if isinstance(path_format, Template):
-            subpath_tmpl = path_format
-        else:
-            subpath_tmpl = template(path_format)
+                tmpl = template(path_format)
+            if query != PF_KEY_DEFAULT:
+                query, _ = parse_query_string(query, cls)
+                parsed.append((query, tmpl))
+            elif default is None:
+                default = tmpl
+        if default is not None:
+            parsed.append((None, default))
+        return parsed
+
+    def _path_template(self, path_formats):
+        """Get the template of the first of the parsed path formats whose
+        query matches the item, falling back on the default.
+        """
+        for query, tmpl in path_formats:
+            if query is None or query.match(self):
+                return tmpl
+        assert False, "no default path format"
+
+    def _destination(
+        self, subpath_tmpl, basedir, relative_to_libdir, album_values=None
+    ):
+        """Evaluate the path template to get the item's destination.
 
+        `album_values` caches the formatted values of the album's fields
+        and may be shared by the items of the album.
+        """
         # Evaluate the selected template.
-        subpath = self.evaluate_template(subpath_tmpl, True)
+        mapping = self._formatter(
+            self,
+            for_path=True,
+            used_keys=subpath_tmpl.fields,
+            album_values=album_values,
+        )
+        funcs = self._template_funcs() if subpath_tmpl.functions else {}
+        subpath = subpath_tmpl.substitute(mapping, funcs)
 
         # Prepare path for output: normalize Unicode characters.
         if sys.platform == "darwin":
@@ -1508,29 +1774,38 @@ class DefaultTemplateFunctions:
             bracket_l = ""
             bracket_r = ""
 
-        # Find matching items to disambiguate with.
-        query = db_item.duplicates_query(keys)
-        ambigous_items = (
-            self.lib.items(query)
-            if isinstance(db_item, Item)
-            else self.lib.albums(query)
-        )
+        # Find matching items to disambiguate with, as the values of
+        # their disambiguators. Albums are looked up in the library's
+        # index rather than queried.
+        ambiguous_values = None
+        if isinstance(db_item, Album):
+            ambiguous_values = self.lib._aunique_group(item_id, keys, disam)
+        if ambiguous_values is None:
+            query = db_item.duplicates_query(keys)
+            ambigous_items = (
+                self.lib.items(query)
+                if isinstance(db_item, Item)
+                else self.lib.albums(query)
+            )
+            ambiguous_values = [
+                tuple(s.get(d, "") for d in disam) for s in ambigous_items
+            ]
 
         # If there's only one item to matching these details, then do
         # nothing.
-        if len(ambigous_items) == 1:
+        if len(ambiguous_values) == 1:
             self.lib._memotable[memokey] = ""
             return ""
 
         # Find the first disambiguator that distinguishes the items.
-        for disambiguator in disam:
+        for i, disambiguator in enumerate(disam):
             # Get the value for each item for the current field.
-            disam_values = {s.get(disambiguator, "") for s in ambigous_items}
+            disam_values = {values[i] for values in ambiguous_values}
 
             # If the set of unique values is equal to the number of
             # items in the disambiguation set, we're done -- this is
             # sufficient disambiguation.
-            if len(disam_values) == len(ambigous_items):
+            if len(disam_values) == len(ambiguous_values):
                 break
         else:
             # No disambiguator distinguished all fields.
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import os
 import shlex
+import threading
 
 import beets
 from beets import dbcore, logging, plugins
@@ -11,6 +13,11 @@ log = logging.getLogger("beets")
 # Special path format key.
 PF_KEY_DEFAULT = "default"
 
+# The number of parsed queries to keep for each model class.
+QUERY_CACHE_SIZE = 256
+
+_query_cache_lock = threading.Lock()
+
 # Query construction helpers.
 
 
@@ -59,3 +66,57 @@ def parse_query_string(s, model_cls):
     except ValueError as exc:
         raise dbcore.InvalidQueryError(s, exc)
     return parse_query_parts(parts, model_cls)
+
+
+def _is_cacheable(query):
+    """Check whether a parsed query can be reused later.
+
+    Only queries built from core query types are, except date queries,
+    which are relative to the current time, and path queries, which
+    depend on the filesystem.
+    """
+    if isinstance(query, dbcore.query.CollectionQuery):
+        return all(_is_cacheable(q) for q in query.subqueries)
+    if isinstance(query, dbcore.query.NotQuery):
+        return _is_cacheable(query.subquery)
+    return type(query).__module__ == dbcore.query.__name__ and not isinstance(
+        query, (dbcore.query.DateQuery, dbcore.query.PathQuery)
+    )
+
+
+def parse_query_cached(query, model_cls):
+    """Parse a query string or a list of query strings like
+    `parse_query_string` and `parse_query_parts`, reusing the result of
+    a recent identical call when possible.
+
+    Reused queries are wrapped in a `CompiledQuery`, so that their SQL is
+    built only once as well.
+    """
+    parse = parse_query_string if isinstance(query, str) else parse_query_parts
+    parts = (query,) if isinstance(query, str) else tuple(query)
+    # Parts containing a path separator may or may not be path queries,
+    # depending on whether the path exists.
+    if any(sep and sep in p for p in parts for sep in (os.sep, os.altsep)):
+        return parse(query, model_cls)
+
+    key = (
+        parse,
+        parts,
+        beets.config["sort_case_insensitive"].get(bool),
+    )
+    cache = model_cls._query_cache
+    with _query_cache_lock:
+        if (parsed := cache.get(key)) is not None:
+            cache.move_to_end(key)
+            return parsed
+
+    query, sort = parse(query, model_cls)
+    if not _is_cacheable(query):
+        return query, sort
+
+    parsed = dbcore.query.CompiledQuery(query), sort
+    with _query_cache_lock:
+        cache[key] = parsed
+        if len(cache) > QUERY_CACHE_SIZE:
+            cache.popitem(last=False)
+    return parsed
@@ -8,11 +8,21 @@ implemented as plugins.
 from __future__ import annotations
 
 import abc
+import hashlib
+import json
+import pickle
 import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import contextmanager, nullcontext
 from functools import cache, cached_property, wraps
-from typing import TYPE_CHECKING, Generic, Literal, TypedDict, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypedDict, TypeVar
 
+import confuse
 import unidecode
 from confuse import NotFoundError
 from typing_extensions import NotRequired
@@ -33,6 +43,9 @@ if TYPE_CHECKING:
 # Global logger.
 log = logging.getLogger("beets")
 
+# The cache of metadata lookups set up by the UI, if enabled.
+lookup_cache: LookupCache | None = None
+
 
 @cache
 def find_metadata_source_plugins() -> list[MetadataSourcePlugin]:
@@ -52,6 +65,271 @@ def handle_plugin_error(plugin: MetadataSourcePlugin, method_name: str):
         log.debug("Exception details:", exc_info=True)
 
 
+class LookupCache:
+    """A persistent cache of the results of metadata source plugins,
+    stored in an SQLite database.
+
+    Entries are keyed by the data source, the plugin method and its
+    normalized arguments, and expire after a time to live. When the
+    cache is closed, the least recently used entries are evicted until
+    the cached results take up at most `max_size` bytes.
+    """
+
+    def __init__(self, path: str, ttl: float, max_size: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        # The hits and misses of each source during this run.
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    source TEXT,
+                    method TEXT,
+                    value BLOB,
+                    expires REAL,
+                    accessed REAL
+                );
+                CREATE TABLE IF NOT EXISTS counters (
+                    source TEXT PRIMARY KEY,
+                    hits INTEGER,
+                    misses INTEGER
+                );
+                """
+            )
+
+    @classmethod
+    def key(
+        cls,
+        source: str,
+        method: str,
+        args: Any,
+        options: dict[str, Any] | None = None,
+    ) -> str:
+        """Return the key of the entry for a call of `method` of the
+        plugin for `source` with `args`, when the plugin is configured
+        with `options`.
+        """
+        data = json.dumps(
+            [source, method, cls._normalize(args), cls._normalize(options)]
+        )
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    @classmethod
+    def _normalize(cls, value: Any) -> Any:
+        """Turn `value` into an equivalent JSON-serializable value. Items
+        are represented by the metadata read from their files.
+        """
+        if isinstance(value, str):
+            return unicodedata.normalize("NFC", value).strip()
+        elif value is None or isinstance(value, (bool, int, float)):
+            return value
+        elif isinstance(value, dict):
+            return {str(k): cls._normalize(v) for k, v in sorted(value.items())}
+        elif isinstance(value, (list, tuple)):
+            return [cls._normalize(v) for v in value]
+        elif (fields := getattr(value, "_media_fields", None)) is not None:
+            return {
+                f: cls._normalize(value.get(f, with_album=False))
+                for f in sorted(fields)
+            }
+        else:
+            return repr(value)
+
+    def get(self, source: str, key: str) -> Any:
+        """Return the cached value for `key`, or None if there is no
+        such entry or it has expired.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE key = ? AND expires > ?",
+                (key, now),
+            ).fetchone()
+            if row:
+                self._conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+                )
+                self.hits[source] += 1
+            else:
+                self.misses[source] += 1
+        return pickle.loads(row[0]) if row else None
+
+    def set(
+        self,
+        source: str,
+        method: str,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+    ):
+        """Store `value` for `key`, expiring after `ttl` seconds or the
+        default time to live of the cache.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, source, method, value, expires, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    source,
+                    method,
+                    pickle.dumps(value),
+                    now + (self.ttl if ttl is None else ttl),
+                    now,
+                ),
+            )
+
+    def stats(self) -> list[tuple[str, int, int, int, int]]:
+        """Return `(source, entries, size, hits, misses)` tuples for
+        each source, where the hits and misses are counted over all
+        runs.
+        """
+        self._save_counters()
+        with self._lock:
+            sizes = {
+                source: (entries, size)
+                for source, entries, size in self._conn.execute(
+                    "SELECT source, COUNT(*), SUM(LENGTH(value)) "
+                    "FROM entries GROUP BY source"
+                )
+            }
+            counters = {
+                source: (hits, misses)
+                for source, hits, misses in self._conn.execute(
+                    "SELECT source, hits, misses FROM counters"
+                )
+            }
+        return [
+            (source, *sizes.get(source, (0, 0)), *counters.get(source, (0, 0)))
+            for source in sorted(sizes.keys() | counters.keys())
+        ]
+
+    def clear(self, sources: Sequence[str] = ()) -> int:
+        """Remove the entries and counters of the given sources, or of
+        all sources, and return the number of entries removed. Source
+        names are matched case-insensitively.
+        """
+        names = [source.lower() for source in sources]
+        where = ""
+        if names:
+            where = f" WHERE lower(source) IN ({', '.join('?' * len(names))})"
+        with self._lock, self._conn:
+            count = self._conn.execute(
+                f"DELETE FROM entries{where}", names
+            ).rowcount
+            self._conn.execute(f"DELETE FROM counters{where}", names)
+            for counter in (self.hits, self.misses):
+                for source in list(counter):
+                    if not names or source.lower() in names:
+                        del counter[source]
+        return count
+
+    def _save_counters(self):
+        """Add the hits and misses of this run to the stored counters."""
+        with self._lock, self._conn:
+            for source in self.hits | self.misses:
+                self._conn.execute(
+                    "INSERT INTO counters (source, hits, misses) "
+                    "VALUES (?, ?, ?) ON CONFLICT (source) DO UPDATE SET "
+                    "hits = hits + excluded.hits, "
+                    "misses = misses + excluded.misses",
+                    (source, self.hits[source], self.misses[source]),
+                )
+            self.hits.clear()
+            self.misses.clear()
+
+    def close(self):
+        """Store the counters, evict expired and least recently used
+        entries and close the database.
+        """
+        with self._lock:
+            hits, misses = self.hits.total(), self.misses.total()
+        if hits or misses:
+            log.debug("lookup cache: {} hits, {} misses", hits, misses)
+        self._save_counters()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM entries WHERE expires <= ?", (time.time(),)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(LENGTH(value)) OVER (
+                            ORDER BY accessed DESC, key
+                        ) AS total
+                        FROM entries
+                    )
+                    WHERE total > ?
+                )
+                """,
+                (self.max_size,),
+            )
+        self._conn.close()
+
+
+def _cache_ttl(plugin: MetadataSourcePlugin) -> float | None:
+    """Return the `cache_ttl` of a plugin in seconds, if any."""
+    try:
+        return plugin.config["cache_ttl"].get(
+            confuse.Optional(confuse.Number())
+        )
+    except NotFoundError:
+        return None
+
+
+# The options of metadata source plugins that do not change the results
+# of their lookups.
+_UNCACHED_OPTIONS = frozenset({"cache_ttl", "lookup_timeout"})
+
+
+def _cache_options(plugin: MetadataSourcePlugin) -> dict[str, Any]:
+    """Return the configuration of a plugin that the results of its
+    lookups depend on, such as its search limit.
+    """
+    try:
+        options = plugin.config.flatten()
+    except confuse.ConfigError:
+        return {}
+    return {k: v for k, v in options.items() if k not in _UNCACHED_OPTIONS}
+
+
+def _lookup_ids(
+    plugin: MetadataSourcePlugin, method_name: str, ids: Iterable[str]
+) -> Iterable[Any]:
+    """Call the batch lookup method of a plugin, taking the results that
+    are in the lookup cache from there.
+    """
+    method = getattr(plugin, method_name)
+    cache = lookup_cache
+    if cache is None:
+        return method(ids)
+
+    source = plugin.data_source
+    options = _cache_options(plugin)
+    keys = {id_: cache.key(source, method_name, id_, options) for id_ in ids}
+    found = {id_: cache.get(source, key) for id_, key in keys.items()}
+    missing = [id_ for id_, info in found.items() if info is None]
+    if missing:
+        # Batch lookups yield one result, or None, for each ID.
+        for id_, info in zip(missing, method(missing), strict=True):
+            if info is not None:
+                cache.set(
+                    source, method_name, keys[id_], info, _cache_ttl(plugin)
+                )
+            found[id_] = info
+    return [found[id_] for id_ in keys]
+
+
 def _yield_from_plugins(
     func: Callable[..., Iterable[Ret]],
 ) -> Callable[..., Iterator[Ret]]:
@@ -60,25 +338,154 @@ def _yield_from_plugins(
     @wraps(func)
     def wrapper(*args, **kwargs) -> Iterator[Ret]:
         for plugin in find_metadata_source_plugins():
-            method = getattr(plugin, method_name)
             with (
                 nullcontext()
                 if config["raise_on_error"]
                 else handle_plugin_error(plugin, method_name)
             ):
-                yield from filter(None, method(*args, **kwargs))
+                yield from filter(
+                    None, _lookup_ids(plugin, method_name, *args, **kwargs)
+                )
+
+    return wrapper
+
+
+def _call_plugin(
+    plugin: MetadataSourcePlugin,
+    method_name: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> list[Any]:
+    """Call a plugin method and return the results it yields, or the
+    cached results of an earlier call with the same arguments.
+
+    If the method fails and `raise_on_error` is off, the error is logged
+    and the results yielded before it are returned.
+    """
+    cache = lookup_cache
+    if cache is not None:
+        key = cache.key(
+            plugin.data_source,
+            method_name,
+            [args, kwargs],
+            _cache_options(plugin),
+        )
+        cached = cache.get(plugin.data_source, key)
+        if cached is not None:
+            return cached
+
+    results: list[Any] = []
+    complete = False
+    with (
+        nullcontext()
+        if config["raise_on_error"]
+        else handle_plugin_error(plugin, method_name)
+    ):
+        results.extend(
+            filter(None, getattr(plugin, method_name)(*args, **kwargs))
+        )
+        complete = True
+
+    if cache is not None and complete:
+        cache.set(
+            plugin.data_source, method_name, key, results, _cache_ttl(plugin)
+        )
+    return results
+
+
+def _lookup_timeout(plugin: MetadataSourcePlugin) -> float | None:
+    """Return the `lookup_timeout` of a plugin in seconds, if any."""
+    try:
+        return plugin.config["lookup_timeout"].get(
+            confuse.Optional(confuse.Number())
+        )
+    except NotFoundError:
+        return None
+
+
+def _gather(
+    plugins: Sequence[MetadataSourcePlugin],
+    method_name: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Iterator[Any]:
+    """Call a method of all `plugins` at once and yield the results of
+    each one as soon as it finishes.
+
+    A source is given up on when it takes longer than its
+    `lookup_timeout`, or when the `lookup_deadline` for all sources has
+    passed.
+    """
+    start = time.monotonic()
+    overall = config["lookup_deadline"].get(confuse.Optional(confuse.Number()))
+
+    executor = ThreadPoolExecutor(len(plugins))
+    futures = {}
+    deadlines = {}
+    for plugin in plugins:
+        future = executor.submit(
+            _call_plugin, plugin, method_name, args, kwargs
+        )
+        futures[future] = plugin
+        limits = [t for t in (_lookup_timeout(plugin), overall) if t]
+        deadlines[future] = start + min(limits) if limits else None
+
+    try:
+        pending = set(futures)
+        while pending:
+            timeouts = [d for f in pending if (d := deadlines[f]) is not None]
+            timeout = None
+            if timeouts:
+                timeout = max(min(timeouts) - time.monotonic(), 0)
+            done, pending = wait(pending, timeout, FIRST_COMPLETED)
+
+            # Yield the sources that finished together in plugin order.
+            for future in futures:
+                if future in done:
+                    yield from future.result()
+
+            now = time.monotonic()
+            expired = [f for f in pending if (d := deadlines[f]) and d <= now]
+            for future in expired:
+                log.warning(
+                    "'{}.{}' timed out",
+                    futures[future].data_source,
+                    method_name,
+                )
+                pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _gather_from_plugins(
+    func: Callable[..., Iterable[Ret]],
+) -> Callable[..., Iterator[Ret]]:
+    """Yield the search results of all sources. When running threaded,
+    query them at once so that a search takes as long as the slowest
+    source rather than all of them together.
+    """
+    method_name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Iterator[Ret]:
+        plugins = find_metadata_source_plugins()
+        if config["threaded"] and len(plugins) > 1:
+            yield from _gather(plugins, method_name, args, kwargs)
+        else:
+            for plugin in plugins:
+                yield from _call_plugin(plugin, method_name, args, kwargs)
 
     return wrapper
 
 
 @notify_info_yielded("albuminfo_received")
-@_yield_from_plugins
+@_gather_from_plugins
 def candidates(*args, **kwargs) -> Iterator[AlbumInfo]:
     yield from ()
 
 
 @notify_info_yielded("trackinfo_received")
-@_yield_from_plugins
+@_gather_from_plugins
 def item_candidates(*args, **kwargs) -> Iterator[TrackInfo]:
     yield from ()
 
@@ -146,6 +553,8 @@ class MetadataSourcePlugin(BeetsPlugin, metaclass=abc.ABCMeta):
         self.config.add(
             {
                 "search_limit": 5,
+                "lookup_timeout": None,
+                "cache_ttl": None,
                 "data_source_mismatch_penalty": self.DEFAULT_DATA_SOURCE_MISMATCH_PENALTY,  # noqa: E501
             }
         )
@@ -535,6 +535,16 @@ def types(model_cls: type[AnyModel]) -> dict[str, Type]:
     return types
 
 
+def indexed_fields(model_cls: type[AnyModel]) -> set[str]:
+    """Return the names of the fields that plugins index for the given model."""
+    attr_name = f"{model_cls.__name__.lower()}_indexed_fields"
+    return {
+        field
+        for plugin in find_plugins()
+        for field in getattr(plugin, attr_name, ())
+    }
+
+
 def named_queries(model_cls: type[AnyModel]) -> dict[str, FieldQueryType]:
     """Return mapping between field names and queries for the given model."""
     attr_name = f"{model_cls.__name__.lower()}_queries"
@@ -673,7 +683,12 @@ def feat_tokens(
 
 
 def apply_item_changes(
-    lib: Library, item: Item, move: bool, pretend: bool, write: bool
+    lib: Library,
+    item: Item,
+    move: bool,
+    pretend: bool,
+    write: bool,
+    store: bool = True,
 ) -> None:
     """Store, move, and write the item according to the arguments.
 
@@ -683,6 +698,8 @@ def apply_item_changes(
     :param pretend: Return without moving, writing, or storing the item's
         metadata.
     :param write: Write the item's metadata to its media file.
+    :param store: Store the item's metadata. Pass `False` to store many
+        items at once with :meth:`Library.bulk_store` afterwards.
     """
     if pretend:
         return
@@ -691,9 +708,10 @@ def apply_item_changes(
 
     # Move the item if it's in the library.
     if move and lib.directory in util.ancestry(item.path):
-        item.move(with_album=False)
+        item.move(with_album=False, store=store)
 
     if write:
         item.try_write()
 
-    item.store()
+    if store:
+        item.store()
@@ -34,10 +34,11 @@ from typing import TYPE_CHECKING, Any, Literal
 
 import confuse
 
-from beets import config, library, logging, plugins, util
+import beets
+from beets import config, library, logging, metadata_plugins, plugins, util
 from beets.dbcore import db
 from beets.dbcore import query as db_query
-from beets.util import as_string
+from beets.util import as_string, functemplate
 from beets.util.deprecation import deprecate_for_maintainers
 from beets.util.functemplate import template
 
@@ -145,6 +146,25 @@ def print_(*strings: str, end: str = "\n") -> None:
         sys.stdout.write(txt)
 
 
+def print_progress(label: str, done: int, total: int) -> None:
+    """Show a progress bar for `done` out of `total` steps on a single
+    line of the terminal, updated every percent, if standard error is a
+    terminal.
+    """
+    if not total or not sys.stderr.isatty():
+        return
+    percent = done * 100 // total
+    if done < total and percent == (done - 1) * 100 // total:
+        return
+
+    width = 30
+    filled = width * done // total
+    bar = "#" * filled + " " * (width - filled)
+    end = "\n" if done >= total else ""
+    sys.stderr.write(f"\r{label} [{bar}] {percent}% ({done}/{total}){end}")
+    sys.stderr.flush()
+
+
 # Configuration wrappers.
 
 
@@ -1432,6 +1452,8 @@ def _setup(
     Returns a list of subcommands, a list of plugins, and a library instance.
     """
     config = _configure(options)
+    _load_template_cache(config)
+    _open_lookup_cache(config)
 
     plugins.load_plugins()
 
@@ -1485,6 +1507,63 @@ def _configure(options):
     return config
 
 
+def _load_template_cache(config):
+    """Set up the cache of compiled templates configured by the
+    `template_cache` option, so that the templates compiled by earlier
+    runs are not compiled again.
+    """
+    path = config["template_cache"].get(confuse.Optional(confuse.Filename()))
+    if not path:
+        functemplate.code_cache = None
+        return
+
+    tag = f"{beets.__version__} {sys.implementation.cache_tag}"
+    functemplate.code_cache = functemplate.CodeCache(path, tag)
+    functemplate.code_cache.load()
+
+
+def _save_template_cache():
+    """Write the templates compiled during this run to the cache file."""
+    if functemplate.code_cache is None:
+        return
+    try:
+        functemplate.code_cache.save()
+    except OSError as exc:
+        log.debug("could not save the template cache: {}", exc)
+
+
+def _open_lookup_cache(config):
+    """Set up the cache of metadata lookups if the `lookup_cache` option
+    names a file for it.
+    """
+    cache_config = config["lookup_cache"]
+    path = cache_config["path"].get(confuse.Optional(confuse.Filename()))
+    if not path:
+        metadata_plugins.lookup_cache = None
+        return
+
+    try:
+        metadata_plugins.lookup_cache = metadata_plugins.LookupCache(
+            path,
+            cache_config["ttl"].as_number(),
+            int(cache_config["max_size"].as_number() * 2**20),
+        )
+    except sqlite3.Error as exc:
+        log.warning("could not open the lookup cache: {}", exc)
+        metadata_plugins.lookup_cache = None
+
+
+def _close_lookup_cache():
+    """Evict old entries from the lookup cache and close it."""
+    if metadata_plugins.lookup_cache is None:
+        return
+    try:
+        metadata_plugins.lookup_cache.close()
+    except sqlite3.Error as exc:
+        log.debug("could not close the lookup cache: {}", exc)
+    metadata_plugins.lookup_cache = None
+
+
 def _ensure_db_directory_exists(path):
     if path == b":memory:":  # in memory db
         return
@@ -1608,10 +1687,15 @@ def _raw_main(args: list[str], lib=None) -> None:
     subcommands, lib = _setup(options, lib)
     parser.add_subcommand(*subcommands)
 
-    subcommand, suboptions, subargs = parser.parse_subcommand(subargs)
-    subcommand.func(lib, suboptions, subargs)
+    try:
+        subcommand, suboptions, subargs = parser.parse_subcommand(subargs)
+        subcommand.func(lib, suboptions, subargs)
+    finally:
+        # Keep the lookups made so far even if the command failed.
+        _close_lookup_cache()
 
     plugins.send("cli_exit", lib=lib)
+    _save_template_cache()
     if not test_lib:
         # Clean up the library unless it came from the test harness.
         lib._close()
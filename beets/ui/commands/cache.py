@@ -0,0 +1,38 @@
+"""The 'cache' command: inspect and clear the metadata lookup cache."""
+
+from beets import metadata_plugins, ui
+from beets.util.units import human_bytes
+
+
+def show_stats(cache):
+    """Show the number and size of the cached lookups of each metadata
+    source and how often the cache answered them.
+    """
+    for source, entries, size, hits, misses in cache.stats():
+        ui.print_(
+            f"{source}: {entries} entries ({human_bytes(size)}), "
+            f"{hits} hits, {misses} misses"
+        )
+
+
+def cache_func(lib, opts, args):
+    cache = metadata_plugins.lookup_cache
+    if cache is None:
+        raise ui.UserError(
+            "the lookup cache is disabled, set lookup_cache.path to enable it"
+        )
+
+    if args == ["stats"]:
+        show_stats(cache)
+    elif args[:1] == ["clear"]:
+        count = cache.clear(args[1:])
+        ui.print_(f"{count} cached lookups removed.")
+    else:
+        raise ui.UserError("unknown cache action, expected: stats or clear")
+
+
+cache_cmd = ui.Subcommand(
+    "cache", help="inspect or clear the metadata lookup cache"
+)
+cache_cmd.parser.usage = "%prog stats\n       %prog clear [SOURCE...]"
+cache_cmd.func = cache_func
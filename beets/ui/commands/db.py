@@ -0,0 +1,26 @@
+"""The 'db' command: inspect the library database."""
+
+from beets import ui
+
+
+def show_indexes(lib):
+    """Show the indices on the indexed fields of the library and whether
+    they are used to look up items and albums.
+    """
+    for status in lib.field_indices():
+        usage = "used for lookups" if status.used else "not used for lookups"
+        ui.print_(
+            f"{status.table}.{status.field}: {status.index} "
+            f"({status.rows} rows, {usage})"
+        )
+
+
+def db_func(lib, opts, args):
+    if args != ["indexes"]:
+        raise ui.UserError("unknown db action, expected: indexes")
+    show_indexes(lib)
+
+
+db_cmd = ui.Subcommand("db", help="inspect the library database")
+db_cmd.parser.usage = "%prog indexes"
+db_cmd.func = db_func
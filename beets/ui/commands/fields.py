@@ -24,7 +24,7 @@ def fields_func(lib, opts, args):
     ui.print_("Album fields:")
     _print_rows(library.Album.all_keys())
 
-    with lib.transaction() as tx:
+    with lib.transaction(read_only=True) as tx:
         # The SQL uses the DISTINCT to get unique values from the query
         unique_fields = "SELECT DISTINCT key FROM ({})"
 
@@ -11,7 +11,7 @@ def list_items(lib, query, album, fmt=""):
         for album in lib.albums(query):
             ui.print_(format(album, fmt))
     else:
-        for item in lib.items(query):
+        for item in lib.items(query, with_albums=True):
             ui.print_(format(item, fmt))
 
 
@@ -58,9 +58,19 @@ def modify_items(lib, mods, dels, query, write, move, album, confirm, inherit):
         )
 
     # Apply changes to database and files
-    with lib.transaction():
-        for obj in changed:
-            obj.try_sync(write, move, inherit)
+    if album or move:
+        with lib.transaction():
+            for obj in changed:
+                obj.try_sync(write, move, inherit)
+    else:
+        # Items that stay in place can be written in parallel and stored
+        # in one batch. The files are written before the transaction
+        # starts, so that the database stays available to "write" event
+        # listeners meanwhile.
+        if write:
+            list(library.Item.write_many(changed))
+        with lib.transaction():
+            lib.bulk_store(changed)
 
 
 def print_and_modify(obj, mods, dels):
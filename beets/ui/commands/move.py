@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import os
+from itertools import islice
+from multiprocessing.pool import AsyncResult, ThreadPool
 from typing import TYPE_CHECKING
 
-from beets import logging, ui
-from beets.util import MoveOperation, displayable_path, normpath, syspath
+from beets import logging, ui, util
+from beets.util import (
+    FilesystemError,
+    MoveOperation,
+    displayable_path,
+    normpath,
+    syspath,
+)
 
 from .utils import do_query
 
 if TYPE_CHECKING:
+    from beets.library import Album, Item
     from beets.util import PathLike
 
 # Global logger.
 log = logging.getLogger("beets")
 
+# The number of albums whose files are moved together before their
+# changes are stored.
+MOVE_WINDOW = 64
+# The number of singletons whose changes are stored together.
+SINGLETON_GROUP_SIZE = 100
+
 
 def show_path_changes(path_changes):
     """Given a list of tuples (source, destination) that indicate the
@@ -58,6 +73,138 @@ def show_path_changes(path_changes):
             ui.print_(f"{color_source} {' ' * pad} -> {color_dest}")
 
 
+def plan_moves(
+    lib, objs, album, dests
+) -> list[tuple[Album | None, list[tuple[Item, bytes]]]]:
+    """Plan moving the files of the items or albums `objs` to the
+    destinations in `dests`, a mapping from item ids.
+
+    Return a list of groups of moves, each an album (or None for
+    singletons) and a list of its items with their destinations. Items
+    that are in place are left out. Destinations that exist already or
+    that are the destination of another item are made unique.
+    """
+    taken: set[bytes] = set()
+    groups: dict[int | None, list[tuple[Item, bytes]]] = {}
+    albums = {}
+    for obj in objs:
+        for item in obj.items() if album else [obj]:
+            dest = dests[item.id]
+            if item.path == dest:
+                continue
+            if not util.samefile(item.path, dest):
+                dest = util.unique_path(dest, taken)
+            taken.add(dest)
+            groups.setdefault(item.album_id, []).append((item, dest))
+            if album:
+                albums[item.album_id] = obj
+
+    plan = []
+    for album_id, moves in groups.items():
+        if album_id is None:
+            # Singletons are stored in groups of their own.
+            moves_iter = iter(moves)
+            while group := list(islice(moves_iter, SINGLETON_GROUP_SIZE)):
+                plan.append((None, group))
+        else:
+            plan.append(
+                (albums.get(album_id) or lib.get_album(album_id), moves)
+            )
+    return plan
+
+
+def _same_device(path: bytes, dest: bytes) -> bool:
+    """Whether the file at `path` can be renamed to `dest`, i.e. whether
+    the (existing) directory of `dest` is on the same device.
+    """
+    try:
+        dest_dir = os.path.dirname(dest)
+        return (
+            os.stat(syspath(path)).st_dev == os.stat(syspath(dest_dir)).st_dev
+        )
+    except OSError:
+        return False
+
+
+def _move_file(item, dest, operation) -> Exception | None:
+    """Move or copy the file of an item, returning the error raised."""
+    try:
+        item._move_file(dest, operation)
+    except (FilesystemError, OSError) as exc:
+        return exc
+    return None
+
+
+def move_files(lib, plan, operation, store=True, jobs=None) -> list[Item]:
+    """Move or copy the files of the items in the `plan` made by
+    `plan_moves`, together with the art of their albums.
+
+    Files that can be renamed are moved right away, while copies,
+    including moves to other devices, are made by `jobs` threads (by
+    default, one per CPU). Only the file operations run in the threads:
+    the plugin events are sent, and the items updated, in this thread and
+    in the order of the plan. The changes to each album and its items are
+    stored in one transaction once its files are in place, unless `store`
+    is false. Return the items that could not be moved.
+    """
+    failed = []
+    with ThreadPool(jobs) as pool:
+        for start in range(0, len(plan), MOVE_WINDOW):
+            window = plan[start : start + MOVE_WINDOW]
+
+            # Start moving the files of all the albums in the window.
+            outcomes = []
+            for _, moves in window:
+                album_outcomes = []
+                for item, dest in moves:
+                    util.mkdirall(dest)
+                    dest = item._before_move(dest, operation)
+                    args = (item, dest, operation)
+                    if operation == MoveOperation.MOVE and _same_device(
+                        item.path, dest
+                    ):
+                        album_outcomes.append((dest, _move_file(*args)))
+                    else:
+                        album_outcomes.append(
+                            (dest, pool.apply_async(_move_file, args))
+                        )
+                outcomes.append(album_outcomes)
+
+            # Store the changes of each album as its files are moved.
+            for (album, moves), album_outcomes in zip(window, outcomes):
+                moved = []
+                for (item, _), (dest, outcome) in zip(moves, album_outcomes):
+                    if isinstance(outcome, AsyncResult):
+                        outcome = outcome.get()
+                    if outcome:
+                        log.error("{}", outcome)
+                        failed.append(item)
+                    else:
+                        old_path = item.path
+                        item._after_move(dest, operation)
+                        log.debug("moved: {.filepath}", item)
+                        moved.append((item, old_path))
+
+                with lib.transaction():
+                    if store:
+                        for item, _ in moved:
+                            item.store()
+                    # The art follows the stored items.
+                    if album:
+                        album.move_art(operation)
+                        if store:
+                            album.store()
+
+                # Prune vacated directories.
+                if operation == MoveOperation.MOVE:
+                    for _, old_path in moved:
+                        util.prune_dirs(
+                            os.path.dirname(old_path), lib.directory
+                        )
+
+    return failed
+
+
 def move_items(
     lib,
     dest_path: PathLike,
@@ -67,24 +214,39 @@ def move_items(
     pretend,
     confirm=False,
     export=False,
+    jobs=None,
 ):
     """Moves or copies items to a new base directory, given by dest. If
     dest is None, then the library's base directory is used, making the
     command "consolidate" files.
+
+    `jobs` is the number of threads copying files (including moves to
+    another device).
     """
     dest = os.fsencode(dest_path) if dest_path else dest_path
     items, albums = do_query(lib, query, album, False)
     objs = albums if album else items
     num_objs = len(objs)
 
-    # Filter out files that don't need to be moved.
-    def isitemmoved(item):
-        return item.path != item.destination(basedir=dest)
+    # Compute the destinations of all the items at once.
+    if album:
+        items = [item for obj in objs for item in obj.items()]
+    dests = dict(
+        zip(
+            (item.id for item in items),
+            lib.destinations(items, basedir=dest),
+        )
+    )
 
-    def isalbummoved(album):
-        return any(isitemmoved(i) for i in album.items())
+    def path_changes(obj):
+        """List the current and new paths of an item or album's files."""
+        return [
+            (item.path, dests[item.id])
+            for item in (obj.items() if album else [obj])
+        ]
 
-    objs = [o for o in objs if (isalbummoved if album else isitemmoved)(o)]
+    # Filter out files that don't need to be moved.
+    objs = [o for o in objs if any(old != new for old, new in path_changes(o))]
     num_unmoved = num_objs - len(objs)
     # Report unmoved files that match the query.
     unmoved_msg = ""
@@ -107,42 +269,32 @@ def move_items(
         return
 
     if pretend:
-        if album:
-            show_path_changes(
-                [
-                    (item.path, item.destination(basedir=dest))
-                    for obj in objs
-                    for item in obj.items()
-                ]
-            )
-        else:
-            show_path_changes(
-                [(obj.path, obj.destination(basedir=dest)) for obj in objs]
-            )
+        show_path_changes(
+            [change for obj in objs for change in path_changes(obj)]
+        )
     else:
         if confirm:
             objs = ui.input_select_objects(
                 f"Really {act}",
                 objs,
-                lambda o: show_path_changes(
-                    [(o.path, o.destination(basedir=dest))]
-                ),
+                lambda o: show_path_changes(path_changes(o)),
             )
 
-        for obj in objs:
-            log.debug("moving: {.filepath}", obj)
-
-            if export:
-                # Copy without affecting the database.
-                obj.move(
-                    operation=MoveOperation.COPY, basedir=dest, store=False
-                )
-            else:
-                # Ordinary move/copy: store the new path.
-                if copy:
-                    obj.move(operation=MoveOperation.COPY, basedir=dest)
-                else:
-                    obj.move(operation=MoveOperation.MOVE, basedir=dest)
+        # Exporting copies without affecting the database. The
+        # directories that files are moved to and from are looked up once.
+        with util.stat_cache():
+            failed = move_files(
+                lib,
+                plan_moves(lib, objs, album, dests),
+                MoveOperation.COPY if copy else MoveOperation.MOVE,
+                store=not export,
+                jobs=jobs,
+            )
+        if failed:
+            raise ui.UserError(
+                f"{len(failed)} file{'s' if len(failed) != 1 else ''} could "
+                f"not be {'copied' if copy else 'moved'}."
+            )
 
 
 def move_func(lib, opts, args):
@@ -161,6 +313,7 @@ def move_func(lib, opts, args):
         opts.pretend,
         opts.timid,
         opts.export,
+        opts.jobs,
     )
 
 
@@ -196,5 +349,11 @@ move_cmd.parser.add_option(
     action="store_true",
     help="copy without changing the database path",
 )
+move_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    help="number of threads copying files (default: number of CPUs)",
+)
 move_cmd.parser.add_album_option()
 move_cmd.func = move_func
@@ -3,7 +3,7 @@
 import os
 
 from beets import logging, ui
-from beets.util import syspath
+from beets.util import displayable_path, syspath
 from beets.util.units import human_bytes, human_seconds
 
 # Global logger.
@@ -12,7 +12,10 @@ log = logging.getLogger("beets")
 
 def show_stats(lib, query, exact):
     """Shows some statistics about the matched items."""
-    items = lib.items(query)
+    items = lib.item_values(
+        ("path", "length", "bitrate", "artist", "albumartist", "album_id"),
+        query,
+    )
 
     total_size = 0
     total_time = 0.0
@@ -21,20 +24,22 @@ def show_stats(lib, query, exact):
     albums = set()
     album_artists = set()
 
-    for item in items:
+    for path, length, bitrate, artist, albumartist, album_id in items:
         if exact:
             try:
-                total_size += os.path.getsize(syspath(item.path))
+                total_size += os.path.getsize(syspath(path))
             except OSError as exc:
-                log.info("could not get size of {.path}: {}", item, exc)
+                log.info(
+                    "could not get size of {}: {}", displayable_path(path), exc
+                )
         else:
-            total_size += int(item.length * item.bitrate / 8)
-        total_time += item.length
+            total_size += int(length * bitrate / 8)
+        total_time += length
         total_items += 1
-        artists.add(item.artist)
-        album_artists.add(item.albumartist)
-        if item.album_id:
-            albums.add(item.album_id)
+        artists.add(artist)
+        album_artists.add(albumartist)
+        if album_id:
+            albums.add(album_id)
 
     size_str = human_bytes(total_size)
     if exact:
@@ -1,26 +1,252 @@
 """The `update` command: Update library contents according to on-disk tags."""
 
+from __future__ import annotations
+
 import os
+from collections import Counter
+from itertools import islice
+from multiprocessing.pool import ThreadPool
+from typing import NamedTuple
 
 from beets import library, logging, ui
-from beets.util import ancestry, syspath
+from beets.dbcore.query import (
+    InvalidQueryArgumentValueError,
+    MatchQuery,
+    Period,
+)
+from beets.util import ancestry, bytestring_path, displayable_path, syspath
 
 from .utils import do_query
 
 # Global logger.
 log = logging.getLogger("beets")
 
+# The number of items whose files are checked together.
+CHECK_BATCH_SIZE = 500
+
+DELETED = "deleted"
+UNCHANGED = "unchanged"
+READ = "read"
+
+
+class FileStat(NamedTuple):
+    """The state of an item's file when `update` last checked it."""
+
+    path: bytes
+    size: int
+    mtime_ns: int
+    inode: int
+    device: int
+
+    @classmethod
+    def from_stat(cls, path: bytes, stat: os.stat_result) -> FileStat:
+        return cls(
+            path, stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_dev
+        )
+
+    def same_file(self, stat: os.stat_result) -> bool:
+        """Whether `stat` is about this file, possibly under another
+        path, and it has the same size.
+        """
+        return (self.inode, self.device, self.size) == (
+            stat.st_ino,
+            stat.st_dev,
+            stat.st_size,
+        )
+
+
+class FileIndex:
+    """The size, modification time and inode of the items' files, as
+    `update` last saw them, stored in a table of the library.
+    """
+
+    table = "item_files"
+
+    def __init__(self, lib: library.Library):
+        self.lib = lib
+        with lib.transaction() as tx:
+            tx.script(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    item_id INTEGER PRIMARY KEY,
+                    path BLOB,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    inode INTEGER,
+                    device INTEGER);
+                """)
+
+    def get_many(self, ids: list[int]) -> dict[int, FileStat]:
+        """Get the stored state of the files of the items with `ids`."""
+        with self.lib.transaction() as tx:
+            rows = tx.query(
+                f"SELECT * FROM {self.table} "
+                f"WHERE item_id IN ({', '.join('?' * len(ids))})",
+                ids,
+            )
+        return {row[0]: FileStat(*row[1:]) for row in rows}
+
+    def set_many(self, stats: dict[int, FileStat]):
+        """Store the state of the files of the items with the given IDs."""
+        if stats:
+            with self.lib.transaction() as tx:
+                tx.mutate_many(
+                    f"INSERT OR REPLACE INTO {self.table} "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(item_id, *stat) for item_id, stat in stats.items()],
+                )
+
+    def prune(self):
+        """Drop the entries of removed items."""
+        with self.lib.transaction() as tx:
+            tx.mutate(
+                f"DELETE FROM {self.table} "
+                "WHERE item_id NOT IN (SELECT id FROM items)"
+            )
+
+
+def _check_item(item, indexed=None, since=None):
+    """Check the file of an item, reading its tags again if it was
+    modified after they were last read and, if given, after the `since`
+    timestamp. The file counts as modified if it differs in size or
+    modification time from its `indexed` state or, if it was not indexed
+    under its current path, if it is newer than the item. Only the file
+    is accessed, so that many items can be checked in parallel.
+
+    Return `DELETED` if the file is missing, `UNCHANGED` if it was not
+    modified, `READ` if its tags were read, or the `ReadError` that
+    reading them raised, together with the current state of the file to
+    store in the index, or None if it should not be.
+    """
+    try:
+        stat = os.stat(syspath(item.path)) if item.path else None
+    except OSError:
+        stat = None
+    if not stat:
+        return DELETED, None
+
+    current = FileStat.from_stat(item.path, stat)
+    if indexed is not None and indexed.path == item.path:
+        modified = (indexed.size, indexed.mtime_ns) != (
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+    else:
+        modified = int(stat.st_mtime) > item.mtime
+    if not modified:
+        return UNCHANGED, current
+    if since is not None and stat.st_mtime < since:
+        # Check the file again next time.
+        return UNCHANGED, None
+
+    try:
+        item.read()
+    except library.ReadError as exc:
+        return exc, None
+    return READ, current
+
 
-def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
+def _check_items(items, index, jobs=None, since=None):
+    """Check the files of the `items` with `jobs` threads, and generate
+    each item together with the result of `_check_item`, in order.
+    """
+    items = iter(items)
+    with ThreadPool(jobs) as pool:
+        while batch := list(islice(items, CHECK_BATCH_SIZE)):
+            indexed = index.get_many([item.id for item in batch])
+            results = pool.starmap(
+                _check_item,
+                [(item, indexed.get(item.id), since) for item in batch],
+            )
+            for item, (result, stat) in zip(batch, results):
+                yield item, result, stat, indexed.get(item.id)
+
+
+def _scan_inodes(directory: bytes, recursive: bool):
+    """Generate the paths of the files in `directory` and, with
+    `recursive`, in its subdirectories, together with their inode
+    numbers. These come with the directory listing on most systems, so
+    the files are not looked up one by one.
+    """
+    try:
+        entries = list(os.scandir(syspath(directory)))
+    except OSError:
+        return
+    for entry in entries:
+        path = os.path.join(directory, bytestring_path(entry.name))
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from _scan_inodes(path, recursive)
+            elif entry.is_file():
+                yield path, entry.inode()
+        except OSError:
+            continue
+
+
+def find_renamed(lib, missing):
+    """Look for the files of the `missing` items, which are given with
+    the indexed state of their file, under new paths.
+
+    The files are identified by their inode, device and size. They are
+    looked for in the library directory and in the directories the
+    missing files were in. Return a dictionary from the IDs of the found
+    items to their new paths.
+    """
+    wanted = {stat.inode: (item, stat) for item, stat in missing}
+    directories = {lib.directory: True}
+    for _, stat in missing:
+        directories.setdefault(os.path.dirname(stat.path), False)
+
+    found = {}
+    for directory, recursive in directories.items():
+        for path, inode in _scan_inodes(directory, recursive):
+            if inode not in wanted:
+                continue
+            item, indexed = wanted[inode]
+            try:
+                stat = os.stat(syspath(path))
+            except OSError:
+                continue
+            # Files that are in the library already are not moved ones.
+            if indexed.same_file(stat) and not lib.items(
+                MatchQuery("path", path)
+            ):
+                found[item.id] = path
+                del wanted[inode]
+                if not wanted:
+                    return found
+    return found
+
+
+def update_items(
+    lib,
+    query,
+    album,
+    move,
+    pretend,
+    fields,
+    exclude_fields=None,
+    jobs=None,
+    since=None,
+):
     """For all the items matched by the query, update the library to
     reflect the item's embedded tags.
     :param fields: The fields to be stored. If not specified, all fields will
     be.
     :param exclude_fields: The fields to not be stored. If not specified, all
     fields will be.
+    :param jobs: The number of threads checking and reading the files.
+    Defaults to the number of CPUs.
+    :param since: A timestamp. If given, files modified before it are not
+    read.
+    :return: A `Counter` of the items that were ``updated``, ``moved``,
+    ``removed``, ``unchanged`` or ``failed`` to be read. Moved items are
+    also counted as updated if their tags changed.
     """
+    summary = Counter(updated=0, moved=0, removed=0, unchanged=0, failed=0)
+    index = FileIndex(lib)
     with lib.transaction():
-        items, _ = do_query(lib, query, album)
+        items, _ = do_query(lib, query, album, stream=True)
         if move and fields is not None and "path" not in fields:
             # Special case: if an item needs to be moved, the path field has to
             # updated; otherwise the new path will not be reflected in the
@@ -44,30 +270,31 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
 
         # Walk through the items and pick up their changes.
         affected_albums = set()
-        for item in items:
-            # Item deleted?
-            if not item.path or not os.path.exists(syspath(item.path)):
-                ui.print_(format(item))
-                ui.print_(ui.colorize("text_error", "  deleted"))
-                if not pretend:
-                    item.remove(True)
-                affected_albums.add(item.album_id)
-                continue
 
+        def remove_item(item):
+            ui.print_(format(item))
+            ui.print_(ui.colorize("text_error", "  deleted"))
+            if not pretend:
+                item.remove(True)
+            affected_albums.add(item.album_id)
+            summary["removed"] += 1
+
+        def apply_result(item, result, count=True):
             # Did the item change since last checked?
-            if item.current_mtime() <= item.mtime:
+            if result == UNCHANGED:
                 log.debug(
                     "skipping {0.filepath} because mtime is up to date ({0.mtime})",
                     item,
                 )
-                continue
+                if count:
+                    summary["unchanged"] += 1
+                return
 
-            # Read new data.
-            try:
-                item.read()
-            except library.ReadError as exc:
-                log.error("error reading {.filepath}: {}", item, exc)
-                continue
+            # Could the new data be read?
+            if isinstance(result, library.ReadError):
+                log.error("error reading {.filepath}: {}", item, result)
+                summary["failed"] += 1
+                return
 
             # Special-case album artist when it matches track artist. (Hacky
             # but necessary for preserving album-level metadata for non-
@@ -80,6 +307,8 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
 
             # Check for and display changes.
             changed = ui.show_model_changes(item, fields=item_fields)
+            if changed or count:
+                summary["updated" if changed else "unchanged"] += 1
 
             # Save changes.
             if not pretend:
@@ -97,9 +326,63 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
                     # check this again in the future.
                     item.store(fields=item_fields)
 
+        # The files are checked, and the tags of the modified ones read,
+        # in parallel. The library is only updated here. The state of the
+        # checked files is stored in the index, which tells next time
+        # whether they were modified or renamed.
+        checked = {}
+        missing = []
+        for item, result, stat, indexed in _check_items(
+            items, index, jobs, since
+        ):
+            if result == DELETED:
+                # The file may have been renamed, which is found out once
+                # all the missing files are known.
+                if indexed is not None and indexed.path == item.path:
+                    missing.append((item, indexed))
+                else:
+                    remove_item(item)
+                continue
+
+            if stat and stat != indexed:
+                checked[item.id] = stat
+            apply_result(item, result)
+            if not pretend and len(checked) >= CHECK_BATCH_SIZE:
+                index.set_many(checked)
+                checked = {}
+
+        # Follow the files that were renamed and remove the items whose
+        # files are gone.
+        renamed = find_renamed(lib, missing) if missing else {}
+        for item, _ in missing:
+            if item.id not in renamed:
+                remove_item(item)
+                continue
+
+            item.path = renamed[item.id]
+            ui.print_(format(item))
+            ui.print_(
+                ui.colorize(
+                    "text_highlight_minor",
+                    f"  moved to {displayable_path(item.path)}",
+                )
+            )
+            summary["moved"] += 1
+            if not pretend:
+                item.store(fields=["path"])
+
+            result, stat = _check_item(item, since=since)
+            if stat:
+                checked[item.id] = stat
+            apply_result(item, result, count=False)
+
+        if not pretend:
+            index.set_many(checked)
+            index.prune()
+
         # Skip album changes while pretending.
         if pretend:
-            return
+            return summary
 
         # Modify affected albums to reflect changes in their items.
         for album_id in affected_albums:
@@ -128,6 +411,8 @@ def update_items(lib, query, album, move, pretend, fields, exclude_fields=None):
                 album.move(store=False)
                 album.store(fields=album_fields)
 
+    return summary
+
 
 def update_func(lib, opts, args):
     # Verify that the library folder exists to prevent accidental wipes.
@@ -136,7 +421,12 @@ def update_func(lib, opts, args):
         ui.print_(lib.directory)
         if not ui.input_yn("Are you sure you want to continue (y/n)?", True):
             return
-    update_items(
+    try:
+        since = Period.parse(opts.since) if opts.since else None
+    except InvalidQueryArgumentValueError as exc:
+        raise ui.UserError(f"invalid --since date: {exc}")
+
+    summary = update_items(
         lib,
         args,
         opts.album,
@@ -144,6 +434,12 @@ def update_func(lib, opts, args):
         opts.pretend,
         opts.fields,
         opts.exclude_fields,
+        jobs=opts.jobs,
+        since=since.date.timestamp() if since else None,
+    )
+    ui.print_(
+        "{updated} updated, {moved} moved, {removed} removed, "
+        "{unchanged} unchanged, {failed} failed".format(**summary)
     )
 
 
@@ -193,4 +489,14 @@ update_cmd.parser.add_option(
     dest="exclude_fields",
     help="list of fields to exclude from updates",
 )
+update_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    help="number of threads checking the files (default: number of CPUs)",
+)
+update_cmd.parser.add_option(
+    "--since",
+    help="only read files modified after this date, e.g. 2025-01-31 or -1w",
+)
 update_cmd.func = update_func
@@ -3,12 +3,15 @@
 from beets import ui
 
 
-def do_query(lib, query, album, also_items=True):
+def do_query(lib, query, album, also_items=True, stream=False):
     """For commands that operate on matched items, performs a query
     and returns a list of matching items and a list of matching
     albums. (The latter is only nonempty when album is True.) Raises
     a UserError if no items match. also_items controls whether, when
     fetching albums, the associated items should be fetched also.
+
+    With `stream`, matching single items are returned as a result set
+    that loads them in batches while iterating, rather than as a list.
     """
     if album:
         albums = list(lib.albums(query))
@@ -19,7 +22,9 @@ def do_query(lib, query, album, also_items=True):
 
     else:
         albums = []
-        items = list(lib.items(query))
+        items = lib.items(query, stream=stream)
+        if not stream:
+            items = list(items)
 
     if album and not albums:
         raise ui.UserError("No matching albums found.")
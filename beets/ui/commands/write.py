@@ -1,6 +1,8 @@
 """The `write` command: write tag information to files."""
 
 import os
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 
 from beets import library, logging, ui
 from beets.util import syspath
@@ -10,38 +12,84 @@ from .utils import do_query
 # Global logger.
 log = logging.getLogger("beets")
 
+# The number of items whose files are read together.
+READ_BATCH_SIZE = 500
 
-def write_items(lib, query, pretend, force):
+
+def _read_clean_item(item):
+    """Get an Item object reflecting the "clean" (on-disk) state of the
+    item, None if its file is missing, or the `ReadError` raised when
+    reading it.
+    """
+    if not os.path.exists(syspath(item.path)):
+        return None
+    try:
+        return library.Item.from_path(item.path)
+    except library.ReadError as exc:
+        return exc
+
+
+def write_items(lib, query, pretend, force, jobs=None):
     """Write tag information from the database to the respective files
     in the filesystem.
+
+    The files are read and written by `jobs` threads (by default, one
+    per CPU), while the database is updated in order from this one.
+    Return the items that could not be written with their errors.
     """
-    items, _ = do_query(lib, query, False, False)
-
-    for item in items:
-        # Item deleted?
-        if not os.path.exists(syspath(item.path)):
-            log.info("missing file: {.filepath}", item)
-            continue
-
-        # Get an Item object reflecting the "clean" (on-disk) state.
-        try:
-            clean_item = library.Item.from_path(item.path)
-        except library.ReadError as exc:
-            log.error("error reading {.filepath}: {}", item, exc)
-            continue
-
-        # Check for and display changes.
-        changed = ui.show_model_changes(
-            item, clean_item, library.Item._media_tag_fields, force
-        )
-        if (changed or force) and not pretend:
-            # We use `try_sync` here to keep the mtime up to date in the
-            # database.
-            item.try_sync(True, False)
+    items, _ = do_query(lib, query, False, False, stream=True)
+    total = len(items)
+    items = iter(items)
+
+    failed = []
+    done = 0
+    with ThreadPool(jobs) as pool:
+        while batch := list(islice(items, READ_BATCH_SIZE)):
+            # Find the items whose files are outdated.
+            changed = []
+            for item, clean_item in zip(
+                batch, pool.imap(_read_clean_item, batch)
+            ):
+                # Item deleted?
+                if clean_item is None:
+                    log.info("missing file: {.filepath}", item)
+                    continue
+                if isinstance(clean_item, library.ReadError):
+                    log.error("error reading {.filepath}: {}", item, clean_item)
+                    failed.append((item, clean_item))
+                    continue
+
+                # Check for and display changes.
+                if (
+                    ui.show_model_changes(
+                        item, clean_item, library.Item._media_tag_fields, force
+                    )
+                    or force
+                ):
+                    changed.append(item)
+
+            done += len(batch) - len(changed)
+            if pretend:
+                done += len(changed)
+                changed = []
+            for item, error in library.Item.write_many(changed, pool=pool):
+                if error:
+                    failed.append((item, error))
+                else:
+                    # Keep the mtime up to date in the database.
+                    item.store()
+                done += 1
+                ui.print_progress("Writing", done, total)
+            if not changed:
+                ui.print_progress("Writing", done, total)
+
+    return failed
 
 
 def write_func(lib, opts, args):
-    write_items(lib, args, opts.pretend, opts.force)
+    failed = write_items(lib, args, opts.pretend, opts.force, opts.jobs)
+    if failed:
+        ui.print_(f"{len(failed)} files could not be written.")
 
 
 write_cmd = ui.Subcommand("write", help="write tag information to files")
@@ -57,4 +105,10 @@ write_cmd.parser.add_option(
     action="store_true",
     help="write tags even if the existing tags match the database",
 )
+write_cmd.parser.add_option(
+    "-j",
+    "--jobs",
+    type="int",
+    help="number of threads writing the files (default: number of CPUs)",
+)
 write_cmd.func = write_func
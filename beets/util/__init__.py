@@ -23,13 +23,15 @@ import platform
 import re
 import shlex
 import shutil
+import stat
 import subprocess
 import sys
 import tempfile
+import threading
 import traceback
 from collections import Counter
 from collections.abc import Sequence
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from enum import Enum
 from functools import cache
 from importlib import import_module
@@ -53,7 +55,7 @@ import beets
 from beets.util import hidden
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import Callable, Container, Iterable, Iterator
     from logging import Logger
 
     from beets.library import Item
@@ -210,11 +212,16 @@ def sorted_walk(
     ignore: Sequence[PathLike] = (),
     ignore_hidden: bool = False,
     logger: Logger | None = None,
+    jobs: int = 1,
 ) -> Iterator[tuple[bytes, Sequence[bytes], Sequence[bytes]]]:
     """Like `os.walk`, but yields things in case-insensitive sorted,
     breadth-first order.  Directory and file names matching any glob
     pattern in `ignore` are skipped. If `logger` is provided, then
     warning messages are logged there when a directory cannot be listed.
+
+    With more than one job, the subdirectories of each directory are
+    listed ahead in a pool of threads. The order of the results stays
+    the same.
     """
     # Make sure the paths aren't Unicode strings.
     bytes_path = bytestring_path(path)
@@ -222,25 +229,43 @@ def sorted_walk(
         bytestring_path(i) for i in ignore
     ]
 
-    # Get all the directories and files at this level.
+    def list_dir(path: bytes) -> tuple[list[bytes], list[bytes]] | None:
+        return _list_dir(path, ignore_bytes, ignore_hidden, logger)
+
+    if jobs > 1:
+        with ThreadPool(jobs) as pool:
+            yield from _walk(bytes_path, list_dir(bytes_path), list_dir, pool)
+    else:
+        yield from _walk(bytes_path, list_dir(bytes_path), list_dir)
+
+
+def _list_dir(
+    path: bytes,
+    ignore: Sequence[bytes],
+    ignore_hidden: bool,
+    logger: Logger | None,
+) -> tuple[list[bytes], list[bytes]] | None:
+    """Return the sorted directories and files in `path` for
+    `sorted_walk`, or None if the directory cannot be listed.
+    """
     try:
-        contents = os.listdir(syspath(bytes_path))
+        entries = list(os.scandir(syspath(path)))
     except OSError:
         if logger:
             logger.warning(
                 "could not list directory {}",
-                displayable_path(bytes_path),
+                displayable_path(path),
                 exc_info=True,
             )
-        return
+        return None
     dirs = []
     files = []
-    for str_base in contents:
-        base = bytestring_path(str_base)
+    for entry in entries:
+        base = bytestring_path(entry.name)
 
         # Skip ignored filenames.
         skip = False
-        for pat in ignore_bytes:
+        for pat in ignore:
             if fnmatch.fnmatch(base, pat):
                 if logger:
                     logger.debug(
@@ -252,22 +277,48 @@ def sorted_walk(
             continue
 
         # Add to output as either a file or a directory.
-        cur = os.path.join(bytes_path, base)
+        cur = os.path.join(path, base)
         if (ignore_hidden and not hidden.is_hidden(cur)) or not ignore_hidden:
-            if os.path.isdir(syspath(cur)):
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
                 dirs.append(base)
             else:
                 files.append(base)
 
-    # Sort lists (case-insensitive) and yield the current level.
+    # Sort lists (case-insensitive).
     dirs.sort(key=bytes.lower)
     files.sort(key=bytes.lower)
-    yield (bytes_path, dirs, files)
+    return dirs, files
 
-    # Recurse into directories.
-    for base in dirs:
-        cur = os.path.join(bytes_path, base)
-        yield from sorted_walk(cur, ignore_bytes, ignore_hidden, logger)
+
+def _walk(
+    path: bytes,
+    listing: tuple[list[bytes], list[bytes]] | None,
+    list_dir: Callable[[bytes], tuple[list[bytes], list[bytes]] | None],
+    pool: ThreadPool | None = None,
+) -> Iterator[tuple[bytes, Sequence[bytes], Sequence[bytes]]]:
+    """Yield the listing of `path` and then recurse into its
+    directories for `sorted_walk`.
+    """
+    if listing is None:
+        return
+    dirs, files = listing
+    yield (path, dirs, files)
+
+    # Recurse into directories, listing them ahead when there is a pool.
+    subpaths = [os.path.join(path, base) for base in dirs]
+    if pool:
+        results = [pool.apply_async(list_dir, (cur,)) for cur in subpaths]
+        listings: Iterable[tuple[list[bytes], list[bytes]] | None] = (
+            result.get() for result in results
+        )
+    else:
+        listings = map(list_dir, subpaths)
+    for cur, sublisting in zip(subpaths, listings):
+        yield from _walk(cur, sublisting, list_dir, pool)
 
 
 def path_as_posix(path: bytes) -> bytes:
@@ -277,18 +328,152 @@ def path_as_posix(path: bytes) -> bytes:
     return path.replace(b"\\", b"/")
 
 
+class StatCache:
+    """The metadata of files and directories looked up while
+    `stat_cache()` is active.
+
+    Files are moved from several threads at once, so the cache is only
+    accessed through its methods, which hold a lock.
+    """
+
+    def __init__(self):
+        # The status of each path, or None if it does not exist.
+        self.stats: dict[bytes, os.stat_result | None] = {}
+        # The case sensitivity of the filesystem of each directory's
+        # entries.
+        self.case_sensitive: dict[bytes, bool] = {}
+        # Incremented whenever entries are dropped, so that a lookup that
+        # started before a change is not stored after it.
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def get(self, mapping: dict[bytes, T], path: bytes) -> tuple[bool, T]:
+        """Get the cached value for `path` from one of the mappings,
+        along with whether there is one.
+        """
+        with self.lock:
+            if path in mapping:
+                return True, mapping[path]
+            return False, None  # type: ignore[return-value]
+
+    def set(
+        self, mapping: dict[bytes, T], path: bytes, value: T, generation: int
+    ):
+        """Cache a value for `path` that was looked up when the cache was
+        at `generation`.
+        """
+        with self.lock:
+            if generation == self.generation:
+                mapping[path] = value
+
+    def forget(self, paths: Iterable[bytes], tree: bool = False):
+        """Drop the entries of `paths` and, with `tree`, of everything
+        inside them.
+        """
+        with self.lock:
+            self.generation += 1
+            for path in paths:
+                self.stats.pop(path, None)
+                self.case_sensitive.pop(path, None)
+                if tree:
+                    prefix = os.path.join(path, b"")
+                    for mapping in (self.stats, self.case_sensitive):
+                        for key in [k for k in mapping if k.startswith(prefix)]:
+                            del mapping[key]
+
+
+_stat_cache: StatCache | None = None
+
+
+@contextmanager
+def stat_cache() -> Iterator[None]:
+    """Cache whether files and directories exist, which file they are,
+    and the case sensitivity of the filesystems they are on, while the
+    context is active. This avoids looking up the same directories again
+    and again when many files are moved, which is slow on network
+    filesystems.
+
+    beets' own file operations in this module keep the cache up to date,
+    but changes made by other programs meanwhile may go unnoticed. Checks
+    that protect files from being overwritten, and the directories that
+    `mkdirall()` creates, are never cached.
+    """
+    global _stat_cache
+    if _stat_cache is not None:  # Already active.
+        yield
+        return
+
+    _stat_cache = StatCache()
+    try:
+        yield
+    finally:
+        _stat_cache = None
+
+
+def _stat(path: bytes) -> os.stat_result | None:
+    """Get the status of a file, following symlinks, or None if it does
+    not exist or cannot be accessed. The result is cached while
+    `stat_cache()` is active.
+    """
+    cache = _stat_cache
+    if cache is not None:
+        generation = cache.generation
+        found, result = cache.get(cache.stats, path)
+        if found:
+            return result
+
+    try:
+        result = os.stat(syspath(path))
+    except (OSError, ValueError):
+        result = None
+    if cache is not None:
+        cache.set(cache.stats, path, result, generation)
+    return result
+
+
+def _forget(*paths: bytes, tree: bool = False):
+    """Drop the cached metadata of `paths`, which beets has changed. With
+    `tree`, the metadata of everything inside them is dropped as well.
+    """
+    if (cache := _stat_cache) is not None:
+        cache.forget(paths, tree)
+
+
 def mkdirall(path: bytes):
     """Make all the enclosing directories of path (like mkdir -p on the
     parent).
     """
-    for ancestor in ancestry(path):
-        if not os.path.isdir(syspath(ancestor)):
-            try:
-                os.mkdir(syspath(ancestor))
-            except OSError as exc:
+    # Look for the closest ancestor that exists, so that only the
+    # missing directories are created. The file system is asked
+    # directly, since other programs may have removed directories that
+    # beets looked up earlier.
+    ancestors = ancestry(path)
+    missing = []
+    while ancestors:
+        try:
+            status = os.stat(syspath(ancestors[-1]))
+        except (OSError, ValueError):
+            missing.append(ancestors.pop())
+        else:
+            if not stat.S_ISDIR(status.st_mode):
+                missing.append(ancestors[-1])
+            break
+
+    for ancestor in reversed(missing):
+        try:
+            os.mkdir(syspath(ancestor))
+        except FileExistsError as exc:
+            # Another thread may have created the directory meanwhile.
+            if not os.path.isdir(syspath(ancestor)):
                 raise FilesystemError(
                     exc, "create", (ancestor,), traceback.format_exc()
                 )
+        except OSError as exc:
+            raise FilesystemError(
+                exc, "create", (ancestor,), traceback.format_exc()
+            )
+        finally:
+            _forget(ancestor)
 
 
 def fnmatch_all(names: Sequence[bytes], patterns: Sequence[bytes]) -> bool:
@@ -339,14 +524,17 @@ def prune_dirs(
     ancestors.reverse()
     for directory in ancestors:
         str_directory = syspath(directory)
-        if not os.path.exists(directory):
+        if not _stat(directory):
             # Directory gone already.
             continue
         match_paths = [bytestring_path(d) for d in os.listdir(str_directory)]
         try:
             if fnmatch_all(match_paths, bytes_clutter):
                 # Directory contains only clutter (or nothing).
-                shutil.rmtree(str_directory)
+                try:
+                    shutil.rmtree(str_directory)
+                finally:
+                    _forget(directory, tree=True)
             else:
                 break
         except OSError:
@@ -448,10 +636,9 @@ def samefile(p1: bytes, p2: bytes) -> bool:
     """Safer equality for paths."""
     if p1 == p2:
         return True
-    with suppress(OSError):
-        return os.path.samefile(syspath(p1), syspath(p2))
-
-    return False
+    if (s1 := _stat(p1)) is None or (s2 := _stat(p2)) is None:
+        return False
+    return os.path.samestat(s1, s2)
 
 
 def remove(path: PathLike, soft: bool = True):
@@ -467,6 +654,8 @@ def remove(path: PathLike, soft: bool = True):
         raise FilesystemError(
             exc, "delete", (str_path,), traceback.format_exc()
         )
+    finally:
+        _forget(bytestring_path(path))
 
 
 def copy(path: bytes, dest: bytes, replace: bool = False):
@@ -487,6 +676,8 @@ def copy(path: bytes, dest: bytes, replace: bool = False):
         raise FilesystemError(
             exc, "copy", (str_path, str_dest), traceback.format_exc()
         )
+    finally:
+        _forget(dest)
 
 
 def move(path: bytes, dest: bytes, replace: bool = False):
@@ -503,6 +694,16 @@ def move(path: bytes, dest: bytes, replace: bool = False):
     if os.path.exists(syspath(dest)) and not replace:
         raise FilesystemError("file exists", "rename", (path, dest))
 
+    try:
+        _move(path, dest)
+    finally:
+        _forget(path, dest)
+
+
+def _move(path: bytes, dest: bytes):
+    """Rename a file, or copy it and remove the original if it cannot
+    be renamed.
+    """
     # First, try renaming the file.
     try:
         os.replace(syspath(path), syspath(dest))
@@ -560,6 +761,7 @@ def link(path: bytes, dest: bytes, replace: bool = False):
 
     if os.path.exists(syspath(dest)) and not replace:
         raise FilesystemError("file exists", "rename", (path, dest))
+    _forget(dest)
     try:
         os.symlink(syspath(path), syspath(dest))
     except NotImplementedError:
@@ -587,6 +789,7 @@ def hardlink(path: bytes, dest: bytes, replace: bool = False):
 
     if dest_path.exists() and not replace:
         raise FilesystemError("file exists", "rename", (path, dest))
+    _forget(dest)
     try:
         dest_path.hardlink_to(origin_path)
     except NotImplementedError:
@@ -628,6 +831,7 @@ def reflink(
     if os.path.exists(syspath(dest)) and not replace:
         raise FilesystemError("target exists", "rename", (path, dest))
 
+    _forget(dest)
     if fallback:
         with suppress(Exception):
             return import_module("reflink").reflink(path, dest)
@@ -648,12 +852,13 @@ def reflink(
         ) from exc
 
 
-def unique_path(path: bytes) -> bytes:
+def unique_path(path: bytes, taken: Container[bytes] = ()) -> bytes:
     """Returns a version of ``path`` that does not exist on the
     filesystem. Specifically, if ``path` itself already exists, then
-    something unique is appended to the path.
+    something unique is appended to the path. Paths in `taken` are
+    avoided as well, as if they existed.
     """
-    if not os.path.exists(syspath(path)):
+    if path not in taken and not os.path.exists(syspath(path)):
         return path
 
     base, ext = os.path.splitext(path)
@@ -667,7 +872,7 @@ def unique_path(path: bytes) -> bytes:
         num += 1
         suffix = f".{num}".encode() + ext
         new_path = base + suffix
-        if not os.path.exists(new_path):
+        if new_path not in taken and not os.path.exists(new_path):
             return new_path
 
 
@@ -994,8 +1199,17 @@ def case_sensitive(path: bytes) -> bool:
             # By default, the case sensitivity depends on the platform.
             return platform.system() != "Windows"
 
+        # The entries of a directory share their case sensitivity, which
+        # may be known already.
+        cache = _stat_cache
+        if cache is not None:
+            generation = cache.generation
+            found, result = cache.get(cache.case_sensitive, head)
+            if found:
+                return result
+
         # Trailing path separator, or path does not exist.
-        if not tail or not os.path.exists(path):
+        if not tail or not _stat(path):
             path = head
             continue
 
@@ -1008,19 +1222,21 @@ def case_sensitive(path: bytes) -> bool:
             path = head
             continue
 
-        upper_sys = syspath(os.path.join(head, upper_tail))
-        lower_sys = syspath(os.path.join(head, lower_tail))
+        upper_stat = _stat(os.path.join(head, upper_tail))
+        lower_stat = _stat(os.path.join(head, lower_tail))
 
         # If either the upper-cased or lower-cased path does not exist, the
-        # filesystem must be case-sensitive.
-        # (Otherwise, we have more work to do.)
-        if not os.path.exists(upper_sys) or not os.path.exists(lower_sys):
-            return True
-
-        # Original and both upper- and lower-cased versions of the path
-        # exist on the file system. Check whether they refer to different
-        # files by their inodes (or an alternative method on Windows).
-        return not os.path.samefile(lower_sys, upper_sys)
+        # filesystem must be case-sensitive. Otherwise, check whether they
+        # refer to different files by their inodes (or an alternative
+        # method on Windows).
+        result = (
+            not upper_stat
+            or not lower_stat
+            or not os.path.samestat(lower_stat, upper_stat)
+        )
+        if cache is not None:
+            cache.set(cache.case_sensitive, head, result, generation)
+        return result
 
 
 def asciify_path(path: str, sep_replace: str) -> str:
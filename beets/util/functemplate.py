@@ -29,6 +29,8 @@ engine like Jinja2 or Mustache.
 import ast
 import dis
 import functools
+import marshal
+import os
 import re
 import types
 
@@ -518,14 +520,89 @@ def template(fmt):
     return Template(fmt)
 
 
+class CodeCache:
+    """A cache of the code compiled for templates, kept in a file so
+    that later processes can load it instead of parsing and compiling
+    the same templates again.
+
+    The code is stored along with a `tag` naming the versions of beets
+    and Python that compiled it. A file with another tag is ignored.
+    At most `size` templates are kept, dropping the oldest ones first.
+    """
+
+    def __init__(self, path, tag, size=512):
+        self.path = path
+        self.tag = tag
+        self.size = size
+        self.entries = {}
+        self.changed = False
+
+    def load(self):
+        """Load the cached code from the file, if it has any."""
+        try:
+            with open(self.path, "rb") as f:
+                tag, entries = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if tag == self.tag and isinstance(entries, dict):
+            self.entries = entries
+
+    def save(self):
+        """Write the cached code to the file if templates were added."""
+        if not self.changed:
+            return
+        tmp_path = f"{os.fsdecode(self.path)}.tmp"
+        with open(tmp_path, "wb") as f:
+            marshal.dump((self.tag, self.entries), f)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+    def get(self, template):
+        """Get the code, variable names and function names compiled for
+        the template text, or None.
+        """
+        return self.entries.get(template)
+
+    def add(self, template, code, varnames, funcnames):
+        """Add the code compiled for the template text."""
+        self.entries[template] = (code, varnames, funcnames)
+        while len(self.entries) > self.size:
+            del self.entries[next(iter(self.entries))]
+        self.changed = True
+
+
+# The cache of compiled code used by new templates, if any.
+code_cache = None
+
+
 # External interface.
 class Template:
     """A string template, including text, Symbols, and Calls."""
 
     def __init__(self, template):
-        self.expr = _parse(template)
         self.original = template
-        self.compiled = self.translate()
+        func, varnames, funcnames = self.translate()
+        # The names of the values and functions the template uses.
+        self.fields = frozenset(varnames)
+        self.functions = frozenset(funcnames)
+
+        def wrapper_func(values={}, functions={}):
+            args = {}
+            for varname in varnames:
+                args[f"{VARIABLE_PREFIX}{varname}"] = values[varname]
+            for funcname in funcnames:
+                args[f"{FUNCTION_PREFIX}{funcname}"] = functions[funcname]
+            parts = func(**args)
+            return "".join(parts)
+
+        self.compiled = wrapper_func
+
+    @functools.cached_property
+    def expr(self):
+        """The parsed template. Templates loaded from the code cache are
+        parsed only when they need to be interpreted.
+        """
+        return _parse(self.original)
 
     def __eq__(self, other):
         return self.original == other.original
@@ -548,8 +625,20 @@ class Template:
         return res
 
     def translate(self):
-        """Compile the template to a Python function."""
+        """Compile the template to a Python function, or get the function
+        compiled before from the code cache. Return the function along
+        with the names of the variables and of the functions it takes.
+        """
+        cached = None if code_cache is None else code_cache.get(self.original)
+        if cached:
+            code, varnames, funcnames = cached
+            func = types.FunctionType(
+                code, {}, code.co_name, (None,) * code.co_argcount
+            )
+            return func, varnames, funcnames
+
         expressions, varnames, funcnames = self.expr.translate()
+        varnames, funcnames = tuple(varnames), tuple(funcnames)
 
         argnames = []
         for varname in varnames:
@@ -561,17 +650,9 @@ class Template:
             argnames,
             [ast.Return(ast.List(expressions, ast.Load()))],
         )
-
-        def wrapper_func(values={}, functions={}):
-            args = {}
-            for varname in varnames:
-                args[f"{VARIABLE_PREFIX}{varname}"] = values[varname]
-            for funcname in funcnames:
-                args[f"{FUNCTION_PREFIX}{funcname}"] = functions[funcname]
-            parts = func(**args)
-            return "".join(parts)
-
-        return wrapper_func
+        if code_cache is not None:
+            code_cache.add(self.original, func.__code__, varnames, funcnames)
+        return func, varnames, funcnames
 
 
 # Performance tests.
@@ -29,14 +29,24 @@ multiple coroutines for the same pipeline stage; this lets you speed
 up a bottleneck stage by dividing its work among multiple threads.
 To do so, pass an iterable of coroutines to the Pipeline constructor
 in place of any single coroutine.
+
+Alternatively, a stage decorated with an ``executor`` hands its tasks
+to a pool of threads, a pool of processes or an asyncio event loop.
+Such stages keep several tasks in flight at once but still emit their
+results in the order the tasks arrived.
 """
 
 from __future__ import annotations
 
+import asyncio
+import os
 import queue
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import wraps
 from threading import Lock, Thread
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, Any, TypeVar, overload
 
 from typing_extensions import TypeVarTuple, Unpack
 
@@ -48,6 +58,12 @@ POISON = "__PIPELINE_POISON__"
 
 DEFAULT_QUEUE_SIZE = 16
 
+# Executors that a stage can hand its tasks to.
+THREAD = "thread"
+PROCESS = "process"
+ASYNCIO = "asyncio"
+EXECUTORS = (THREAD, PROCESS, ASYNCIO)
+
 Tq = TypeVar("Tq")
 
 
@@ -169,12 +185,123 @@ T = TypeVar("T")  # Type of the task
 R = TypeVar("R")
 
 
+class ExecutorStage:
+    """A pipeline stage whose function runs on an executor.
+
+    Instances are created by calling a function decorated with
+    :func:`stage` or :func:`mutator_stage` and an ``executor``. When the
+    pipeline runs in parallel, the stage keeps up to ``workers`` tasks in
+    flight on a thread pool, a process pool or an asyncio event loop and
+    sends the results on in the order the tasks arrived. Sequential runs
+    call the function in the current thread.
+
+    For the process executor, the decorated function must live at module
+    level and its arguments and tasks must be picklable. A mutator stage
+    then sends on the mutated copy of the task that comes back from the
+    worker process.
+    """
+
+    def __init__(self, factory, args, mutator, executor, workers):
+        self.factory = factory
+        self.func = factory.__wrapped__
+        self.args = args
+        self.mutator = mutator
+        self.executor = executor
+        self.workers = workers or os.cpu_count() or 1
+
+    def make_executor(self):
+        """Create the executor that runs the tasks of this stage."""
+        if self.executor == PROCESS:
+            return ProcessPoolExecutor(self.workers)
+        elif self.executor == ASYNCIO:
+            return _AsyncioExecutor()
+        else:
+            return ThreadPoolExecutor(self.workers)
+
+    def submit(self, executor, task):
+        """Start processing `task` and return a future for its result."""
+        if self.executor == PROCESS:
+            return executor.submit(
+                _call_stage, self.factory, self.args, self.mutator, task
+            )
+        elif self.executor == ASYNCIO:
+            return executor.submit(self._await(task))
+        else:
+            return executor.submit(self.call, task)
+
+    def call(self, task):
+        """Process `task` in the current thread and return the message
+        to send to the next stage.
+        """
+        if self.executor == ASYNCIO:
+            return asyncio.run(self._await(task))
+        out = self.func(*self.args, task)
+        return task if self.mutator else out
+
+    async def _await(self, task):
+        out = await self.func(*self.args, task)
+        return task if self.mutator else out
+
+    def coro(self):
+        """Return a plain coroutine running the stage sequentially."""
+        task = None
+        while True:
+            task = yield task
+            task = self.call(task)
+
+
+def _call_stage(factory, args, mutator, task):
+    """Run the function behind a stage factory in a worker process.
+
+    The factory is pickled by reference and its ``__wrapped__``
+    attribute is the undecorated stage function.
+    """
+    out = factory.__wrapped__(*args, task)
+    return task if mutator else out
+
+
+class _AsyncioExecutor:
+    """Run coroutines on an event loop in a background thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def _executor_stage(func, mutator, executor, workers):
+    """Wrap `func` in a factory of :class:`ExecutorStage` objects."""
+    if executor not in EXECUTORS:
+        raise ValueError(f"unknown pipeline executor: {executor}")
+
+    @wraps(func)
+    def factory(*args):
+        return ExecutorStage(factory, args, mutator, executor, workers)
+
+    return factory
+
+
+@overload
+def stage(
+    func: Callable[[Unpack[A], T], R | None],
+) -> Callable[[Unpack[A]], Generator[R | T | None, T, None]]: ...
+
+
+@overload
 def stage(
-    func: Callable[
-        [Unpack[A], T],
-        R | None,
-    ],
-):
+    *, executor: str, workers: int | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., ExecutorStage]]: ...
+
+
+def stage(func=None, *, executor=None, workers=None):
     """Decorate a function to become a simple stage.
 
     >>> @stage
@@ -186,7 +313,14 @@ def stage(
     ... ])
     >>> list(pipe.pull())
     [3, 4, 5]
+
+    Pass ``executor`` (one of ``"thread"``, ``"process"`` or
+    ``"asyncio"``) to run the function on up to ``workers`` tasks at
+    once; see :class:`ExecutorStage`. Functions for the asyncio executor
+    must be coroutine functions.
     """
+    if func is None:
+        return lambda func: _executor_stage(func, False, executor, workers)
 
     def coro(*args: Unpack[A]) -> Generator[R | T | None, T, None]:
         task: R | T | None = None
@@ -197,7 +331,19 @@ def stage(
     return coro
 
 
-def mutator_stage(func: Callable[[Unpack[A], T], R]):
+@overload
+def mutator_stage(
+    func: Callable[[Unpack[A], T], R],
+) -> Callable[[Unpack[A]], Generator[T | None, T, None]]: ...
+
+
+@overload
+def mutator_stage(
+    *, executor: str, workers: int | None = None
+) -> Callable[[Callable[..., Any]], Callable[..., ExecutorStage]]: ...
+
+
+def mutator_stage(func=None, *, executor=None, workers=None):
     """Decorate a function that manipulates items in a coroutine to
     become a simple stage.
 
@@ -210,7 +356,11 @@ def mutator_stage(func: Callable[[Unpack[A], T], R]):
     ... ])
     >>> list(pipe.pull())
     [{'x': True}, {'a': False, 'x': True}]
+
+    Like :func:`stage`, this accepts an ``executor`` and ``workers``.
     """
+    if func is None:
+        return lambda func: _executor_stage(func, True, executor, workers)
 
     def coro(*args: Unpack[A]) -> Generator[T | None, T, None]:
         task = None
@@ -387,6 +537,79 @@ class LastPipelineThread(PipelineThread):
             return
 
 
+class ExecutorPipelineThread(PipelineThread):
+    """A thread feeding an :class:`ExecutorStage` from its input queue.
+    The results are sent to `out_queue` in order, or discarded if this
+    is the last stage and `out_queue` is None.
+    """
+
+    def __init__(self, stage, in_queue, out_queue, all_threads):
+        super().__init__(all_threads)
+        self.stage = stage
+        self.in_queue = in_queue
+        if out_queue is not None:
+            self.out_queue = out_queue
+            self.out_queue.acquire()
+
+    def _send(self, future):
+        """Wait for `future` and send its messages to the next stage.
+        Return False if the pipeline was aborted in the meantime.
+        """
+        out = future.result()
+        if not hasattr(self, "out_queue"):
+            return True
+        for msg in _allmsgs(out):
+            with self.abort_lock:
+                if self.abort_flag:
+                    return False
+            self.out_queue.put(msg)
+        return True
+
+    def run(self):
+        executor = self.stage.make_executor()
+        pending: deque[Any] = deque()
+        try:
+            while True:
+                with self.abort_lock:
+                    if self.abort_flag:
+                        return
+
+                # Get the message from the previous stage.
+                msg = self.in_queue.get()
+                if msg is POISON:
+                    break
+
+                with self.abort_lock:
+                    if self.abort_flag:
+                        return
+
+                # Keep at most `workers` tasks in flight and send the
+                # finished ones on in order.
+                pending.append(self.stage.submit(executor, msg))
+                while pending and (
+                    len(pending) >= self.stage.workers or pending[0].done()
+                ):
+                    if not self._send(pending.popleft()):
+                        return
+
+            while pending:
+                if not self._send(pending.popleft()):
+                    return
+
+        except BaseException:
+            self.abort_all(sys.exc_info())
+            return
+
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=not pending, cancel_futures=True)
+
+        # Pipeline is shutting down normally.
+        if hasattr(self, "out_queue"):
+            self.out_queue.release()
+
+
 class Pipeline:
     """Represents a staged pattern of work. Each stage in the pipeline
     is a coroutine that receives messages from the previous stage and
@@ -395,10 +618,13 @@ class Pipeline:
 
     def __init__(self, stages):
         """Makes a new pipeline from a list of coroutines. There must
-        be at least two stages.
+        be at least two stages. Apart from the first one, a stage may
+        also be an :class:`ExecutorStage`.
         """
         if len(stages) < 2:
             raise ValueError("pipeline must have at least two stages")
+        if isinstance(stages[0], ExecutorStage):
+            raise ValueError("the first pipeline stage must be a generator")
         self.stages = []
         for stage in stages:
             if isinstance(stage, (list, tuple)):
@@ -430,15 +656,23 @@ class Pipeline:
         # Middle stages.
         for i in range(1, queue_count):
             for coro in self.stages[i]:
-                threads.append(
-                    MiddlePipelineThread(
+                if isinstance(coro, ExecutorStage):
+                    thread = ExecutorPipelineThread(
                         coro, queues[i - 1], queues[i], threads
                     )
-                )
+                else:
+                    thread = MiddlePipelineThread(
+                        coro, queues[i - 1], queues[i], threads
+                    )
+                threads.append(thread)
 
         # Last stage.
         for coro in self.stages[-1]:
-            threads.append(LastPipelineThread(coro, queues[-1], threads))
+            if isinstance(coro, ExecutorStage):
+                thread = ExecutorPipelineThread(coro, queues[-1], None, threads)
+            else:
+                thread = LastPipelineThread(coro, queues[-1], threads)
+            threads.append(thread)
 
         # Start threads.
         for thread in threads:
@@ -477,7 +711,10 @@ class Pipeline:
         that is the last stage does not yield any messages, then pull will not
         yield any messages. Only the first coroutine in each stage is used
         """
-        coros = [stage[0] for stage in self.stages]
+        coros = [
+            stage[0].coro() if isinstance(stage[0], ExecutorStage) else stage[0]
+            for stage in self.stages
+        ]
 
         # "Prime" the coroutines.
         for coro in coros[1:]:
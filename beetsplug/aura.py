@@ -19,6 +19,7 @@ from __future__ import annotations
 import os
 import re
 from dataclasses import dataclass
+from itertools import islice
 from mimetypes import guess_type
 from typing import TYPE_CHECKING, ClassVar
 
@@ -40,8 +41,8 @@ from beets.dbcore.query import (
     MultipleSort,
     NotQuery,
     RegexpQuery,
-    SlowFieldSort,
 )
+from beets.dbcore.queryparse import construct_sort_part
 from beets.library import Album, Item
 from beets.plugins import BeetsPlugin
 from beets.ui import Subcommand, _open_library
@@ -216,29 +217,38 @@ class AURADocument:
                 ascending = True
             # Get the beets version of the attribute name
             beets_attr = self.attribute_map.get(aura_attr, aura_attr)
-            # Use slow sort so it works with all fields (inc. computed)
-            sorts.append(SlowFieldSort(beets_attr, ascending=ascending))
+            # Sort in SQL where possible, falling back to a slow sort for
+            # computed fields
+            direction = "+" if ascending else "-"
+            sorts.append(
+                construct_sort_part(self.model_cls, f"{beets_attr}{direction}")
+            )
         return MultipleSort(sorts)
 
-    def paginate(self, collection):
-        """Get a page of the collection and the URL to the next page.
-
-        Args:
-            collection: The raw data from which resource objects can be
-                built. Could be an sqlite3.Cursor object (tracks and
-                albums) or a list of strings (artists).
+    def page_range(self):
+        """Get the offset of the first element of the requested page and
+        the maximum number of elements on it.
         """
         # Pages start from zero
         page = self.args.get("page", 0, int)
         # Use page limit defined in config by default.
         default_limit = config["aura"]["page_limit"].get(int)
         limit = self.args.get("limit", default_limit, int)
-        # start = offset of first item to return
-        start = page * limit
-        # end = offset of last item + 1
-        end = start + limit
-        if end > len(collection):
-            end = len(collection)
+        return page * limit, limit
+
+    def paginate(self, collection, limit):
+        """Get a page of the collection and the URL to the next page.
+
+        Args:
+            collection: The raw data from which resource objects can be
+                built, starting at the requested page. Could be a beets
+                Results object (tracks and albums) or a list of strings
+                (artists). An element past the page indicates that there
+                is a next page.
+            limit: The maximum number of elements on the page.
+        """
+        page = self.args.get("page", 0, int)
+        if len(collection) <= limit:
             next_url = None
         else:
             # Not the last page so work out links.next url
@@ -255,8 +265,8 @@ class AURADocument:
                 )
         # Get only the items in the page range
         data = [
-            self.get_resource_object(self.lib, collection[i])
-            for i in range(start, end)
+            self.get_resource_object(self.lib, element)
+            for element in islice(collection, limit)
         ]
         return data, next_url
 
@@ -331,10 +341,14 @@ class AURADocument:
             )
         else:
             sort = None
-        # Get information from the library
-        collection = self.get_collection(query=query, sort=sort)
-        # Convert info to AURA form and paginate it
-        data, next_url = self.paginate(collection)
+        # Get the requested page from the library, plus one element to
+        # tell whether there is a next page
+        offset, limit = self.page_range()
+        collection = self.get_collection(
+            query=query, sort=sort, limit=limit + 1, offset=offset
+        )
+        # Convert info to AURA form
+        data, next_url = self.paginate(collection, limit)
         document = {"data": data}
         # If there are more pages then provide a way to access them
         if next_url:
@@ -369,14 +383,16 @@ class TrackDocument(AURADocument):
 
     attribute_map = TRACK_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_collection(self, query=None, sort=None, limit=None, offset=0):
         """Get Item objects from the library.
 
         Args:
             query: A beets Query object or a beets query string.
             sort: A beets Sort object.
+            limit: The maximum number of Items to get.
+            offset: The number of matching Items to skip.
         """
-        return self.lib.items(query, sort)
+        return self.lib.items(query, sort, limit=limit, offset=offset)
 
     @classmethod
     def get_attribute_converter(cls, beets_attr: str) -> type[SQLiteType]:
@@ -449,14 +465,16 @@ class AlbumDocument(AURADocument):
 
     attribute_map = ALBUM_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_collection(self, query=None, sort=None, limit=None, offset=0):
         """Get Album objects from the library.
 
         Args:
             query: A beets Query object or a beets query string.
             sort: A beets Sort object.
+            limit: The maximum number of Albums to get.
+            offset: The number of matching Albums to skip.
         """
-        return self.lib.albums(query, sort)
+        return self.lib.albums(query, sort, limit=limit, offset=offset)
 
     @staticmethod
     def get_resource_object(lib: Library, album):
@@ -533,12 +551,14 @@ class ArtistDocument(AURADocument):
 
     attribute_map = ARTIST_ATTR_MAP
 
-    def get_collection(self, query=None, sort=None):
+    def get_collection(self, query=None, sort=None, limit=None, offset=0):
         """Get a list of artist names from the library.
 
         Args:
             query: A beets Query object or a beets query string.
             sort: A beets Sort object.
+            limit: The maximum number of artist names to get.
+            offset: The number of artist names to skip.
         """
         # Gets only tracks with matching artist information
         tracks = self.lib.items(query, sort)
@@ -547,7 +567,8 @@ class ArtistDocument(AURADocument):
             # Do not add duplicates
             if track.artist not in collection:
                 collection.append(track.artist)
-        return collection
+        stop = None if limit is None else offset + limit
+        return collection[offset:stop]
 
     @staticmethod
     def get_resource_object(lib: Library, artist_id):
@@ -17,9 +17,11 @@
 import cProfile
 import timeit
 
-from beets import importer, library, plugins, ui
-from beets.autotag import match
+from beets import config, importer, library, plugins, ui
+from beets.autotag import TrackInfo, match
+from beets.autotag.distance import track_distance, track_distance_matrix
 from beets.plugins import BeetsPlugin
+from beets.util import functemplate
 from beets.util.functemplate import Template
 from beetsplug._utils import vfs
 
@@ -65,6 +67,49 @@ def aunique_benchmark(lib, prof):
         print("Without %aunique:", interval)
 
 
+def template_benchmark(lib, prof, query=None, fmt=None):
+    fmt = fmt or config["format_item"].as_str()
+    tmpl = Template(fmt)
+    # Prepare the values and functions up front, so that only the
+    # template evaluation is measured.
+    args = [
+        (item.formatted(used_keys=tmpl.fields), item._template_funcs())
+        for item in lib.items(query, with_albums=True)
+    ]
+
+    def _interpret():
+        for values, funcs in args:
+            tmpl.interpret(values, funcs)
+
+    def _substitute():
+        for values, funcs in args:
+            tmpl.substitute(values, funcs)
+
+    def _compile():
+        # Bypass the code cache to measure compilation itself.
+        code_cache, functemplate.code_cache = functemplate.code_cache, None
+        try:
+            Template(fmt)
+        finally:
+            functemplate.code_cache = code_cache
+
+    if prof:
+        for name, func in (
+            ("interpreted", _interpret),
+            ("compiled", _substitute),
+        ):
+            cProfile.runctx(
+                "func()", {}, {"func": func}, f"template.{name}.prof"
+            )
+        return
+
+    print("Compile:", timeit.timeit(_compile, number=1))
+    interval = timeit.timeit(_interpret, number=1)
+    print(f"Interpreted ({len(args)} items):", interval)
+    interval = timeit.timeit(_substitute, number=1)
+    print(f"Compiled ({len(args)} items):", interval)
+
+
 def match_benchmark(lib, prof, query=None, album_id=None):
     # If no album ID is provided, we'll match against a suitably huge
     # album.
@@ -94,6 +139,43 @@ def match_benchmark(lib, prof, query=None, album_id=None):
         print("match duration:", interval)
 
 
+def distance_benchmark(lib, prof, query=None):
+    # Match the items of the queried albums against tracks built from
+    # those same items, so that no metadata source is needed.
+    items = list(lib.items(query))
+    tracks = [
+        TrackInfo(
+            title=item.title,
+            artist=item.artist,
+            length=item.length,
+            index=item.track,
+            medium_index=item.track,
+            medium=item.disc,
+            track_id=item.mb_trackid,
+        )
+        for item in reversed(items)
+    ]
+
+    def _pairwise():
+        return [[float(track_distance(i, t)) for t in tracks] for i in items]
+
+    def _matrix():
+        return track_distance_matrix(items, tracks)
+
+    if prof:
+        for name, func in (("pairwise", _pairwise), ("matrix", _matrix)):
+            cProfile.runctx(
+                "func()", {}, {"func": func}, f"distance.{name}.prof"
+            )
+        return
+
+    size = f"{len(items)}x{len(tracks)}"
+    print(f"Pairwise ({size}):", timeit.timeit(_pairwise, number=1))
+    print(f"Matrix ({size}):", timeit.timeit(_matrix, number=1))
+    if _matrix().tolist() != _pairwise():
+        print("Warning: the distance matrices differ")
+
+
 class BenchmarkPlugin(BeetsPlugin):
     """A plugin for performing some simple performance benchmarks."""
 
@@ -129,4 +211,45 @@ class BenchmarkPlugin(BeetsPlugin):
             lib, opts.profile, args, opts.id
         )
 
-        return [aunique_bench_cmd, match_bench_cmd]
+        template_bench_cmd = ui.Subcommand(
+            "bench_template",
+            help="benchmark for interpreted and compiled templates",
+        )
+        template_bench_cmd.parser.add_option(
+            "-p",
+            "--profile",
+            action="store_true",
+            default=False,
+            help="performance profiling",
+        )
+        template_bench_cmd.parser.add_option(
+            "-f",
+            "--format",
+            default=None,
+            help="template to evaluate (default: format_item)",
+        )
+        template_bench_cmd.func = lambda lib, opts, args: template_benchmark(
+            lib, opts.profile, args, opts.format
+        )
+
+        distance_bench_cmd = ui.Subcommand(
+            "bench_distance",
+            help="benchmark for the track distance matrix",
+        )
+        distance_bench_cmd.parser.add_option(
+            "-p",
+            "--profile",
+            action="store_true",
+            default=False,
+            help="performance profiling",
+        )
+        distance_bench_cmd.func = lambda lib, opts, args: distance_benchmark(
+            lib, opts.profile, args
+        )
+
+        return [
+            aunique_bench_cmd,
+            match_bench_cmd,
+            template_bench_cmd,
+            distance_bench_cmd,
+        ]
@@ -1313,7 +1313,7 @@ class Server(BaseServer):
 
     def cmd_stats(self, conn):
         """Sends some statistics about the library."""
-        with self.lib.transaction() as tx:
+        with self.lib.transaction(read_only=True) as tx:
             statement = (
                 "SELECT COUNT(DISTINCT artist), "
                 "COUNT(DISTINCT album), "
@@ -1452,7 +1452,7 @@ class Server(BaseServer):
             f" ORDER BY {show_key}"
         )
         self._log.debug(statement)
-        with self.lib.transaction() as tx:
+        with self.lib.transaction(read_only=True) as tx:
             rows = tx.query(statement, subvals)
 
         for row in rows:
@@ -34,7 +34,7 @@ def tag_data(lib, args, album=False):
             query.append(arg)
 
     if query:
-        for item in lib.items(query):
+        for item in lib.items(query, stream=True):
             yield tag_data_emitter(item.path)
 
 
@@ -70,7 +70,11 @@ def tag_data_emitter(path):
 
 
 def library_data(lib, args, album=False):
-    for item in lib.albums(args) if album else lib.items(args):
+    if album:
+        objs = lib.albums(args, stream=True)
+    else:
+        objs = lib.items(args, stream=True, with_albums=True)
+    for item in objs:
         yield library_data_emitter(item)
 
 
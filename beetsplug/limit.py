@@ -21,7 +21,6 @@
 """
 
 from collections import deque
-from itertools import islice
 
 from beets.dbcore import FieldQuery
 from beets.plugins import BeetsPlugin
@@ -36,14 +35,13 @@ def lslimit(lib, opts, args):
     if (opts.head or opts.tail or 0) < 0:
         raise ValueError("Limit value must be non-negative")
 
+    # The head is cut off by the database rather than while iterating.
     if opts.album:
-        objs = lib.albums(args)
+        objs = lib.albums(args, limit=opts.head)
     else:
-        objs = lib.items(args)
+        objs = lib.items(args, limit=opts.head)
 
-    if opts.head is not None:
-        objs = islice(objs, opts.head)
-    elif opts.tail is not None:
+    if opts.head is None and opts.tail is not None:
         objs = deque(objs, opts.tail)
 
     for obj in objs:
@@ -150,21 +150,24 @@ class MBSyncPlugin(BeetsPlugin):
             self._log.debug("applying changes to {}", album)
             with lib.transaction():
                 autotag.apply_metadata(album_info, item_info_pairs)
-                changed = False
+                changed_items = []
                 # Find any changed item to apply changes to album.
                 any_changed_item = items[0]
                 for item in items:
-                    item_changed = ui.show_model_changes(item)
-                    changed |= item_changed
-                    if item_changed:
+                    if ui.show_model_changes(item):
                         any_changed_item = item
-                        apply_item_changes(lib, item, move, pretend, write)
+                        changed_items.append(item)
+                        apply_item_changes(
+                            lib, item, move, pretend, write, store=False
+                        )
 
-                if not changed:
+                if not changed_items:
                     # No change to any item.
                     continue
 
                 if not pretend:
+                    lib.bulk_store(changed_items)
+
                     # Update album structure to reflect an item in it.
                     for key in library.Album.item_keys:
                         album[key] = any_changed_item[key]
@@ -114,6 +114,18 @@ def is_delete():
     return flask.request.args.get("delete") is not None
 
 
+def page_args():
+    """Returns the pagination arguments of the current request as keyword
+    arguments for `Library.items` and `Library.albums`.
+    """
+    args = flask.request.args
+    return {
+        "limit": args.get("limit", None, int),
+        "offset": args.get("offset", 0, int),
+        "after": args.get("after", None, int),
+    }
+
+
 def get_method():
     """Returns the HTTP method of the current request."""
     return flask.request.method
@@ -242,7 +254,7 @@ def _get_unique_table_field_values(model, field, sort_field):
     """retrieve all unique values belonging to a key from a model"""
     if field not in model.all_keys() or sort_field not in model.all_keys():
         raise KeyError
-    with g.lib.transaction() as tx:
+    with g.lib.transaction(read_only=True) as tx:
         rows = tx.query(
             f"SELECT DISTINCT {field} FROM {model._table} ORDER BY {sort_field}"
         )
@@ -311,7 +323,7 @@ def get_item(id):
 @app.route("/item/query/")
 @resource_list("items")
 def all_items():
-    return g.lib.items()
+    return g.lib.items(**page_args())
 
 
 @app.route("/item/<int:item_id>/file")
@@ -376,7 +388,7 @@ def get_album(id):
 @app.route("/album/query/")
 @resource_list("albums")
 def all_albums():
-    return g.lib.albums()
+    return g.lib.albums(**page_args())
 
 
 @app.route("/album/query/<query:queries>", methods=["GET", "DELETE"])
@@ -411,7 +423,7 @@ def album_unique_field_values(key):
 
 @app.route("/artist/")
 def all_artists():
-    with g.lib.transaction() as tx:
+    with g.lib.transaction(read_only=True) as tx:
         rows = tx.query("SELECT DISTINCT albumartist FROM albums")
     all_artists = [row[0] for row in rows]
     return flask.jsonify(artist_names=all_artists)
@@ -422,7 +434,7 @@ def all_artists():
 
 @app.route("/stats")
 def stats():
-    with g.lib.transaction() as tx:
+    with g.lib.transaction(read_only=True) as tx:
         item_rows = tx.query("SELECT COUNT(*) FROM items")
         album_rows = tx.query("SELECT COUNT(*) FROM albums")
     return flask.jsonify(
@@ -1,3 +1,4 @@
+import random
 import re
 
 import pytest
@@ -7,7 +8,9 @@ from beets.autotag.distance import (
     Distance,
     distance,
     string_dist,
+    string_dist_matrix,
     track_distance,
+    track_distance_matrix,
 )
 from beets.library import Item
 from beets.metadata_plugins import MetadataSourcePlugin, get_penalty
@@ -163,6 +166,68 @@ class TestTrackDistance:
         assert bool(dist) == expected_penalty, dist._penalties
 
 
+class TestTrackDistanceMatrix:
+    TITLES = (
+        "title",
+        "Title, The",
+        "The Title (feat. Someone)",
+        "Titel [Live]",
+        "Rock & Roll pt. 2",
+        "Ünïcödé",
+        "",
+    )
+    ARTISTS = ("artist", "Various Artists", "Artist & Band", "")
+
+    @pytest.fixture
+    def items(self):
+        rand = random.Random(0)
+        return [
+            Item(
+                title=rand.choice(self.TITLES),
+                artist=rand.choice(self.ARTISTS),
+                length=rand.choice([0.0, 100.0, 180.5, 300.0]),
+                track=rand.choice([0, 1, 2, 3]),
+                disc=rand.choice([0, 1, 2]),
+                mb_trackid=rand.choice(["", "id1", "id2"]),
+                data_source=rand.choice([None, "MusicBrainz"]),
+            )
+            for _ in range(30)
+        ]
+
+    @pytest.fixture
+    def tracks(self):
+        rand = random.Random(1)
+        return [
+            TrackInfo(
+                title=rand.choice([*self.TITLES, None]),
+                artist=rand.choice([*self.ARTISTS, None]),
+                length=rand.choice([None, 0, 95.0, 182.0, 400.0]),
+                index=rand.choice([None, 1, 2, 3]),
+                medium_index=rand.choice([None, 1, 2]),
+                medium=rand.choice([None, 1, 2]),
+                track_id=rand.choice(["id1", "id2", "id3"]),
+                data_source=rand.choice([None, "MusicBrainz", "Discogs"]),
+            )
+            for _ in range(25)
+        ]
+
+    @pytest.mark.parametrize("incl_artist", [False, True])
+    def test_matches_track_distance(self, items, tracks, incl_artist):
+        matrix = track_distance_matrix(items, tracks, incl_artist)
+
+        assert matrix.tolist() == [
+            [float(track_distance(i, t, incl_artist)) for t in tracks]
+            for i in items
+        ]
+
+    def test_string_dist_matrix(self):
+        strings = [*self.TITLES, None]
+
+        assert string_dist_matrix(strings, strings).tolist() == [
+            [string_dist(s1, s2) for s2 in strings] for s1 in strings
+        ]
+
+
 class TestAlbumDistance:
     @pytest.fixture(scope="class")
     def items(self):
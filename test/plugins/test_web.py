@@ -118,6 +118,17 @@ class WebPluginTest(ItemInDBTestCase):
         assert response.status_code == 200
         assert len(res_json["items"]) == 3
 
+    def test_get_items_page(self):
+        response = self.client.get("/item/?limit=2")
+        first = json.loads(response.data.decode("utf-8"))["items"]
+        response = self.client.get(f"/item/?after={first[-1]['id']}")
+        rest = json.loads(response.data.decode("utf-8"))["items"]
+
+        assert response.status_code == 200
+        assert len(first) == 2
+        assert len(rest) == 1
+        assert rest[0]["id"] not in {item["id"] for item in first}
+
     def test_get_unique_item_artist(self):
         response = self.client.get("/item/values/artist")
         res_json = json.loads(response.data.decode("utf-8"))
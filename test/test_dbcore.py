@@ -17,9 +17,11 @@
 import os
 import shutil
 import sqlite3
+import threading
 import unittest
 from tempfile import mkstemp
 from typing import ClassVar
+from unittest.mock import patch
 
 import pytest
 
@@ -158,6 +160,14 @@ class DatabaseFixtureTwoModels(dbcore.Database):
     _models = (ModelFixture2, AnotherModelFixture)
 
 
+class IndexedModelFixture(ModelFixture1):
+    _indexed_fields: ClassVar[set[str]] = {"field_two", "foo"}
+
+
+class IndexedDatabaseFixture(dbcore.Database):
+    _models = (IndexedModelFixture,)
+
+
 class ModelFixtureWithGetters(dbcore.Model):
     @classmethod
     def _getters(cls):
@@ -273,6 +283,72 @@ class TransactionTest(unittest.TestCase):
         assert self.db.revision == old_rev
 
 
+class WalTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.libfile = mkstemp("db")
+        os.close(handle)
+        self.db = DatabaseFixture1(
+            self.libfile, pragmas={"journal_mode": "wal", "synchronous": 1}
+        )
+
+    def tearDown(self):
+        self.db._close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.libfile + suffix):
+                os.remove(self.libfile + suffix)
+
+    def write_in_thread(self):
+        def write():
+            ModelFixture1(field_one=1).add(self.db)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join(timeout=5)
+        return not thread.is_alive()
+
+    def test_pragmas_are_set(self):
+        assert self.db.wal
+        with self.db.transaction() as tx:
+            assert tx.query("PRAGMA synchronous")[0][0] == 1
+
+    def test_reads_do_not_block_writes(self):
+        with self.db.transaction(read_only=True) as tx:
+            tx.query("SELECT * FROM test")
+            assert not self.db._db_lock.locked()
+            assert self.write_in_thread()
+
+    def test_lock_taken_for_transactions_that_may_write(self):
+        with self.db.transaction() as tx:
+            tx.query("SELECT * FROM test")
+            assert self.db._db_lock.locked()
+        assert not self.db._db_lock.locked()
+
+    def test_read_only_transaction_locks_on_write(self):
+        with self.db.transaction(read_only=True) as tx:
+            tx.query("SELECT * FROM test")
+            assert not self.db._db_lock.locked()
+            with self.db.transaction() as nested:
+                assert self.db._db_lock.locked()
+                nested.mutate("INSERT INTO test (field_one) VALUES (2)")
+            assert self.db._db_lock.locked()
+        assert not self.db._db_lock.locked()
+
+    def test_writes_hold_lock_until_commit(self):
+        with self.db.transaction() as tx:
+            tx.mutate("INSERT INTO test (field_one) VALUES (2)")
+            with self.db.transaction() as nested:
+                nested.mutate("INSERT INTO test (field_one) VALUES (3)")
+            assert self.db._db_lock.locked()
+        assert not self.db._db_lock.locked()
+
+    def test_lock_taken_for_reads_without_wal(self):
+        db = DatabaseFixture1(":memory:")
+        assert not db.wal
+        with db.transaction():
+            assert db._db_lock.locked()
+        db._connection().close()
+
+
 class ModelTest(unittest.TestCase):
     def setUp(self):
         self.db = DatabaseFixture1(":memory:")
@@ -407,6 +483,39 @@ class ModelTest(unittest.TestCase):
         model2.load()
         assert "flex_field" not in model2
 
+    def test_loaded_values_are_converted_once(self):
+        model = ModelFixture1(self.db, field_one=1, field_two="two")
+        model.add(self.db)
+
+        # The decoders of a query's columns are set up once per model.
+        ModelFixture1._row_layout.cache_clear()
+        self.addCleanup(ModelFixture1._row_layout.cache_clear)
+        with patch.object(
+            dbcore.types.INTEGER,
+            "from_sql",
+            wraps=dbcore.types.INTEGER.from_sql,
+        ) as from_sql:
+            loaded = self.db._get(ModelFixture1, model.id)
+            assert loaded.field_one == 1
+            assert loaded.field_one == 1
+        assert from_sql.call_count == 1
+        assert set(loaded._values_fixed.keys()) == {
+            "id",
+            "field_one",
+            "field_two",
+        }
+
+    def test_loaded_values_copy(self):
+        model = ModelFixture1(self.db, field_one=1)
+        model.add(self.db)
+        loaded = self.db._get(ModelFixture1, model.id)
+
+        copy = loaded.copy()
+        copy.field_one = 2
+        assert loaded.field_one == 1
+        assert copy.field_one == 2
+        assert copy._dirty == {"field_one"}
+
     def test_check_db_fails(self):
         with pytest.raises(ValueError, match="no database"):
             dbcore.Model()._check_db()
@@ -799,6 +908,326 @@ class ResultsIteratorTest(unittest.TestCase):
         )
 
 
+class FlexAttributeLoadingTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        for i in range(5):
+            model = ModelFixture1(field_one=i)
+            model["foo"] = f"foo{i}"
+            model["bar"] = f"bar{i}"
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def test_filtered_query_loads_flex_attributes(self):
+        q = dbcore.query.NumericQuery("field_one", "1..3")
+        objs = list(self.db._fetch(ModelFixture1, q))
+        assert [o.foo for o in objs] == ["foo1", "foo2", "foo3"]
+        assert [o.bar for o in objs] == ["bar1", "bar2", "bar3"]
+
+    def test_ids_are_looked_up_in_batches(self):
+        self.db.max_variables = 2
+        q = dbcore.query.NumericQuery("field_one", "1..")
+        objs = list(self.db._fetch(ModelFixture1, q))
+        assert [o.foo for o in objs] == ["foo1", "foo2", "foo3", "foo4"]
+
+    def test_restrict_flex_keys(self):
+        q = dbcore.query.NumericQuery("field_one", "1")
+        obj = self.db._fetch(ModelFixture1, q, flex_keys=["foo"]).get()
+        assert obj.foo == "foo1"
+        assert "bar" not in obj
+
+    def test_restrict_many_flex_keys(self):
+        self.db.max_variables = 2
+        keys = ["foo", "baz", "qux"]
+        q = dbcore.query.NumericQuery("field_one", "1..")
+        objs = list(self.db._fetch(ModelFixture1, q, flex_keys=keys))
+        assert [o.foo for o in objs] == ["foo1", "foo2", "foo3", "foo4"]
+        assert not any("bar" in o for o in objs)
+        all_objs = list(self.db._fetch(ModelFixture1, flex_keys=keys))
+        assert [o.foo for o in all_objs] == [f"foo{i}" for i in range(5)]
+
+    def test_restrict_flex_keys_ignored_for_slow_query(self):
+        q = dbcore.query.SubstringQuery("bar", "bar1", False)
+        obj = self.db._fetch(ModelFixture1, q, flex_keys=["foo"]).get()
+        assert obj.bar == "bar1"
+
+
+class FetchValuesTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        for field_one, foo in ((2, "baz"), (1, "bar")):
+            model = ModelFixture1(field_one=field_one, field_two="x")
+            model["foo"] = foo
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def test_fixed_fields(self):
+        values = self.db._fetch_values(
+            ModelFixture1, ("field_one", "field_two")
+        )
+        assert values == [(2, "x"), (1, "x")]
+
+    def test_sorted(self):
+        s = dbcore.query.FixedFieldSort("field_one")
+        values = self.db._fetch_values(ModelFixture1, ("id",), sort=s)
+        assert values == [(2,), (1,)]
+
+    def test_fast_query(self):
+        q = dbcore.query.MatchQuery("field_one", 1)
+        assert self.db._fetch_values(ModelFixture1, ("field_one",), q) == [(1,)]
+
+    def test_flex_field_falls_back_to_models(self):
+        s = dbcore.query.SlowFieldSort("foo")
+        values = self.db._fetch_values(
+            ModelFixture1, ("foo", "field_one"), sort=s
+        )
+        assert values == [("bar", 1), ("baz", 2)]
+
+    def test_slow_query_falls_back_to_models(self):
+        q = dbcore.query.SubstringQuery("foo", "az", False)
+        assert self.db._fetch_values(ModelFixture1, ("field_one",), q) == [(2,)]
+
+
+class StreamingResultsTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        self.db.max_variables = 2
+        for i in range(5):
+            model = ModelFixture1(field_one=i)
+            model["foo"] = f"foo{i}"
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def test_iterate_in_batches_and_order(self):
+        s = dbcore.query.FixedFieldSort("field_one", False)
+        objs = self.db._fetch(ModelFixture1, sort=s, stream=True)
+        assert isinstance(objs, dbcore.db.StreamingResults)
+        assert [o.foo for o in objs] == [f"foo{i}" for i in range(4, -1, -1)]
+
+    def test_len_and_getitem(self):
+        q = dbcore.query.NumericQuery("field_one", "1..3")
+        objs = self.db._fetch(ModelFixture1, q, stream=True)
+        assert len(objs) == 3
+        assert objs[2].field_one == 3
+        with pytest.raises(IndexError):
+            objs[3]
+
+    def test_slow_query(self):
+        q = dbcore.query.SubstringQuery("foo", "3", False)
+        objs = self.db._fetch(ModelFixture1, q, stream=True)
+        assert [o.field_one for o in objs] == [3]
+        assert len(objs) == 1
+        assert objs[0].foo == "foo3"
+
+    def test_removed_rows_are_skipped(self):
+        objs = self.db._fetch(ModelFixture1, stream=True)
+        self.db._fetch(ModelFixture1, dbcore.query.MatchQuery("field_one", 2))[
+            0
+        ].remove()
+        assert [o.field_one for o in objs] == [0, 1, 3, 4]
+
+    def test_slow_sort_is_not_streamed(self):
+        s = dbcore.query.SlowFieldSort("foo", False)
+        objs = self.db._fetch(ModelFixture1, sort=s, stream=True)
+        assert not isinstance(objs, dbcore.db.StreamingResults)
+        assert objs[0].foo == "foo4"
+
+
+class PaginationTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        for i in range(6):
+            model = ModelFixture1(field_one=i % 3)
+            if i:
+                model["foo"] = f"foo{i % 2}"
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def fetch_ids(self, sort=None, query=None, **kwargs):
+        objs = self.db._fetch(ModelFixture1, query, sort, **kwargs)
+        return [o.id for o in objs]
+
+    def paged_ids(self, sort, query=None, size=2):
+        ids = page = self.fetch_ids(sort, query, limit=size)
+        while page:
+            page = self.fetch_ids(sort, query, limit=size, after=page[-1])
+            ids = ids + page
+        return ids
+
+    def test_limit_and_offset(self):
+        s = dbcore.query.FixedFieldSort("field_one", False)
+        ids = self.fetch_ids(s)
+        assert self.fetch_ids(s, limit=2) == ids[:2]
+        assert self.fetch_ids(s, limit=2, offset=3) == ids[3:5]
+        assert self.fetch_ids(s, offset=4) == ids[4:]
+
+    def test_keyset_pages_by_fixed_field(self):
+        s = dbcore.query.FixedFieldSort("field_one", False)
+        ids = self.fetch_ids(s)
+        assert self.paged_ids(s) == ids
+        assert self.fetch_ids(s, after=ids[2], offset=1) == ids[4:]
+
+    def flex_sort(self, ascending):
+        s = dbcore.query.SlowFieldSort("foo", ascending)
+        s.model_cls = ModelFixture1
+        return s
+
+    def test_keyset_pages_by_flex_field_with_nulls(self):
+        for ascending in (True, False):
+            s = self.flex_sort(ascending)
+            assert not s.is_slow()
+            ids = self.fetch_ids(s)
+            assert self.paged_ids(s) == ids
+
+    def test_keyset_pages_by_multiple_fields(self):
+        s = dbcore.query.MultipleSort(
+            [
+                self.flex_sort(True),
+                dbcore.query.FixedFieldSort("field_one", False),
+            ]
+        )
+        assert not s.is_slow()
+        q = dbcore.query.NumericQuery("field_one", "1..2")
+        ids = self.fetch_ids(s, q)
+        assert len(ids) == 4
+        assert self.paged_ids(s, q, size=3) == ids
+
+    def test_slow_sort_pages(self):
+        s = dbcore.query.SlowFieldSort("foo", False)
+        ids = self.fetch_ids(s)
+        assert self.fetch_ids(s, limit=2, offset=1) == ids[1:3]
+        assert self.paged_ids(s) == ids
+
+    def test_slow_query_pages(self):
+        q = dbcore.query.SubstringQuery("foo", "1", False)
+        ids = self.fetch_ids(query=q)
+        assert len(ids) == 3
+        assert self.fetch_ids(query=q, after=ids[0], limit=1) == ids[1:2]
+
+
+class FieldIndexTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.libfile = mkstemp("db")
+        os.close(handle)
+        self.db = IndexedDatabaseFixture(self.libfile)
+        for foo in ("bar", "baz"):
+            model = IndexedModelFixture(field_two=foo)
+            model["foo"] = foo
+            model.add(self.db)
+
+    def tearDown(self):
+        self.db._connection().close()
+        os.remove(self.libfile)
+
+    def index_names(self, db):
+        with db.transaction() as tx:
+            rows = tx.query("SELECT name FROM sqlite_master WHERE type='index'")
+        return {row["name"] for row in rows}
+
+    def test_indices_are_created_and_used(self):
+        statuses = self.db.field_indices()
+        assert [(s.field, s.index, s.rows, s.used) for s in statuses] == [
+            ("field_two", "test_by_field_two", 2, True),
+            ("foo", "testflex_by_foo_value", 2, True),
+        ]
+
+    def test_flex_query_uses_index(self):
+        q = IndexedModelFixture.field_query("foo", "baz", dbcore.MatchQuery)
+        clause, _ = q.clause()
+        assert "key = 'foo'" in clause
+        assert [o.foo for o in self.db._fetch(IndexedModelFixture, q)] == [
+            "baz"
+        ]
+
+    def test_indices_of_unindexed_fields_are_dropped(self):
+        self.db._connection().close()
+        db = DatabaseFixture1(self.libfile)
+        names = self.index_names(db)
+        db._connection().close()
+        assert "test_by_field_two" not in names
+        assert "testflex_by_foo_value" not in names
+        assert "testflex_by_entity" in names
+
+
+class BulkStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseFixture1(":memory:")
+        self.models = [ModelFixture1(field_one=i) for i in range(3)]
+
+    def tearDown(self):
+        self.db._connection().close()
+
+    def fetch(self):
+        return list(self.db._fetch(ModelFixture1, sort=SortFixture("id")))
+
+    def test_bulk_add(self):
+        self.models[1]["foo"] = "bar"
+        self.db.bulk_add(self.models)
+        assert [m.id for m in self.models] == [1, 2, 3]
+        assert not any(m._dirty for m in self.models)
+        models = self.fetch()
+        assert [m.field_one for m in models] == [0, 1, 2]
+        assert [m.get("foo") for m in models] == [None, "bar", None]
+
+    def test_updates_are_batched_by_fields(self):
+        self.db.bulk_add(self.models)
+        self.models[0].field_one = 10
+        self.models[1].field_one = 11
+        self.models[2].field_two = "two"
+        self.models[2]["foo"] = "bar"
+
+        with patch.object(
+            dbcore.db.Transaction,
+            "mutate_many",
+            autospec=True,
+            side_effect=dbcore.db.Transaction.mutate_many,
+        ) as mutate_many:
+            self.db.bulk_store(self.models)
+
+        statements = [c.args[1] for c in mutate_many.call_args_list]
+        assert statements == [
+            "UPDATE test SET field_one=? WHERE id=?",
+            "UPDATE test SET field_two=? WHERE id=?",
+            "INSERT INTO testflex (entity_id, key, value) VALUES (?, ?, ?);",
+        ]
+        models = self.fetch()
+        assert [m.field_one for m in models] == [10, 11, 2]
+        assert [m.field_two for m in models] == ["", "", "two"]
+        assert models[2].foo == "bar"
+
+    def test_delete_flexattr(self):
+        self.models[0]["foo"] = "bar"
+        self.models[1]["foo"] = "baz"
+        self.db.bulk_add(self.models)
+        for model in self.models:
+            if "foo" in model:
+                del model["foo"]
+
+        self.db.bulk_store(self.models)
+
+        assert not any("foo" in m for m in self.fetch())
+
+    def test_store_only_given_fields(self):
+        self.db.bulk_add(self.models)
+        for model in self.models:
+            model.field_one = 5
+            model.field_two = "two"
+
+        self.db.bulk_store(self.models, fields=["field_two"])
+
+        models = self.fetch()
+        assert [m.field_one for m in models] == [0, 1, 2]
+        assert [m.field_two for m in models] == ["two"] * 3
+
+
 class TestException:
     @pytest.mark.parametrize("model", [DatabaseFixture1])
     @pytest.mark.filterwarnings(
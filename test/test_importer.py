@@ -37,7 +37,7 @@ from mediafile import MediaFile
 
 from beets import config, importer, logging, util
 from beets.autotag import AlbumInfo, AlbumMatch, TrackInfo
-from beets.importer.tasks import albums_in_dir
+from beets.importer.tasks import ImportTaskFactory, albums_in_dir
 from beets.test import _common
 from beets.test.helper import (
     NEEDS_REFLINK,
@@ -1210,6 +1210,34 @@ class IncrementalImportTest(AsIsImporterMixin, ImportTestCase):
         assert len(self.lib.albums()) == 1
 
 
+class ImportTaskFactoryTest(ImportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.prepare_albums_for_import(5)
+
+    def scan(self, jobs, **kwargs):
+        config["threaded"] = jobs > 1
+        session = self.setup_importer(scan_jobs=jobs, **kwargs)
+        session.set_config(config["import"])
+        factory = ImportTaskFactory(self.import_dir, session)
+        return [
+            (type(task).__name__, [i.path for i in task.items])
+            for task in factory.tasks()
+        ]
+
+    def test_threaded_scan_keeps_order(self):
+        tasks = self.scan(1)
+
+        assert len(tasks) == 6
+        assert self.scan(4) == tasks
+
+    def test_threaded_singleton_scan_keeps_order(self):
+        tasks = self.scan(1, singletons=True)
+
+        assert len(tasks) == 11
+        assert self.scan(4, singletons=True) == tasks
+
+
 def _mkmp3(path):
     shutil.copyfile(
         syspath(os.path.join(_common.RSRC, b"min.mp3")),
@@ -1241,6 +1269,11 @@ class AlbumsInDirTest(BeetsTestCase):
         albums = list(albums_in_dir(self.base))
         assert len(albums) == 4
 
+    def test_jobs_keep_order(self):
+        assert list(albums_in_dir(self.base, 4)) == list(
+            albums_in_dir(self.base)
+        )
+
     def test_separates_contents(self):
         found = []
         for _, album in albums_in_dir(self.base):
@@ -19,10 +19,12 @@ import os.path
 import re
 import shutil
 import stat
+import threading
 import unicodedata
 import unittest
 from unittest.mock import patch
 
+import confuse
 import pytest
 from mediafile import MediaFile, UnreadableFileError
 
@@ -86,6 +88,29 @@ class StoreTest(ItemInDBTestCase):
         assert "flex1" not in album
         assert "flex1" not in album.items()[0]
 
+    def test_bulk_store_album_cascades_to_items(self):
+        album = self.lib.add_album([_common.item(), _common.item()])
+        album.genre = "Bulk Genre"
+        album.flex1 = "Flex-1"
+
+        self.lib.bulk_store([album])
+
+        assert {i.genre for i in album.items()} == {"Bulk Genre"}
+        assert {i.flex1 for i in album.items()} == {"Flex-1"}
+
+    def test_bulk_store_sends_database_change_per_model(self):
+        items = [_common.item(), _common.item()]
+        self.lib.bulk_add(items)
+        for i in items:
+            i.year = 1987
+
+        blog.getLogger("beets").set_global_level(blog.DEBUG)
+        with capture_log() as logs:
+            self.lib.bulk_store(items)
+
+        assert logs.count("Sending event: database_change") == 2
+        assert {i.year for i in self.lib.items()} == {self.i.year, 1987}
+
 
 class AddTest(BeetsTestCase):
     def setUp(self):
@@ -561,6 +586,27 @@ class ItemFormattedMappingTest(ItemInDBTestCase):
         formatted = self.i.formatted()
         assert formatted["albumartist"] == ""
 
+    def test_used_keys_are_formatted_only(self):
+        album = self.lib.add_album([self.i])
+        album["flex"] = "foo"
+        album.store()
+        formatted = self.i.formatted(used_keys={"title", "flex", "nothing"})
+        assert set(formatted) == {"title", "flex"}
+        assert formatted["flex"] == "foo"
+
+    def test_used_artist_falls_back_to_albumartist(self):
+        self.i.artist = ""
+        formatted = self.i.formatted(used_keys={"artist"})
+        assert formatted["artist"] == "the album artist"
+
+    def test_template_formats_used_keys_only(self):
+        with patch.object(
+            beets.library.Item, "keys", side_effect=AssertionError
+        ):
+            assert self.i.evaluate_template("$title $nothing") == (
+                "the title $nothing"
+            )
+
 
 class PathFormattingMixin:
     """Utilities for testing path formatting."""
@@ -778,6 +824,63 @@ class DisambiguationTest(BeetsTestCase, PathFormattingMixin):
         self._setf("foo%aunique{albumartist album flex,year}/$title")
         self._assert_dest(b"/base/foo/the title", self.i1)
 
+    def test_albums_are_looked_up_in_index(self):
+        self._assert_dest(b"/base/foo [2001]/the title", self.i1)
+        with patch.object(self.lib, "albums", side_effect=AssertionError):
+            self._assert_dest(b"/base/foo [2002]/the title", self.i2)
+
+    def test_index_is_updated_when_album_changes(self):
+        self._assert_dest(b"/base/foo [2001]/the title", self.i1)
+        album2 = self.lib.get_album(self.i2)
+        album2.album = "different album"
+        album2.store()
+        self._assert_dest(b"/base/foo/the title", self.i1)
+
+    def test_index_is_updated_when_album_is_removed(self):
+        self._assert_dest(b"/base/foo [2001]/the title", self.i1)
+        self.lib.get_album(self.i2).remove()
+        self._assert_dest(b"/base/foo/the title", self.i1)
+
+
+class DestinationsTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lib.directory = b"/base"
+        self.lib.path_formats = [
+            ("singleton:true", "singles/$title"),
+            ("default", "$albumartist/$album%aunique{}/$track $title"),
+        ]
+        self.items = [item(), item(), item()]
+        self.items[1].track = 2
+        self.lib.add_album(self.items[:2])
+        self.items[2].title = "single"
+        self.lib.add(self.items[2])
+
+    def test_destinations_match_destination(self):
+        dests = self.lib.destinations(self.items)
+        assert dests == [i.destination() for i in self.items]
+        assert dests[2] == np("/base/singles/single")
+
+    def test_album_fields_are_formatted_once(self):
+        with patch.object(
+            beets.library.models.FormattedItemMapping,
+            "_get_formatted",
+            autospec=True,
+            side_effect=beets.library.models.FormattedItemMapping._get_formatted,
+        ) as get_formatted:
+            self.lib.destinations(self.items[:2])
+        album_keys = [
+            key
+            for (_, model, key), _ in get_formatted.call_args_list
+            if isinstance(model, Album)
+        ]
+        assert sorted(album_keys) == ["album", "albumartist"]
+
+    def test_relative_to_libdir(self):
+        dests = self.lib.destinations(self.items, relative_to_libdir=True)
+        assert dests[0] == self.items[0].destination(relative_to_libdir=True)
+        assert not os.path.isabs(dests[0])
+
 
 class SingletonDisambiguationTest(BeetsTestCase, PathFormattingMixin):
     def setUp(self):
@@ -1162,6 +1265,27 @@ class MtimeTest(BeetsTestCase):
         assert self.i.mtime >= self._mtime()
 
 
+class DatabaseConfigTest(BeetsTestCase):
+    def test_pragmas_from_config(self):
+        config["database"]["journal_mode"] = "wal"
+        config["database"]["cache_size"] = -4000
+        lib = beets.library.Library(os.path.join(self.temp_dir, b"wal.db"))
+
+        assert lib.wal
+        with lib.transaction() as tx:
+            assert tx.query("PRAGMA cache_size")[0][0] == -4000
+        lib._close()
+
+    def test_unset_pragmas_are_left_alone(self):
+        assert self.lib.pragmas == {}
+        assert not self.lib.wal
+
+    def test_invalid_journal_mode(self):
+        config["database"]["journal_mode"] = "fast"
+        with pytest.raises(confuse.ConfigValueError):
+            beets.library.Library(":memory:")
+
+
 class ImportTimeTest(BeetsTestCase):
     def added(self):
         self.track = item()
@@ -1271,6 +1395,43 @@ class WriteTest(BeetsTestCase):
             "old artist/another artist"
         ]
 
+    def test_write_many(self):
+        items = [self.add_item_fixture(title=f"title {i}") for i in range(4)]
+        missing = self.create_item(path=b"/path/does/not/exist")
+        items.insert(2, missing)
+
+        with patch.object(beets.library.Item, "write_batch_size", 2):
+            results = list(beets.library.Item.write_many(items, jobs=2))
+
+        assert [item for item, _ in results] == items
+        errors = {item.path: error for item, error in results if error}
+        assert list(errors) == [missing.path]
+        assert isinstance(errors[missing.path], beets.library.ReadError)
+        for i, written in enumerate(items[:2] + items[3:]):
+            assert MediaFile(syspath(written.path)).title == f"title {i}"
+
+    def test_write_many_sends_events_from_calling_thread(self):
+        items = [self.add_item_fixture(title=f"title {i}") for i in range(3)]
+        events = []
+
+        def send(event, item, path, **kwargs):
+            events.append((event, items.index(item), threading.get_ident()))
+            if event == "write" and item is items[1]:
+                raise beets.library.WriteError(path, "aborted")
+
+        with patch.object(plugins, "send", send):
+            results = list(beets.library.Item.write_many(items, jobs=2))
+
+        assert [bool(error) for _, error in results] == [False, True, False]
+        assert {thread for _, _, thread in events} == {threading.get_ident()}
+        assert [(event, i) for event, i, _ in events] == [
+            ("write", 0),
+            ("write", 1),
+            ("write", 2),
+            ("after_write", 0),
+            ("after_write", 2),
+        ]
+
     def test_write_date_field(self):
         # Since `date` is not a MediaField, this should do nothing.
         item = self.add_item_fixture()
@@ -1304,6 +1465,57 @@ class FilesizeTest(BeetsTestCase):
         assert item.filesize == 0
 
 
+class ItemValuesTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.add_item(title="one", track=1)
+        self.add_item(title="two", track=2)
+
+    def test_item_values(self):
+        values = self.lib.item_values(("title", "track"), "track+")
+        assert values == [("one", 1), ("two", 2)]
+
+    def test_item_values_as_columns(self):
+        values = self.lib.item_values(("title", "track"), "t", as_columns=True)
+        assert values == {"title": ["one", "two"], "track": [1, 2]}
+
+    def test_no_matches_as_columns(self):
+        values = self.lib.item_values(("title",), "nothing", as_columns=True)
+        assert values == {"title": []}
+
+
+class AlbumPrefetchTest(BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        album = self.add_album(album="one", title="first")
+        album["mood"] = "calm"
+        album.store()
+        self.lib.add_album([self.add_item(title="second")])
+        item = self.add_item(title="third")
+        item.album_id = album.id
+        item.store()
+        self.add_item(title="singleton")
+
+    def formatted(self, **kwargs):
+        with patch.object(self.lib, "_get", side_effect=AssertionError):
+            items = self.lib.items(sort=None, with_albums=True, **kwargs)
+            return items, [format(i, "$title $mood") for i in items]
+
+    def test_albums_are_fetched_together(self):
+        items, lines = self.formatted()
+        assert lines == [
+            "first calm",
+            "second $mood",
+            "third calm",
+            "singleton $mood",
+        ]
+        assert items[0]._cached_album is items[2]._cached_album
+
+    def test_albums_are_fetched_with_streamed_items(self):
+        _, lines = self.formatted(stream=True)
+        assert lines[2] == "third calm"
+
+
 class ParseQueryTest(unittest.TestCase):
     def test_parse_invalid_query_string(self):
         with pytest.raises(beets.dbcore.query.ParsingError):
@@ -1312,3 +1524,32 @@ class ParseQueryTest(unittest.TestCase):
     def test_parse_bytes(self):
         with pytest.raises(AssertionError):
             beets.library.parse_query_string(b"query", None)
+
+
+class QueryCacheTest(ItemInDBTestCase):
+    def parse_count(self, *queries):
+        with patch(
+            "beets.library.queries.parse_query_parts",
+            wraps=beets.library.queries.parse_query_parts,
+        ) as parse:
+            results = [[i.id for i in self.lib.items(q)] for q in queries]
+        return parse.call_count, results
+
+    def test_repeated_query_is_parsed_once(self):
+        count, results = self.parse_count("the", "the", ["the"])
+        assert count == 2
+        assert results == [[self.i.id]] * 3
+
+    def test_cached_query_is_compiled(self):
+        query, _ = beets.library.queries.parse_query_cached("the", Album)
+        assert isinstance(query, beets.dbcore.query.CompiledQuery)
+        assert Album._query_cache
+
+    def test_date_query_is_not_cached(self):
+        count, _ = self.parse_count("added:-1w", "added:-1w")
+        assert count == 2
+
+    def test_least_recently_used_query_is_evicted(self):
+        with patch("beets.library.queries.QUERY_CACHE_SIZE", 2):
+            count, _ = self.parse_count("a", "b", "a", "c", "a", "b")
+        assert count == 4
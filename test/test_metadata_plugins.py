@@ -1,8 +1,10 @@
+import threading
 from collections.abc import Iterable
 
 import pytest
 
 from beets import metadata_plugins
+from beets.library import Item
 from beets.test.helper import PluginMixin
 
 
@@ -24,6 +26,72 @@ class ErrorMetadataMockPlugin(metadata_plugins.MetadataSourcePlugin):
         raise ValueError("Mocked error")
 
 
+class SourceMockPlugin(metadata_plugins.MetadataSourcePlugin):
+    """A metadata source plugin whose searches wait for an event."""
+
+    released = threading.Event()
+
+    def __init__(self):
+        super().__init__(self.data_source.lower())
+
+    def candidates(self, *args, **kwargs):
+        if self.released.wait(5):
+            yield f"{self.data_source} album"
+
+    def item_candidates(self, *args, **kwargs):
+        yield f"{self.data_source} track"
+
+    def album_for_id(self, *args, **kwargs):
+        return None
+
+    def track_for_id(self, *args, **kwargs):
+        return None
+
+
+class SlowMockPlugin(SourceMockPlugin):
+    pass
+
+
+class FastMockPlugin(SourceMockPlugin):
+    release = True
+
+    def candidates(self, *args, **kwargs):
+        yield f"{self.data_source} album"
+        # Let the slow source finish only after this one was queried.
+        if self.release:
+            self.released.set()
+
+
+class TestConcurrentCandidates(PluginMixin):
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.config["threaded"] = True
+        metadata_plugins.find_metadata_source_plugins.cache_clear()
+        SourceMockPlugin.released.clear()
+        self.register_plugin(SlowMockPlugin)
+        self.register_plugin(FastMockPlugin)
+        yield
+        SourceMockPlugin.released.set()
+        self.unload_plugins()
+
+    def test_sources_are_queried_at_once(self):
+        assert sorted(metadata_plugins.candidates()) == [
+            "FastMock album",
+            "SlowMock album",
+        ]
+
+    @pytest.mark.parametrize("per_source", [True, False])
+    def test_slow_source_times_out(self, caplog, monkeypatch, per_source):
+        monkeypatch.setattr(FastMockPlugin, "release", False)
+        if per_source:
+            self.config["slowmock"]["lookup_timeout"] = 0.05
+        else:
+            self.config["lookup_deadline"] = 0.05
+
+        assert list(metadata_plugins.candidates()) == ["FastMock album"]
+        assert "'SlowMock.candidates' timed out" in caplog.text
+
+
 class TestMetadataPluginsException(PluginMixin):
     """Check that errors during the metadata plugins do not crash beets.
     They should be logged as errors instead.
@@ -81,3 +149,112 @@ class TestMetadataPluginsException(PluginMixin):
 
         with pytest.raises(ValueError, match="Mocked error"):
             call_method()
+
+
+class CountingMockPlugin(metadata_plugins.MetadataSourcePlugin):
+    """A metadata source plugin that counts the lookups it answers."""
+
+    def __init__(self):
+        super().__init__("countingmock")
+        self.calls = []
+
+    def candidates(self, items, artist, album, va_likely):
+        self.calls.append(("candidates", artist, album))
+        yield {"album": album}
+
+    def item_candidates(self, *args, **kwargs):
+        return []
+
+    def album_for_id(self, album_id):
+        self.calls.append(("album_for_id", album_id))
+        return {"album_id": album_id} if album_id != "missing" else None
+
+    def track_for_id(self, *args, **kwargs):
+        return None
+
+
+class TestLookupCache(PluginMixin):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.config["threaded"] = False
+        metadata_plugins.find_metadata_source_plugins.cache_clear()
+        self.register_plugin(CountingMockPlugin)
+        self.plugin = metadata_plugins.find_metadata_source_plugins()[0]
+        self.path = str(tmp_path / "lookups.db")
+        self.cache = metadata_plugins.LookupCache(self.path, 60, 2**20)
+        metadata_plugins.lookup_cache = self.cache
+        yield
+        metadata_plugins.lookup_cache = None
+        self.unload_plugins()
+
+    def test_candidates_are_cached(self):
+        items = [Item(title="t", artist="a")]
+        for _ in range(2):
+            assert list(
+                metadata_plugins.candidates(items, "a", "Album", False)
+            ) == [{"album": "Album"}]
+        list(metadata_plugins.candidates(items, "a", "Other", False))
+
+        assert self.plugin.calls == [
+            ("candidates", "a", "Album"),
+            ("candidates", "a", "Other"),
+        ]
+        assert self.cache.hits["CountingMock"] == 1
+        assert self.cache.misses["CountingMock"] == 2
+
+    def test_candidates_key_on_item_metadata(self):
+        list(metadata_plugins.candidates([Item(title="x")], "a", "b", False))
+        list(metadata_plugins.candidates([Item(title="y")], "a", "b", False))
+
+        assert len(self.plugin.calls) == 2
+
+    def test_key_on_plugin_options(self):
+        items = [Item(title="t", artist="a")]
+        list(metadata_plugins.candidates(items, "a", "b", False))
+        self.config["countingmock"]["search_limit"] = 1
+        list(metadata_plugins.candidates(items, "a", "b", False))
+        self.config["countingmock"]["lookup_timeout"] = 10
+        list(metadata_plugins.candidates(items, "a", "b", False))
+
+        assert len(self.plugin.calls) == 2
+
+    def test_ids_are_cached(self):
+        assert metadata_plugins.album_for_id("1") == {"album_id": "1"}
+        assert metadata_plugins.album_for_id("1") == {"album_id": "1"}
+        assert metadata_plugins.album_for_id("missing") is None
+        assert metadata_plugins.album_for_id("missing") is None
+
+        assert self.plugin.calls == [
+            ("album_for_id", "1"),
+            ("album_for_id", "missing"),
+            ("album_for_id", "missing"),
+        ]
+
+    def test_source_ttl(self):
+        self.config["countingmock"]["cache_ttl"] = 0
+
+        metadata_plugins.album_for_id("1")
+        metadata_plugins.album_for_id("1")
+
+        assert len(self.plugin.calls) == 2
+
+    def test_stats_and_clear(self):
+        metadata_plugins.album_for_id("1")
+        metadata_plugins.album_for_id("1")
+
+        [(source, entries, size, hits, misses)] = self.cache.stats()
+        assert (source, entries, hits, misses) == ("CountingMock", 1, 1, 1)
+        assert size > 0
+
+        assert self.cache.clear(["countingmock"]) == 1
+        assert self.cache.stats() == []
+
+    def test_close_evicts_least_recently_used(self):
+        self.cache.max_size = 1
+        metadata_plugins.album_for_id("1")
+        self.cache.close()
+
+        cache = metadata_plugins.LookupCache(self.path, 60, 2**20)
+        [(_, entries, _, _, misses)] = cache.stats()
+        cache.close()
+        assert (entries, misses) == (0, 1)
@@ -14,6 +14,9 @@
 
 """Test the "pipeline.py" restricted parallel programming library."""
 
+import asyncio
+import os
+import time
 import unittest
 
 import pytest
@@ -85,6 +88,42 @@ def _multi_work():
         i = pipeline.multiple([i, -i])
 
 
+# Stages running on executors. Process stages must be importable from
+# the worker processes, so they live at module level.
+@pipeline.stage(executor=pipeline.THREAD, workers=4)
+def _slow_double(delay, i):
+    time.sleep(delay * (5 - i))
+    return i * 2
+
+
+@pipeline.stage(executor=pipeline.PROCESS, workers=2)
+def _pid_double(i):
+    return i * 2, os.getpid()
+
+
+@pipeline.mutator_stage(executor=pipeline.PROCESS, workers=2)
+def _set_key(key, item):
+    item[key] = True
+
+
+@pipeline.stage(executor=pipeline.THREAD, workers=2)
+def _exc_double(num, i):
+    if i == num:
+        raise PipelineError()
+    return i * 2
+
+
+@pipeline.stage(executor=pipeline.ASYNCIO, workers=3)
+async def _async_multi(active, i):
+    active.append(i)
+    peak = len(active)
+    await asyncio.sleep(0.01)
+    active.remove(i)
+    if i == 3:
+        return pipeline.BUBBLE
+    return pipeline.multiple([(i, peak), (-i, peak)])
+
+
 class SimplePipelineTest(unittest.TestCase):
     def setUp(self):
         self.result = []
@@ -269,3 +308,71 @@ class StageDecoratorTest(unittest.TestCase):
             [iter([{"x": False}, {"a": False}]), setkey("x")]
         )
         assert list(pl.pull()) == [{"x": True}, {"a": False, "x": True}]
+
+
+class TestExecutorStage:
+    def test_thread_stage_keeps_order(self):
+        pl = pipeline.Pipeline((_produce(), _slow_double(0.01)))
+        result = []
+        pipeline.Pipeline((pl.pull(), _consume(result))).run_sequential()
+        assert result == [0, 2, 4, 6, 8]
+
+        result = []
+        pl = pipeline.Pipeline(
+            (_produce(), _slow_double(0.01), _consume(result))
+        )
+        pl.run_parallel()
+        assert result == [0, 2, 4, 6, 8]
+
+    def test_thread_stage_as_last_stage(self):
+        pipeline.Pipeline((_produce(), _slow_double(0))).run_parallel()
+
+    def test_process_stage(self):
+        result = []
+        pl = pipeline.Pipeline((_produce(), _pid_double(), _consume(result)))
+        pl.run_parallel()
+
+        assert [i for i, _ in result] == [0, 2, 4, 6, 8]
+        assert os.getpid() not in {pid for _, pid in result}
+
+    def test_process_mutator_stage_sends_mutated_copy(self):
+        result = []
+        pl = pipeline.Pipeline(
+            (
+                iter([{"x": False}, {"a": False}]),
+                _set_key("x"),
+                _consume(result),
+            )
+        )
+        pl.run_parallel()
+        assert result == [{"x": True}, {"a": False, "x": True}]
+
+    def test_process_mutator_stage_sequential(self):
+        pl = pipeline.Pipeline((iter([{"x": False}]), _set_key("x")))
+        assert list(pl.pull()) == [{"x": True}]
+
+    @pytest.mark.parametrize("run", ["run_sequential", "run_parallel"])
+    def test_async_stage_messages(self, run):
+        active, result = [], []
+        pl = pipeline.Pipeline(
+            (_produce(), _async_multi(active), _consume(result))
+        )
+        getattr(pl, run)()
+
+        assert [i for i, _ in result] == [0, 0, 1, -1, 2, -2, 4, -4]
+        assert max(peak for _, peak in result) <= 3
+
+    def test_exception(self):
+        result = []
+        pl = pipeline.Pipeline((_produce(), _exc_double(3), _consume(result)))
+        with pytest.raises(PipelineError):
+            pl.run_parallel()
+        assert result == [0, 2, 4][: len(result)]
+
+    def test_first_stage_must_be_generator(self):
+        with pytest.raises(ValueError, match="first pipeline stage"):
+            pipeline.Pipeline((_slow_double(0), _consume([])))
+
+    def test_unknown_executor(self):
+        with pytest.raises(ValueError, match="unknown pipeline executor"):
+            pipeline.stage(executor="gpu")(_pid_double.__wrapped__)
@@ -39,7 +39,7 @@ from beets.dbcore.query import (
     SubstringQuery,
     TrueQuery,
 )
-from beets.library import Item
+from beets.library import Album, Item, parse_query_string
 from beets.test import _common
 from beets.test.helper import TestHelper
 
@@ -439,6 +439,82 @@ class TestQuery:
         assert {i.title for i in lib.items(q)} == expected_titles
 
 
+class TestFlexAttributeQuery:
+    """Test that queries on flexible attributes, which are evaluated in
+    SQLite, match the same objects as when evaluated in Python.
+    """
+
+    @pytest.fixture(scope="class")
+    def lib(self, helper):
+        helper.add_item(title="own", flexstr="foo", flexnum=5, flexint=2)
+        helper.add_item(title="bare")
+        album = helper.lib.add_album(
+            [
+                helper.create_item(title="inherited"),
+                helper.create_item(title="overridden"),
+            ]
+        )
+        album.flexstr = "bar"
+        album.flexnum = 12.5
+        album.flexdate = "1593561600"  # 2020-07-01 UTC
+        album.store()
+        # Storing the album copies its attributes to the items, so remove
+        # them to make the items fall back to the album.
+        inherited, overridden = sorted(album.items(), key=lambda i: i.title)
+        for key in ("flexstr", "flexnum", "flexdate"):
+            del inherited[key]
+        inherited.store()
+        overridden.flexstr = "baz"
+        overridden.flexint = 10
+        overridden.store()
+
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(
+                Item,
+                "_types",
+                {"flexint": types.Integer(), "flexnum": types.Float()},
+            )
+            monkeypatch.setattr(Album, "_types", {"flexnum": types.Float()})
+            yield helper.lib
+
+    @pytest.mark.parametrize(
+        "q, expected_titles",
+        [
+            ("flexstr:foo", {"own"}),
+            ("flexstr:bar", {"inherited"}),
+            ("flexstr:ba", {"inherited", "overridden"}),
+            ("flexstr::^b", {"inherited", "overridden"}),
+            ("flexstr:=foo", {"own"}),
+            ("flexstr::^$", {"bare"}),
+            ("-flexstr:foo", {"bare", "inherited", "overridden"}),
+            ("flexnum:5..12.5", {"own", "inherited", "overridden"}),
+            ("flexnum:10..", {"inherited", "overridden"}),
+            ("-flexnum:4", {"own", "bare", "inherited", "overridden"}),
+            ("flexint:..9", {"own"}),
+            ("flexint:3..", {"overridden"}),
+            ("flexstr:foo , flexint:10", {"own", "overridden"}),
+        ],
+    )
+    def test_query(self, lib, q, expected_titles):
+        query, _ = parse_query_string(q, Item)
+        assert query.clause()[0] is not None
+        assert {i.title for i in lib.items(query)} == expected_titles
+        assert {i.title for i in lib.items() if query.match(i)} == (
+            expected_titles
+        )
+
+    def test_date_query(self, lib):
+        query = Item.field_query("flexdate", "2020", DateQuery)
+        assert {i.title for i in lib.items(query)} == {
+            "inherited",
+            "overridden",
+        }
+
+    def test_computed_field_is_not_pushed_down(self, lib):
+        query = Item.field_query("singleton", "true", SubstringQuery)
+        assert query.clause() == (None, ())
+
+
 class TestDefaultSearchFields:
     @pytest.fixture(scope="class")
     def lib(self, helper):
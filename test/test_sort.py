@@ -208,6 +208,30 @@ class SortFlexFieldTest(DummyDataTestCase):
         for r1, r2 in zip(results, results2):
             assert r1.id == r2.id
 
+    def test_parsed_flex_sort_runs_in_sql(self):
+        _, sort = beets.library.parse_query_string("flex1+", beets.library.Item)
+        assert not sort.is_slow()
+        assert sort.order_clause()
+
+        streamed = self.lib.items("flex1+", stream=True)
+        assert [i.flex1 for i in streamed] == [
+            "Flex1-0",
+            "Flex1-1",
+            "Flex1-2",
+            "Flex1-2",
+        ]
+
+    def test_sort_falls_back_to_album_attribute(self):
+        for album, mood in zip(self.lib.albums("album+"), "bca"):
+            album.mood = mood
+            album.store(inherit=False)
+        item = self.lib.items("album:Foo2").get()
+        item.mood = "d"
+        item.store()
+
+        moods = [i.mood for i in self.lib.items("mood+ id+")]
+        assert moods == ["b", "b", "c", "d"]
+
 
 class SortAlbumFixedFieldTest(DummyDataTestCase):
     def test_sort_asc(self):
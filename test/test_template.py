@@ -16,6 +16,8 @@
 
 import unittest
 
+import pytest
+
 from beets.util import functemplate
 
 
@@ -223,6 +225,60 @@ class ParseTest(unittest.TestCase):
         assert parts[0] == "foo\n"
 
 
+class ReferencesTest(unittest.TestCase):
+    def test_fields_and_functions(self):
+        t = functemplate.Template("$foo %lower{$bar %upper{$baz}} $foo")
+        assert t.fields == {"foo", "bar", "baz"}
+        assert t.functions == {"lower", "upper"}
+
+    def test_plain_text(self):
+        t = functemplate.Template("text only")
+        assert t.fields == t.functions == set()
+
+
+class TestCodeCache:
+    TEMPLATE = "$foo %upper{$bar}"
+
+    @pytest.fixture
+    def cache_path(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(functemplate, "code_cache", None)
+        return tmp_path / "templates.cache"
+
+    def use_cache(self, path, tag="tag"):
+        functemplate.code_cache = functemplate.CodeCache(path, tag, size=2)
+        functemplate.code_cache.load()
+        return functemplate.code_cache
+
+    def test_compiled_template_is_loaded(self, cache_path):
+        self.use_cache(cache_path)
+        functemplate.Template(self.TEMPLATE)
+        functemplate.code_cache.save()
+
+        cache = self.use_cache(cache_path)
+        t = functemplate.Template(self.TEMPLATE)
+        assert "expr" not in t.__dict__  # Not parsed.
+        assert not cache.changed
+        assert t.fields == {"foo", "bar"}
+        assert t.substitute({"foo": "a", "bar": "b"}, {"upper": str.upper}) == (
+            "a B"
+        )
+        # The interpreter still handles missing values.
+        assert t.substitute({"foo": "a"}, {"upper": str.upper}) == "a $BAR"
+
+    def test_other_tag_is_ignored(self, cache_path):
+        self.use_cache(cache_path)
+        functemplate.Template(self.TEMPLATE)
+        functemplate.code_cache.save()
+
+        assert not self.use_cache(cache_path, "other tag").entries
+
+    def test_oldest_templates_are_dropped(self, cache_path):
+        cache = self.use_cache(cache_path)
+        for template in ("$a", "$b", "$c"):
+            functemplate.Template(template)
+        assert list(cache.entries) == ["$b", "$c"]
+
+
 class EvalTest(unittest.TestCase):
     def _eval(self, template):
         values = {
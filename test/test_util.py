@@ -19,6 +19,7 @@ import re
 import subprocess
 import sys
 import unittest
+from multiprocessing.pool import ThreadPool
 from unittest.mock import Mock, patch
 
 import pytest
@@ -256,3 +257,76 @@ class TestPlurality:
         assert consensus["albumartist"]
         assert not consensus["album"]
         assert not consensus["label"]
+
+
+class TestStatCache:
+    @pytest.fixture
+    def stat(self):
+        with patch("beets.util.os.stat", wraps=os.stat) as stat:
+            yield stat
+
+    def test_directories_are_looked_up_once(self, tmp_path, stat):
+        one = os.path.join(bytes(tmp_path), b"one")
+        two = os.path.join(bytes(tmp_path), b"two")
+        _common.touch(one)
+        _common.touch(two)
+        with util.stat_cache():
+            assert not util.samefile(one, two)
+            stat.reset_mock()
+            assert not util.samefile(one, two)
+            assert stat.call_count == 0
+
+        assert not util.samefile(one, two)
+        assert stat.call_count == 2
+
+    def test_mkdirall_looks_up_closest_directory(self, tmp_path, stat):
+        dest = os.path.join(bytes(tmp_path), b"a", b"b", b"file")
+        with util.stat_cache():
+            util.mkdirall(dest)
+            assert os.path.isdir(os.path.dirname(dest))
+
+            stat.reset_mock()
+            util.mkdirall(dest)
+            assert stat.call_count == 1
+
+            # Directories removed by other programs are created again.
+            os.rmdir(os.path.dirname(dest))
+            util.mkdirall(dest)
+            assert os.path.isdir(os.path.dirname(dest))
+
+    def test_concurrent_lookups_and_removals(self, tmp_path):
+        root = bytes(tmp_path)
+        paths = [os.path.join(root, b"%d" % i) for i in range(10000)]
+        with util.stat_cache(), ThreadPool(2) as pool:
+            for _ in range(5):
+                result = pool.map_async(util._stat, paths, chunksize=100)
+                while not result.ready():
+                    util._forget(root, tree=True)
+                result.get()
+
+    def test_file_operations_update_cache(self, tmp_path):
+        src = os.path.join(bytes(tmp_path), b"src")
+        dest = os.path.join(bytes(tmp_path), b"a", b"dest")
+        _common.touch(src)
+        with util.stat_cache():
+            assert not util.samefile(src, dest)
+            util.mkdirall(dest)
+            util.move(src, dest)
+            assert util.unique_path(src) == src
+            assert util.unique_path(dest) != dest
+
+            util.remove(dest)
+            util.prune_dirs(os.path.dirname(dest), bytes(tmp_path))
+            util.mkdirall(dest)
+            assert os.path.isdir(os.path.dirname(dest))
+
+    def test_case_sensitivity_is_cached(self, tmp_path, stat):
+        one = os.path.join(bytes(tmp_path), b"one")
+        two = os.path.join(bytes(tmp_path), b"two")
+        _common.touch(one)
+        _common.touch(two)
+        with util.stat_cache():
+            sensitive = util.case_sensitive(one)
+            stat.reset_mock()
+            assert util.case_sensitive(two) == sensitive
+            assert stat.call_count == 0
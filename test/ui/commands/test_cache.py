@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from beets import metadata_plugins, ui
+from beets.test.helper import BeetsTestCase, IOMixin
+
+
+class CacheCommandTest(IOMixin, BeetsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(os.fsdecode(self.temp_dir), "lookups.db")
+        self.config["lookup_cache"]["path"] = self.path
+
+        cache = metadata_plugins.LookupCache(self.path, 60, 2**20)
+        for source, id_ in [("MusicBrainz", "1"), ("Discogs", "2")]:
+            key = cache.key(source, "albums_for_ids", id_)
+            cache.set(source, "albums_for_ids", key, {"album_id": id_})
+            cache.get(source, key)
+        cache.close()
+
+    def test_stats(self):
+        output = self.run_with_output("cache", "stats")
+
+        assert "Discogs: 1 entries" in output
+        assert "MusicBrainz: 1 entries" in output
+        assert "1 hits, 0 misses" in output
+
+    def test_clear_source(self):
+        output = self.run_with_output("cache", "clear", "musicbrainz")
+        assert "1 cached lookups removed." in output
+
+        output = self.run_with_output("cache", "stats")
+        assert "MusicBrainz" not in output
+        assert "Discogs: 1 entries" in output
+
+    def test_disabled(self):
+        self.config["lookup_cache"]["path"] = None
+
+        with pytest.raises(ui.UserError, match="disabled"):
+            self.run_command("cache", "stats")
+
+    def test_unknown_action(self):
+        with pytest.raises(ui.UserError, match="unknown cache action"):
+            self.run_command("cache", "vacuum")
@@ -0,0 +1,21 @@
+import pytest
+
+from beets import ui
+from beets.test.helper import BeetsTestCase, IOMixin
+
+
+class DbIndexesTest(IOMixin, BeetsTestCase):
+    def test_show_indexes(self):
+        self.add_item(mb_trackid="abc")
+
+        output = self.run_with_output("db", "indexes")
+
+        assert (
+            "items.mb_trackid: items_by_mb_trackid (1 rows, used for lookups)"
+            in output
+        )
+        assert "albums.mb_albumid: albums_by_mb_albumid" in output
+
+    def test_unknown_action(self):
+        with pytest.raises(ui.UserError):
+            self.run_command("db", "vacuum")
@@ -1,6 +1,10 @@
 import shutil
+import threading
+from unittest.mock import patch
 
-from beets import library
+import pytest
+
+from beets import library, plugins, ui
 from beets.test.helper import BeetsTestCase
 from beets.ui.commands.move import move_items
 
@@ -28,8 +32,18 @@ class MoveTest(BeetsTestCase):
         album=False,
         pretend=False,
         export=False,
+        jobs=None,
     ):
-        move_items(self.lib, dest, query, copy, album, pretend, export=export)
+        move_items(
+            self.lib,
+            dest,
+            query,
+            copy,
+            album,
+            pretend,
+            export=export,
+            jobs=jobs,
+        )
 
     def test_move_item(self):
         self._move()
@@ -100,3 +114,59 @@ class MoveTest(BeetsTestCase):
         self.i.load()
         assert self.i.filepath == self.initial_item_path
         assert not self.otherdir.exists()
+
+    def add_colliding_item(self):
+        """Add another item to the album with the same destination."""
+        path = self.lib_path / "otherfile"
+        shutil.copy(self.resource_path, path)
+        item = library.Item.from_path(path)
+        item.album_id = self.album.id
+        self.lib.add(item)
+        return item
+
+    def test_colliding_destinations_are_unique(self):
+        other = self.add_colliding_item()
+
+        self._move(album=True)
+        self.i.load()
+        other.load()
+        assert self.i.path != other.path
+        assert self.i.filepath.exists()
+        assert other.filepath.exists()
+
+    def test_move_to_other_device(self):
+        other = self.add_colliding_item()
+
+        with patch("beets.ui.commands.move._same_device", return_value=False):
+            self._move(dest=self.otherdir, jobs=2)
+        for item in self.i, other:
+            item.load()
+            assert b"testotherdir" in item.path
+            assert item.filepath.exists()
+        assert not self.initial_item_path.exists()
+
+    def test_copy_sends_events_from_calling_thread(self):
+        other = self.add_colliding_item()
+        events = []
+        send = plugins.send
+
+        def record(event, **kwargs):
+            if event.startswith("item_"):
+                item = kwargs["item"]
+                events.append((event, item.id, threading.get_ident()))
+            return send(event, **kwargs)
+
+        with patch.object(plugins, "send", record):
+            self._move(copy=True, jobs=2)
+        assert events == [
+            ("item_copied", item.id, threading.get_ident())
+            for item in (self.i, other)
+        ]
+
+    def test_report_failed_moves(self):
+        self.initial_item_path.unlink()
+
+        with pytest.raises(ui.UserError, match="1 file could not be moved"):
+            self._move()
+        self.i.load()
+        assert self.i.filepath == self.initial_item_path
@@ -1,8 +1,10 @@
 import os
+from unittest.mock import patch
 
+import pytest
 from mediafile import MediaFile
 
-from beets import library
+from beets import library, ui
 from beets.test import _common
 from beets.test.helper import BeetsTestCase, IOMixin
 from beets.ui.commands.update import update_items
@@ -39,12 +41,13 @@ class UpdateTest(IOMixin, BeetsTestCase):
         reset_mtime=True,
         fields=None,
         exclude_fields=None,
+        **kwargs,
     ):
         self.io.addinput("y")
         if reset_mtime:
             self.i.mtime = 0
             self.i.store()
-        update_items(
+        return update_items(
             self.lib,
             query,
             album,
@@ -52,6 +55,7 @@ class UpdateTest(IOMixin, BeetsTestCase):
             False,
             fields=fields,
             exclude_fields=exclude_fields,
+            **kwargs,
         )
 
     def test_delete_removes_item(self):
@@ -203,3 +207,82 @@ class UpdateTest(IOMixin, BeetsTestCase):
         self._update(exclude_fields=["lyrics"])
         item = self.lib.items().get()
         assert item.lyrics != "new lyrics"
+
+    def test_since_skips_older_files(self):
+        mf = MediaFile(syspath(self.i.path))
+        mf.title = "differentTitle"
+        mf.save()
+        mtime = os.path.getmtime(syspath(self.i.path))
+
+        self._update(since=mtime + 1)
+        assert self.lib.items().get().title == "full"
+
+        self._update(since=mtime)
+        assert self.lib.items().get().title == "differentTitle"
+
+    def test_summary(self):
+        mf = MediaFile(syspath(self.i.path))
+        mf.title = "differentTitle"
+        mf.save()
+        remove(self.i2.path)
+
+        summary = self._update(jobs=1)
+        assert summary == {
+            "updated": 1,
+            "moved": 0,
+            "removed": 1,
+            "unchanged": 0,
+            "failed": 0,
+        }
+
+    def test_index_detects_change_within_mtime(self):
+        self._update()
+        stat = os.stat(syspath(self.i.path))
+        mf = MediaFile(syspath(self.i.path))
+        mf.title = "differentTitle"
+        mf.save()
+        # The file was modified within the second of its stored mtime.
+        seconds, ns = divmod(stat.st_mtime_ns, 10**9)
+        mtime_ns = seconds * 10**9 + (ns + 1) % 10**9
+        os.utime(syspath(self.i.path), ns=(stat.st_atime_ns, mtime_ns))
+
+        self._update(reset_mtime=False)
+        assert self.lib.items().get().title == "differentTitle"
+
+    def test_index_skips_unchanged_files(self):
+        self._update()
+
+        with patch.object(library.Item, "read") as read:
+            summary = self._update(reset_mtime=False)
+        read.assert_not_called()
+        assert summary["unchanged"] == 2
+
+    def test_renamed_file_detected(self):
+        self._update()
+        old_path = self.i.path
+        new_path = os.path.join(os.path.dirname(old_path), b"renamed.mp3")
+        os.rename(syspath(old_path), syspath(new_path))
+
+        summary = self._update(reset_mtime=False)
+        assert summary["moved"] == 1
+        assert summary["removed"] == 0
+        assert self.lib.get_item(self.i.id).path == new_path
+
+    def test_renamed_file_without_index_removed(self):
+        new_path = os.path.join(os.path.dirname(self.i.path), b"renamed.mp3")
+        os.rename(syspath(self.i.path), syspath(new_path))
+
+        summary = self._update()
+        assert summary["moved"] == 0
+        assert summary["removed"] == 1
+
+    def test_command_prints_summary(self):
+        self.i.mtime = 0
+        self.i.store()
+
+        output = self.run_with_output("update", "--since", "-1w", "-j", "2")
+        assert "0 updated, 0 moved, 0 removed, 2 unchanged, 0 failed" in output
+
+    def test_command_rejects_invalid_since(self):
+        with pytest.raises(ui.UserError, match="invalid --since"):
+            self.run_command("update", "--since", "yesterday")
@@ -1,4 +1,9 @@
+from unittest.mock import patch
+
+from mediafile import MediaFile, UnreadableFileError
+
 from beets.test.helper import BeetsTestCase, IOMixin
+from beets.util import syspath
 
 
 class WriteTest(IOMixin, BeetsTestCase):
@@ -44,3 +49,29 @@ class WriteTest(IOMixin, BeetsTestCase):
         output = self.write_cmd()
 
         assert f"{old_title} -> new title" in output
+
+    def test_write_in_threads(self):
+        items = [self.add_item_fixture() for _ in range(3)]
+        for item in items:
+            item.read()
+            item.title = f"new title {item.id}"
+            item.store()
+
+        self.write_cmd("-j", "2")
+
+        for item in self.lib.items():
+            assert MediaFile(syspath(item.path)).title == item.title
+            assert item.mtime == item.current_mtime()
+
+    def test_report_unwritable_files(self):
+        item = self.add_item_fixture()
+        item.read()
+        item.title = "new title"
+        item.store()
+
+        with patch.object(
+            MediaFile, "save", side_effect=UnreadableFileError("f", "m")
+        ):
+            output = self.write_cmd()
+
+        assert "1 files could not be written." in output